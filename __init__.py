@@ -1,15 +1,27 @@
 from homeassistant.config_entries import ConfigEntry # pyright: ignore[reportMissingImports, reportMissingModuleSource]
-from homeassistant.core import HomeAssistant # pyright: ignore[reportMissingImports, reportMissingModuleSource]
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed # pyright: ignore[reportMissingImports, reportMissingModuleSource]
-from datetime import timedelta
+from functools import partial
 
-from homeassistant.helpers.discovery import load_platform # pyright: ignore[reportMissingImports, reportMissingModuleSource]
-from .const import DOMAIN
+from homeassistant.core import HomeAssistant, callback # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers import config_validation as cv # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers import entity_registry as er # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.exceptions import ConfigEntryNotReady # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL, CONF_PARAMETER_INTERVAL, DEFAULT_PARAMETER_INTERVAL
+from .coordinator import THZBlockCoordinator, THZParameterCoordinator
+from .entity_descriptors import get_sensor_descriptors
+from .services import async_setup_services
 from .thz_device import THZDevice
-from .register_maps.register_map_manager import RegisterMapManager, RegisterMapManager_Write
+from .warm_start import THZWarmStartCache, async_revalidate
 import logging
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Services einmal je Integration registrieren (gelten für alle Wärmepumpen)."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
@@ -20,51 +32,73 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     data = config_entry.data
     conn_type = data["connection_type"]
 
-    # 1. Device "roh" initialisieren
+    # Device "roh" anlegen
     if conn_type == "ip":
-        device = THZDevice(connection="ip", host=data["host"], port=data["port"])
+        device = THZDevice(connection="ip", host=data["host"], tcp_port=data["port"])
     elif conn_type == "usb":
         device = THZDevice(connection="usb", port=data["device"])
     else:
         raise ValueError("Ungültiger Verbindungstyp")
     
-    await device.async_initialize(hass)
+    # Warmstart: Firmware und letzte Werte aus dem Speicher, gelesen wird danach im Hintergrund
+    warm_start = THZWarmStartCache(hass, config_entry.entry_id)
+    await warm_start.async_load()
+    try:
+        await device.async_initialize(hass, warm_start.firmware_version)
+    except Exception as err:
+        # Transport und I/O-Task nicht offen lassen; HA versucht das Setup später erneut
+        await device.async_close()
+        raise ConfigEntryNotReady(f"Wärmepumpe nicht erreichbar: {err}") from err
+    device.set_refresh_intervals(config_entry.data.get("refresh_intervals", {}))
 
     _LOGGER.info("THZ-Device vollständig initialisiert (FW %s)", device.firmware_version)
 
-    # 2. Firmware abfragen
-    # firmware_version = await hass.async_add_executor_job(device.read_firmware_version)  # z.B. "206"
+    # Unique IDs je Config Entry, damit mehrere Wärmepumpen nebeneinander laufen
+    await er.async_migrate_entries(hass, config_entry.entry_id, partial(_migrate_unique_id, config_entry.entry_id))
+    _async_remove_orphaned_sensors(hass, config_entry.entry_id, device.firmware_version)
 
-    # # 3. Mapping laden
-    # write_manager = RegisterMapManager_Write(firmware_version)
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN]["write_manager"] = device.write_register_map_manager
-    hass.data[DOMAIN]["register_manager"] = device.register_map_manager
-
-    # 4. Device speichern
-    # device.register_map_manager = hass.data[DOMAIN]["register_manager"]
-    # device.write_register_map_manager = hass.data[DOMAIN]["write_manager"]
-    hass.data[DOMAIN]["device"] = device
-    
-    # 5. Prepare dict for storing all coordinators
     coordinators = {}
     refresh_intervals = config_entry.data.get("refresh_intervals", {})
-    # Für jeden Block mit eigenem Intervall einen Coordinator anlegen
-    for block, interval in refresh_intervals.items():
-        coordinator = DataUpdateCoordinator(
-            hass,
-            _LOGGER,
-            name=f"THZ {block}",
-            update_interval=timedelta(seconds=int(interval)),
-            update_method=lambda b=block: _async_update_block(device, b),
-        )
-        await coordinator.async_config_entry_first_refresh()
-        coordinators[block] = coordinator
+    enabled_blocks = _enabled_blocks(hass, config_entry.entry_id, device.firmware_version)
+    # Schreibparameter: ein gemeinsamer Snapshot im langsamen Takt statt Polling je Entity.
+    parameter_coordinator = THZParameterCoordinator(
+        hass,
+        device,
+        [entry["command"] for entry in device.write_register_map_manager.get_all_registers().values()],
+        config_entry.data.get(CONF_PARAMETER_INTERVAL, DEFAULT_PARAMETER_INTERVAL),
+    )
+    # Für jeden Block einen Coordinator anlegen: ein Lesevorgang pro Intervall für alle Sensoren des Blocks
+    # Ein einzelner fehlerhafter Block (z. B. in dieser Firmware nicht vorhanden) verhindert das
+    # Setup nicht; er bleibt unavailable und wird vom Circuit Breaker nur noch selten geprüft.
+    # Blöcke ohne aktivierte Entity werden nicht gelesen; ohne Listener pollt der Coordinator nicht.
+    for block in device.available_reading_blocks:
+        interval = refresh_intervals.get(block, DEFAULT_UPDATE_INTERVAL)
+        coordinators[block] = THZBlockCoordinator(hass, device, block, interval)
+    # Gespeicherte Blöcke sind sofort verfügbar und werden nach dem Setup nachgelesen,
+    # nur Blöcke ohne gespeicherten Wert werden jetzt gelesen
+    restored = warm_start.restore(device, coordinators, parameter_coordinator)
+    try:
+        refreshed = [
+            coordinators[block] for block in enabled_blocks
+            if block in coordinators and coordinators[block] not in restored
+        ]
+        for coordinator in refreshed:
+            await coordinator.async_refresh()
+        if refreshed and not any(c.last_update_success for c in refreshed):
+            raise ConfigEntryNotReady("Kein Register-Block der Wärmepumpe konnte gelesen werden")
+    except Exception:
+        await device.async_close()
+        raise
 
     # im hass.data speichern
+    # Alles je Config Entry: jede Wärmepumpe hat eigene Verbindung, Warteschlange und Pacing
     hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = {
         "device": device,
+        "register_manager": device.register_map_manager,
+        "write_manager": device.write_register_map_manager,
         "coordinators": coordinators,
+        "parameter_coordinator": parameter_coordinator,
+        "warm_start": warm_start,
     }
 
     # Forward setup to platforms
@@ -72,21 +106,91 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         config_entry, ["sensor", "number", "switch", "select", "time"]
     )
 
+    # Erst jetzt sind die aktivierten Parameter-Entities angemeldet; der erste Snapshot
+    # liest nur deren Kommandos und läuft wie das Nachlesen der Blöcke im Hintergrund.
+    config_entry.async_create_background_task(
+        hass, async_revalidate([c for c in restored if c.block in enabled_blocks]), "THZ Warmstart"
+    )
+    config_entry.async_create_background_task(
+        hass, parameter_coordinator.async_refresh(), "THZ Parameter-Snapshot"
+    )
+    if warm_start.firmware_version is not None:
+        config_entry.async_create_background_task(
+            hass, _async_verify_firmware(hass, config_entry, device), "THZ Firmware-Prüfung"
+        )
+    warm_start.async_start(config_entry)
+
     return True
 
-async def _async_update_block(device: THZDevice, block_name: str):
-    """Wird vom Coordinator aufgerufen, um einen Block zu lesen."""
-    block_bytes = bytes.fromhex(block_name.strip("pxx"))
+
+async def _async_verify_firmware(hass: HomeAssistant, config_entry: ConfigEntry, device: THZDevice) -> None:
+    """Beim Warmstart stammt die Firmware aus dem Speicher; nach einem Update mit neuer Map neu laden."""
     try:
-        _LOGGER.debug("Lese Block %s ...", block_name)
-        return await device.read_block(block_bytes, "get")
+        firmware_version = await device.read_firmware_version()
     except Exception as err:
-        raise UpdateFailed(f"Fehler beim Lesen von {block_name}: {err}") from err
+        _LOGGER.debug("Firmware-Prüfung fehlgeschlagen: %s", err)
+        return
+    if firmware_version != device.firmware_version:
+        _LOGGER.info("Firmware geändert (%s -> %s), lade neu", device.firmware_version, firmware_version)
+        # Die neue Firmware speichern, sonst schreibt das Entladen die alte zurück und jeder Start lädt erneut
+        await hass.data[DOMAIN][config_entry.entry_id]["warm_start"].async_reset(firmware_version)
+        hass.async_create_task(hass.config_entries.async_reload(config_entry.entry_id))
+
+
+def _enabled_blocks(hass: HomeAssistant, entry_id: str, firmware_version: str) -> set[str]:
+    """Blöcke mit mindestens einer aktivierten (oder neu anzulegenden, standardmäßig aktiven) Sensor-Entity."""
+    registry = er.async_get(hass)
+    disabled = {
+        entity.unique_id: entity.disabled_by is not None
+        for entity in er.async_entries_for_config_entry(registry, entry_id)
+    }
+    return {
+        block
+        for block, descriptors in get_sensor_descriptors(firmware_version).items()
+        if any(
+            not disabled.get(f"{entry_id}_{d.unique_suffix}", not d.enabled_default)
+            for d in descriptors
+        )
+    }
+
+@callback
+def _migrate_unique_id(entry_id: str, entity_entry: er.RegistryEntry) -> dict | None:
+    """Alte, globale Unique IDs ("thz_...") bekommen die Entry-ID als Präfix."""
+    if entity_entry.unique_id.startswith(f"{entry_id}_"):
+        return None
+    return {"new_unique_id": f"{entry_id}_{entity_entry.unique_id}"}
+
+
+@callback
+def _async_remove_orphaned_sensors(hass: HomeAssistant, entry_id: str, firmware_version: str) -> None:
+    """Register-Sensoren, die die Map der Firmware nicht mehr enthält, aus der Entity-Registry löschen.
+
+    Betrifft z. B. Namen, die seit der Generierung aus 00_THZ.pm in FHEM nicht
+    (mehr) vorkommen; sie blieben sonst für immer "nicht verfügbar" stehen.
+    Bus-Sensoren und Parameter-Entities werden nicht angefasst.
+    """
+    registry = er.async_get(hass)
+    known = {
+        f"{entry_id}_{descriptor.unique_suffix}"
+        for descriptors in get_sensor_descriptors(firmware_version).values()
+        for descriptor in descriptors
+    }
+    for entity in er.async_entries_for_config_entry(registry, entry_id):
+        if entity.domain == "sensor" and entity.unique_id.startswith(f"{entry_id}_thz_b'") and entity.unique_id not in known:
+            _LOGGER.info("Entferne %s: nicht mehr in der Register-Map von Firmware %s", entity.entity_id, firmware_version)
+            registry.async_remove(entity.entity_id)
 
 
 async def async_unload_entry(hass, entry):
     """Entferne Config Entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "select", "number", "time"])
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "number", "switch", "select", "time"])
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
-    return unload_ok
\ No newline at end of file
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["warm_start"].async_save()
+        await entry_data["device"].async_close()
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Warmstart-Speicher mit dem Config Entry löschen."""
+    await THZWarmStartCache(hass, entry.entry_id).async_remove()
\ No newline at end of file
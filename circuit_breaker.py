@@ -0,0 +1,84 @@
+import time
+
+from .thz_protocol import THZError
+
+
+class THZCircuitOpenError(THZError):
+    """Block wird wegen wiederholter Fehler vorübergehend nicht abgefragt."""
+
+
+class THZCircuitBreaker:
+    """Circuit Breaker für einen Register-Block.
+
+    Nach ``failure_threshold`` Fehlern in Folge (bei nicht wiederholbaren
+    Fehlern wie "Unbekannte Register Anfrage" sofort) wird der Block für
+    ``cooldown`` Sekunden gesperrt. Danach ist genau eine Probe-Anfrage
+    erlaubt; schlägt sie fehl, verdoppelt sich die Sperrzeit bis
+    ``max_cooldown``, gelingt sie, ist der Block wieder frei.
+    """
+
+    __slots__ = ("failure_threshold", "base_cooldown", "max_cooldown", "cooldown",
+                 "failures", "opened_at", "probing", "last_error", "trips")
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 300.0, max_cooldown: float = 3600.0):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+        self.last_error: str | None = None
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.probing or time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """True, wenn eine Anfrage gesendet werden darf; im Half-Open-Zustand nur eine Probe."""
+        if self.opened_at is None:
+            return True
+        if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+            return False
+        self.probing = True
+        return True
+
+    def release_probe(self) -> None:
+        """Probe ohne Ergebnis (Verbindung weg, abgebrochen): Sperre bleibt, die nächste Anfrage darf erneut proben."""
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.cooldown = self.base_cooldown
+        self.last_error = None
+
+    def record_failure(self, err: Exception) -> None:
+        self.failures += 1
+        self.last_error = f"{type(err).__name__}: {err}"
+        if self.probing:
+            # Probe fehlgeschlagen: länger sperren
+            self.probing = False
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            self.opened_at = time.monotonic()
+            self.trips += 1
+        elif self.opened_at is None and (
+            self.failures >= self.failure_threshold or not getattr(err, "retryable", True)
+        ):
+            self.opened_at = time.monotonic()
+            self.trips += 1
+
+    def get_stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "cooldown": self.cooldown,
+            "last_error": self.last_error,
+        }
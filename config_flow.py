@@ -9,7 +9,7 @@ _LOGGER = logging.getLogger(__name__)
 
 from .thz_device import THZDevice
 
-from .const import DOMAIN, CONF_CONNECTION_TYPE, CONNECTION_USB, CONNECTION_IP, DEFAULT_BAUDRATE, DEFAULT_PORT, DEFAULT_UPDATE_INTERVAL
+from .const import DOMAIN, CONF_CONNECTION_TYPE, CONNECTION_USB, CONNECTION_IP, DEFAULT_BAUDRATE, DEFAULT_PORT, DEFAULT_UPDATE_INTERVAL, CONF_PARAMETER_INTERVAL, DEFAULT_PARAMETER_INTERVAL
 
 class THZConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow für Stiebel Eltron THZ (LAN oder USB)."""
@@ -61,7 +61,7 @@ class THZConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_log(self, user_input= None):
         """Handle log level configuration."""
         if user_input is not None:
-            return self.async_step_detect_blocks()
+            return await self.async_step_detect_blocks()
         
         schema = vol.Schema({
             vol.Required("log_level", default="info"): vol.In(["debug", "info", "warning", "error"]),
@@ -132,15 +132,14 @@ class THZConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         conn_type = data["connection_type"]
 
         # Temporäre Geräteinstanz aufbauen
+        device = THZDevice(
+            connection=conn_type,
+            host=data.get(CONF_HOST),
+            tcp_port=data.get(CONF_PORT),
+            port=data.get(CONF_DEVICE),
+        )
         try:
-            device: THZDevice = await self.hass.async_add_executor_job(
-                lambda: THZDevice(
-                    connection_type=conn_type,
-                    host=data.get(CONF_HOST),
-                    port=data.get(CONF_PORT),
-                    device=data.get("device"),
-                )
-            )
+            await device.async_initialize(self.hass)
 
             # Firmware lesen (liefert z. B. "759", "214" etc.)
             firmware = device.firmware_version
@@ -153,6 +152,8 @@ class THZConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except Exception as e:
             _LOGGER.error("Fehler beim Lesen der Firmware/Blöcke: %s", e)
             return self.async_abort(reason="cannot_detect_blocks")
+        finally:
+            await device.async_close()
 
         self.blocks = blocks
         self.connection_data["firmware"] = firmware
@@ -164,7 +165,11 @@ class THZConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             refresh_intervals = {b: user_input[f"refresh_{b}"] for b in blocks}
-            data = {**self.connection_data, "refresh_intervals": refresh_intervals}
+            data = {
+                **self.connection_data,
+                "refresh_intervals": refresh_intervals,
+                CONF_PARAMETER_INTERVAL: user_input[CONF_PARAMETER_INTERVAL],
+            }
             title = (
                 f"THZ ({data['connection_type']}: {data.get('host') or data.get('device')})"
             )
@@ -175,6 +180,9 @@ class THZConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             schema_dict[vol.Optional(f"refresh_{block}", default=30)] = vol.All(
                 int, vol.Range(min=5, max=600)
             )
+        schema_dict[vol.Optional(CONF_PARAMETER_INTERVAL, default=DEFAULT_PARAMETER_INTERVAL)] = vol.All(
+            int, vol.Range(min=60, max=86400)
+        )
 
         schema = vol.Schema(schema_dict)
         return self.async_show_form(
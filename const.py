@@ -10,4 +10,20 @@ CONNECTION_USB = "usb"
 CONNECTION_IP = "ip"
 DEFAULT_BAUDRATE = 115200
 DEFAULT_PORT = 2323
-DEFAULT_UPDATE_INTERVAL = 60  # in seconds
\ No newline at end of file
+DEFAULT_UPDATE_INTERVAL = 60  # in seconds
+CONF_PARAMETER_INTERVAL = "parameter_interval"
+DEFAULT_PARAMETER_INTERVAL = 900  # Schreibparameter ändern sich nur beim Schreiben
+# Entity-Option (Entity-Registry, Domain "thz"): State spätestens nach so vielen Sekunden
+# schreiben, auch wenn sich der Wert nicht geändert hat
+CONF_HEARTBEAT = "heartbeat"
+# Prioritäten der I/O-Warteschlange (kleiner = früher)
+PRIORITY_WRITE = 0
+PRIORITY_USER = 1
+PRIORITY_POLL = 2
+PRIORITY_NAMES = {PRIORITY_WRITE: "write", PRIORITY_USER: "user", PRIORITY_POLL: "poll"}
+
+# Handshake-Timeout: mindestens so lange, sonst 3x die gemessene Antwortzeit (max. read_timeout)
+HANDSHAKE_TIMEOUT_MIN = 0.25
+
+# Cache: Werte gelten nach STALE_HARD_LIMIT_FACTOR * Refresh-Intervall als veraltet
+STALE_HARD_LIMIT_FACTOR = 3
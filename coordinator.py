@@ -0,0 +1,133 @@
+from datetime import timedelta
+import logging
+from typing import Any, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from . import const
+from .thz_device import THZDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class THZBlockCoordinator(DataUpdateCoordinator[tuple[Any, ...]]):
+    """Liest einen Register-Block einmal pro Intervall und verteilt ihn an alle Sensoren des Blocks.
+
+    Der Block wird einmal mit dem kompilierten Decoder-Plan dekodiert;
+    ``data`` enthält die Werte aller Sensoren des Blocks in der Reihenfolge
+    der Einträge (``SensorDescriptor.index``), da Namen doppelt vorkommen können.
+    ``changed_fields`` nennt die Byte-Bereiche des Plans, die sich gegenüber dem
+    vorigen Payload geändert haben (None = alles neu), damit Sensoren mit
+    unveränderten Bytes keinen State schreiben.
+    """
+
+    def __init__(self, hass: HomeAssistant, device: THZDevice, block: str, refresh_interval: int):
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"THZ {block}",
+            update_interval=timedelta(seconds=int(refresh_interval)),
+        )
+        self.device = device
+        self.block = block
+        self.block_bytes = device.register_map_manager.index.block_bytes[block]
+        self.plan = device.decoder_plans[block]
+        self.field_by_index = tuple(field for _, field, *_ in self.plan.steps)
+        self.payload: bytes | None = None
+        self.changed_fields: frozenset[int] | None = None
+
+    def restore_payload(self, payload: bytes) -> None:
+        """Setzt einen gespeicherten Payload als Startwert, ohne den Bus zu fragen (Warmstart)."""
+        self.payload = payload
+        self.changed_fields = None
+        self.data = self.plan.decode(payload)
+
+    def field_changed(self, field: int) -> bool:
+        return self.changed_fields is None or field in self.changed_fields
+
+    def _diff(self, previous: bytes | None, payload: bytes) -> frozenset[int] | None:
+        if previous is None or len(previous) != len(payload):
+            return None
+        return frozenset(
+            i for i, (start, end) in enumerate(self.plan.fields) if previous[start:end] != payload[start:end]
+        )
+
+    async def _async_update_data(self) -> tuple[Any, ...]:
+        # Bei einem Fehler ändert sich kein Wert, nur die Verfügbarkeit
+        self.changed_fields = frozenset()
+        try:
+            _LOGGER.debug("Lese Block %s ...", self.block)
+            payload = await self.device.refresh_block(self.block_bytes)
+        except Exception as err:
+            raise UpdateFailed(f"Fehler beim Lesen von {self.block}: {err}") from err
+        self.changed_fields = self._diff(self.payload, payload)
+        self.payload = payload
+        return self.plan.decode(payload)
+
+
+class THZParameterCoordinator(DataUpdateCoordinator[dict[str, bytes]]):
+    """Snapshot aller Schreibparameter (number/select/switch/time).
+
+    Liest die Write-Map in einem langsamen Takt; ``data`` enthält je Kommando
+    (Hex-String) die zwei Rohbytes an Offset 4. Gelesen werden nur Kommandos,
+    für die eine aktivierte Entity lauscht (Kontext = Kommando); deaktivierte
+    Entities sind nicht in HA geladen und kosten so keinen Bus-Zugriff. Nach
+    einem Schreibzugriff wird nur das betroffene Kommando nachgelesen.
+    """
+
+    def __init__(self, hass: HomeAssistant, device: THZDevice, commands: list[str], refresh_interval: int):
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="THZ Parameter",
+            update_interval=timedelta(seconds=int(refresh_interval)),
+        )
+        self.device = device
+        self.commands = list(dict.fromkeys(commands))
+        self._snapshot_done = False
+
+    @property
+    def active_commands(self) -> list[str]:
+        """Kommandos mit mindestens einer aktivierten Entity, in Reihenfolge der Write-Map."""
+        contexts = set(self.async_contexts())
+        return [command for command in self.commands if command in contexts]
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE, context: Any = None) -> Callable[[], None]:
+        remove = super().async_add_listener(update_callback, context)
+        # Zur Laufzeit aktivierte Entity: ihren Wert sofort holen statt bis zum nächsten Snapshot zu warten
+        if self._snapshot_done and context is not None and context not in self.data:
+            self.hass.async_create_background_task(self.async_refresh_command(context), f"THZ Parameter {context}")
+        return remove
+
+    async def _read_command(self, command: str, priority: int) -> bytes:
+        return await self.device.read_value(bytes.fromhex(command), "get", 4, 2, priority=priority)
+
+    async def _async_update_data(self) -> dict[str, bytes]:
+        data = dict(self.data or {})
+        commands = self.active_commands
+        failed = 0
+        for command in commands:
+            try:
+                data[command] = await self._read_command(command, const.PRIORITY_POLL)
+            except Exception as err:
+                failed += 1
+                _LOGGER.debug("Parameter %s konnte nicht gelesen werden: %s", command, err)
+        if commands and failed == len(commands):
+            raise UpdateFailed("Keiner der Schreibparameter konnte gelesen werden")
+        _LOGGER.debug("Parameter-Snapshot: %d Kommandos gelesen, %d Fehler", len(commands) - failed, failed)
+        self._snapshot_done = True
+        return data
+
+    async def async_refresh_command(self, command: str) -> None:
+        """Liest ein einzelnes Kommando neu (z. B. nach einem Schreibzugriff) und benachrichtigt die Entities."""
+        try:
+            value = await self._read_command(command, const.PRIORITY_USER)
+        except Exception as err:
+            _LOGGER.warning("Parameter %s konnte nach dem Schreiben nicht gelesen werden: %s", command, err)
+            return
+        if self.data is None:
+            self.data = {}
+        self.data[command] = value
+        self.async_update_listeners()
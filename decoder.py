@@ -0,0 +1,177 @@
+"""Kompilierte Decoder-Pläne für die Register-Blöcke.
+
+Offsets und Längen der Register-Maps zählen Hex-Zeichen der Antwort (wie im
+FHEM-Modul 00_THZ.pm), eine Länge von 1 adressiert also ein Nibble. Jeder
+Block wird einmal in eine flache Liste von Schritten übersetzt; das Dekodieren
+eines Payloads ist dann ein einziger Durchlauf ohne Auswertung der Typ-Strings.
+"""
+import struct
+from typing import Any, Callable, Iterable
+
+OPMODE = {"1": "standby", "11": "automatic", "3": "DAYmode", "4": "setback", "5": "DHWmode", "14": "manual", "0": "emergency"}
+OPMODE2 = {"0": "manual", "1": "automatic"}
+OPMODE_HC = {"1": "normal", "2": "setback", "3": "standby", "4": "restart", "5": "restart"}
+SOMWINMODE = {"01": "winter", "02": "summer"}
+WEEKDAY = {"0": "Monday", "1": "Tuesday", "2": "Wednesday", "3": "Thursday", "4": "Friday", "5": "Saturday", "6": "Sunday"}
+FAULTMAP = {"0": "n.a.", "1": "F01_AnodeFault", "2": "F02_SafetyTempDelimiterEngaged", "3": "F03_HighPreasureGuardFault", "4": "F04_LowPreasureGuardFault", "5": "F05_OutletFanFault", "6": "F06_InletFanFault", "7": "F07_MainOutputFanFault", "11": "F11_LowPreasureSensorFault", "12": "F12_HighPreasureSensorFault", "15": "F15_DHW_TemperatureFault", "17": "F17_DefrostingDurationExceeded", "20": "F20_SolarSensorFault", "21": "F21_OutsideTemperatureSensorFault", "22": "F22_HotGasTemperatureFault", "23": "F23_CondenserTemperatureSensorFault", "24": "F24_EvaporatorTemperatureSensorFault", "26": "F26_ReturnTemperatureSensorFault", "28": "F28_FlowTemperatureSensorFault", "29": "F29_DHW_TemperatureSensorFault", "30": "F30_SoftwareVersionFault", "31": "F31_RAMfault", "32": "F32_EEPromFault", "33": "F33_ExtractAirHumiditySensor", "34": "F34_FlowSensor", "35": "F35_minFlowCooling", "36": "F36_MinFlowRate", "37": "F37_MinWaterPressure", "40": "F40_FloatSwitch", "50": "F50_SensorHeatPumpReturn", "51": "F51_SensorHeatPumpFlow", "52": "F52_SensorCondenserOutlet"}
+
+_MAPS_BY_VALUE = {"opmode": OPMODE, "opmode2": OPMODE2, "opmodehc": OPMODE_HC, "faultmap": FAULTMAP}
+_MAPS_BY_HEX = {"somwinmode": SOMWINMODE, "weekday": WEEKDAY}
+
+
+def _scaled(value, divisor):
+    return value if divisor == 1 else value / divisor
+
+
+def _op_hex(v: int, arg, divisor):
+    return _scaled(v, divisor)
+
+
+def _op_hex2int(v: int, arg, divisor):
+    v &= 0xFFFF
+    if v >= 0x8000:
+        v -= 0x10000
+    return _scaled(v, divisor)
+
+
+def _op_bit(v: int, bit: int, divisor):
+    return _scaled((v >> bit) & 1, divisor)
+
+
+def _op_nbit(v: int, bit: int, divisor):
+    return _scaled(1 - ((v >> bit) & 1), divisor)
+
+
+def _op_year(v: int, arg, divisor):
+    return _scaled(v + 2000, divisor)
+
+
+def _op_esp_mant(v: int, arg, divisor):
+    return round(struct.unpack(">f", (v & 0xFFFFFFFF).to_bytes(4, "big"))[0], 3)
+
+
+def _op_hex2time(v: int, arg, divisor):
+    return f"{v // 100:02d}:{v % 100:02d}"
+
+
+def _op_hexdate(v: int, arg, divisor):
+    return f"{v // 100:02d}.{v % 100:02d}"
+
+
+def _op_swver(v: int, arg, divisor):
+    return f"{v >> 8}.{v & 0xFF:02d}"
+
+
+def _op_hex2ascii(v: int, nibbles: int, divisor):
+    return bytes.fromhex(f"{v:0{nibbles}X}").decode("ascii", errors="replace").upper()
+
+
+def _op_map_value(v: int, table: dict, divisor):
+    return table.get(str(v))
+
+
+def _op_map_hex(v: int, arg: tuple, divisor):
+    nibbles, table = arg
+    return table.get(f"{v:0{nibbles}X}")
+
+
+def _op_hex2error(v: int, nibbles: int, divisor):
+    # Bitmap LSB-first je Byte, Index ab 1 (bitmap2string in 00_THZ.pm)
+    data = v.to_bytes((nibbles + 1) // 2, "big")
+    names = []
+    idx = 1
+    for byte in data:
+        for bit in range(8):
+            if byte >> bit & 1:
+                names.append(FAULTMAP.get(str(idx), ""))
+            idx += 1
+    return "".join(names)
+
+
+def _op_raw(v: int, nibbles: int, divisor):
+    return f"{v:0{nibbles}X}"
+
+
+_PLAIN_TYPES = frozenset({"hex", "hex2int", "esp_mant", "hex2time", "hexdate", "year", "swver",
+                          "hex2ascii", "hex2error", "raw", *_MAPS_BY_VALUE, *_MAPS_BY_HEX})
+
+
+def is_supported_type(decode_type: str) -> bool:
+    """True, wenn der Typ eigens dekodiert wird (statt als Hex-String)."""
+    if decode_type in _PLAIN_TYPES:
+        return True
+    for prefix in ("nbit", "bit"):
+        if decode_type.startswith(prefix):
+            return decode_type[len(prefix):].isdigit()
+    return False
+
+
+def _compile_op(decode_type: str, nibbles: int) -> tuple[Callable, Any]:
+    if decode_type == "hex":
+        return _op_hex, None
+    if decode_type == "hex2int":
+        return _op_hex2int, None
+    if decode_type.startswith("nbit"):
+        return _op_nbit, int(decode_type[4:])
+    if decode_type.startswith("bit"):
+        return _op_bit, int(decode_type[3:])
+    if decode_type == "esp_mant":
+        return _op_esp_mant, None
+    if decode_type == "hex2time":
+        return _op_hex2time, None
+    if decode_type == "hexdate":
+        return _op_hexdate, None
+    if decode_type == "year":
+        return _op_year, None
+    if decode_type == "swver":
+        return _op_swver, None
+    if decode_type == "hex2ascii":
+        return _op_hex2ascii, nibbles
+    if decode_type == "hex2error":
+        return _op_hex2error, nibbles
+    if decode_type in _MAPS_BY_VALUE:
+        return _op_map_value, _MAPS_BY_VALUE[decode_type]
+    if decode_type in _MAPS_BY_HEX:
+        return _op_map_hex, (nibbles, _MAPS_BY_HEX[decode_type])
+    # "raw" und unbekannte Typen: Hex-String
+    return _op_raw, nibbles
+
+
+class THZDecoderPlan:
+    """Dekodiert das Payload eines Blocks in einem Durchlauf in alle Werte des Blocks."""
+
+    __slots__ = ("fields", "steps", "names")
+
+    def __init__(self, entries: Iterable[tuple]):
+        fields: dict[tuple[int, int], int] = {}
+        steps = []
+        for name, offset, length, decode_type, divisor in entries:
+            start = offset // 2
+            end = (offset + length + 1) // 2
+            field = fields.setdefault((start, end), len(fields))
+            shift = 4 if (offset + length) % 2 else 0
+            mask = (1 << (4 * length)) - 1
+            op, arg = _compile_op(decode_type, length)
+            steps.append((name.strip(), field, shift, mask, op, arg, divisor))
+        self.fields = tuple(fields)
+        self.steps = tuple(steps)
+        self.names = tuple(step[0] for step in steps)
+
+    def decode(self, payload: bytes) -> tuple[Any, ...]:
+        """Liefert die Werte in der Reihenfolge der Einträge; Werte außerhalb des Payloads sind None.
+
+        Indiziert wird über die Position im Block, weil Namen innerhalb eines
+        Blocks mehrfach vorkommen können (z. B. "/" in pxxFC bei 439/539).
+        """
+        size = len(payload)
+        raw = [int.from_bytes(payload[start:end], "big") if end <= size else None for start, end in self.fields]
+        values = []
+        for _, field, shift, mask, op, arg, divisor in self.steps:
+            v = raw[field]
+            values.append(None if v is None else op((v >> shift) & mask, arg, divisor))
+        return tuple(values)
+
+
+def compile_register_map(register_map: dict[str, list]) -> dict[str, THZDecoderPlan]:
+    """Kompiliert alle Blöcke einer (gemergten) Register-Map: {"pxxFB": Plan, ...}."""
+    return {block: THZDecoderPlan(entries) for block, entries in register_map.items()}
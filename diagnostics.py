@@ -0,0 +1,32 @@
+"""Diagnose-Download: Verbindung, Warteschlange, Cache, Circuit Breaker und Bus-Messwerte."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.config_entries import ConfigEntry # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.core import HomeAssistant # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from .const import DOMAIN
+from .thz_device import THZDevice
+
+TO_REDACT = {"host", "device"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    device: THZDevice = entry_data["device"]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "firmware_version": device.firmware_version,
+        "link": device.get_link_stats(),
+        "io": device.get_io_stats(),
+        "latency": device.get_latency_stats(),
+        "cache": device.get_cache_stats(),
+        "breakers": device.get_breaker_stats(),
+        "coordinators": {
+            block: {
+                "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+                "last_update_success": coordinator.last_update_success,
+            }
+            for block, coordinator in entry_data["coordinators"].items()
+        },
+    }
@@ -0,0 +1,140 @@
+"""Unveränderliche Beschreibungen der Entities, einmal je Firmware gebaut.
+
+Sensoren und Schreibparameter verweisen auf ihren Deskriptor statt die
+Metadaten in eigene Attribute zu kopieren. Unique-ID-Suffix, Einheit,
+Optionslisten und die Rückwärts-Tabellen der Auswahl-Entities werden hier
+einmal berechnet und von allen Entities (auch mehrerer Wärmepumpen) geteilt.
+"""
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+from .decoder import FAULTMAP, OPMODE, OPMODE2, OPMODE_HC, SOMWINMODE, WEEKDAY
+from .register_maps.register_map_manager import get_register_index, get_write_index
+from .sensor_meta import SENSOR_META
+
+SELECT_MAP = {
+    "2opmode":    OPMODE,
+    "OpModeHC":   OPMODE_HC,
+    "OpMode2":    OPMODE2,
+    "SomWinMode": SOMWINMODE,
+    "weekday":    WEEKDAY,
+    "faultmap":   FAULTMAP,
+}
+
+# Unbenannte Register ("x60:") und Rohwerte sind nur für die Fehlersuche interessant
+_DIAGNOSTIC_NAME = re.compile(r"x\d+:?")
+# Die Wochenprogramme (~120 Zeitfenster) braucht kaum jemand als Entity; sie kosten je einen Read
+_DISABLED_PARAMETER_TYPES = frozenset({"7prog"})
+
+
+class SensorDescriptor(NamedTuple):
+    """Ein Wert eines Lese-Blocks; ``offset`` in Bytes wie in den bisherigen Unique IDs."""
+
+    key: str
+    block: str
+    block_bytes: bytes
+    index: int  # Position im Block = Index in THZBlockCoordinator.data
+    offset: int
+    unique_suffix: str
+    unit: str | None
+    device_class: str | None
+    icon: str | None
+    translation_key: str | None
+    diagnostic: bool
+    enabled_default: bool
+    heartbeat: float | None
+
+
+class ParameterDescriptor(NamedTuple):
+    """Ein Schreibparameter mit vorab umgerechneten Grenzen und Optionstabellen."""
+
+    key: str
+    command: str
+    command_bytes: bytes
+    platform: str
+    unique_suffix: str
+    min_value: float | None
+    max_value: float | None
+    step: float
+    unit: str
+    device_class: str | None
+    icon: str | None
+    decode_type: str | None
+    options: tuple[str, ...] | None
+    option_by_value: Mapping[int, str] | None
+    value_by_option: Mapping[str, int] | None
+    enabled_default: bool
+
+
+def _unique_name(name: str) -> str:
+    return name.lower().replace(' ', '_')
+
+
+def _float_or_none(value) -> float | None:
+    # Zeit-Parameter tragen "00:00"/"23:59" als Grenzen, die für HA keine Rolle spielen
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_sensor_descriptors(firmware_version: str) -> Mapping[str, tuple[SensorDescriptor, ...]]:
+    """{Block: Deskriptoren} in der Reihenfolge des RegisterIndex."""
+    index = get_register_index(firmware_version)
+    result = {}
+    for block, entries in index.blocks.items():
+        block_bytes = index.block_bytes[block]
+        descriptors = []
+        for position, entry in enumerate(entries):
+            meta = SENSOR_META.get(entry.name, {})
+            offset = entry.offset // 2  # Register-Offset in Bytes
+            diagnostic = entry.decode == "raw" or _DIAGNOSTIC_NAME.fullmatch(entry.name) is not None
+            descriptors.append(SensorDescriptor(
+                key=entry.name,
+                block=block,
+                block_bytes=block_bytes,
+                index=position,
+                offset=offset,
+                unique_suffix=f"thz_{block_bytes}_{offset}_{_unique_name(entry.name)}",
+                unit=meta.get("unit"),
+                device_class=meta.get("device_class"),
+                icon=meta.get("icon"),
+                translation_key=meta.get("translation_key"),
+                diagnostic=diagnostic,
+                enabled_default=not diagnostic,
+                heartbeat=meta.get("heartbeat"),
+            ))
+        result[block] = tuple(descriptors)
+    return MappingProxyType(result)
+
+
+@lru_cache(maxsize=None)
+def get_parameter_descriptors(firmware_version: str) -> Mapping[str, tuple[ParameterDescriptor, ...]]:
+    """{Plattform ("number", "select", ...): Deskriptoren} aus dem WriteIndex."""
+    result: dict[str, list[ParameterDescriptor]] = {}
+    for name, entry in get_write_index(firmware_version).entries.items():
+        decode_type = entry.get("decode_type")
+        table = SELECT_MAP.get(decode_type)
+        step = entry.get("step", 1)
+        result.setdefault(entry["type"], []).append(ParameterDescriptor(
+            key=name,
+            command=entry["command"],
+            command_bytes=bytes.fromhex(entry["command"]),
+            platform=entry["type"],
+            unique_suffix=f"thz_{_unique_name(name)}",
+            min_value=_float_or_none(entry.get("min", "")),
+            max_value=_float_or_none(entry.get("max", "")),
+            step=float(step) if step != "" else 1,
+            unit=entry.get("unit", ""),
+            device_class=entry.get("device_class"),
+            icon=entry.get("icon"),
+            decode_type=decode_type,
+            options=tuple(table.values()) if table else None,
+            option_by_value=MappingProxyType({int(k): v for k, v in table.items()}) if table else None,
+            value_by_option=MappingProxyType({v: int(k) for k, v in table.items()}) if table else None,
+            enabled_default=decode_type not in _DISABLED_PARAMETER_TYPES,
+        ))
+    return MappingProxyType({platform: tuple(items) for platform, items in result.items()})
@@ -0,0 +1,95 @@
+"""Mitschnitt der Roh-Telegramme (TX/RX) in einem begrenzten Ringpuffer.
+
+Ausgeschaltet kostet der Recorder nur die Abfrage ``trace.enabled`` an den
+Aufrufstellen. Eingeschaltet wird je Telegramm ein Tupel aus monotoner
+Zeit, Richtung, Adresse und Bytes abgelegt; die ältesten Einträge fallen
+heraus. Der Export schreibt JSON-Lines, die ``read_trace`` wieder einliest
+(Offline-Analyse, Wiedergabe im Simulator).
+"""
+import json
+import time
+from collections import deque
+from typing import Iterator, NamedTuple
+
+TRACE_FORMAT = 1
+DEFAULT_TRACE_SIZE = 2000
+
+TX = "tx"
+RX = "rx"
+ERROR = "err"
+
+
+class TraceRecord(NamedTuple):
+    time: float  # time.monotonic()
+    direction: str  # TX, RX oder ERROR
+    addr: bytes
+    data: bytes  # TX: Telegramm wie gesendet, RX: Antwort ohne Escapes, ERROR: Name der Exception
+
+
+class THZFrameTrace:
+    """Ringpuffer der zuletzt gesendeten und empfangenen Telegramme."""
+
+    __slots__ = ("enabled", "_records")
+
+    def __init__(self, size: int = DEFAULT_TRACE_SIZE):
+        self.enabled = False
+        self._records: deque[TraceRecord] = deque(maxlen=size)
+
+    @property
+    def size(self) -> int:
+        return self._records.maxlen
+
+    def start(self, size: int | None = None) -> None:
+        if size is not None and size != self._records.maxlen:
+            self._records = deque(self._records, maxlen=size)
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def record(self, direction: str, addr: bytes, data: bytes) -> None:
+        """Nur aufrufen, wenn ``enabled`` gesetzt ist."""
+        self._records.append(TraceRecord(time.monotonic(), direction, addr, bytes(data)))
+
+    def records(self) -> list[TraceRecord]:
+        return list(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def export(self, path: str, firmware_version: str | None = None) -> int:
+        """Schreibt den Puffer als JSON-Lines (blockierend, im Executor aufrufen); liefert die Anzahl Einträge."""
+        records = self.records()
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(json.dumps({
+                "format": TRACE_FORMAT,
+                "firmware": firmware_version,
+                "exported": time.time(),
+                "monotonic": time.monotonic(),
+            }) + "\n")
+            for record in records:
+                file.write(json.dumps(
+                    {"t": round(record.time, 6), "dir": record.direction, "addr": record.addr.hex(), "data": record.data.hex()},
+                    separators=(",", ":"),
+                ) + "\n")
+        return len(records)
+
+
+def read_trace(path: str) -> tuple[dict, Iterator[TraceRecord]]:
+    """Liest eine exportierte Trace-Datei: (Kopfzeile, Einträge)."""
+    with open(path, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    header = json.loads(lines[0])
+    if header.get("format") != TRACE_FORMAT:
+        raise ValueError(f"Unbekanntes Trace-Format: {header.get('format')}")
+
+    def records() -> Iterator[TraceRecord]:
+        for line in lines[1:]:
+            if line:
+                item = json.loads(line)
+                yield TraceRecord(item["t"], item["dir"], bytes.fromhex(item["addr"]), bytes.fromhex(item["data"]))
+
+    return header, records()
@@ -0,0 +1,125 @@
+from bisect import bisect_left
+from collections import Counter, deque
+
+# Obergrenzen der Latenz-Buckets in Sekunden; darüber zählt ein Überlauf-Bucket
+LATENCY_BUCKETS = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+#: Phasen einer Bus-Transaktion (THZDevice.send_request)
+STAGES = ("greeting", "telegram", "data", "total")
+
+
+class THZHistogram:
+    """Latenz-Histogramm mit festen Buckets: konstanter Speicher, Perzentile als Bucket-Obergrenze."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Obergrenze des Buckets, in dem das p-Perzentil liegt (höchstens das Maximum)."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                bound = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def get_stats(self) -> dict:
+        """Kennzahlen in Millisekunden."""
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p95_ms": round(self.percentile(95) * 1000, 1),
+            "p99_ms": round(self.percentile(99) * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+class THZBusMetrics:
+    """Messwerte aller Bus-Transaktionen: Phasen, Latenz je Adresse, Fehler und Auslastung.
+
+    Jede Messung ist ein Bucket-Inkrement bzw. eine Addition; es werden keine
+    Einzelwerte gespeichert. Die Belegungszeit wird je Minute summiert
+    (die letzten ``minutes`` Minuten).
+
+    Alle Zeitpunkte (``started``, ``now``) stammen von derselben Uhr, der
+    Event-Loop (``loop.time()``).
+    """
+
+    __slots__ = ("stages", "addresses", "errors", "timeouts", "_busy", "_started")
+
+    def __init__(self, started: float, minutes: int = 15):
+        self.stages = {stage: THZHistogram() for stage in STAGES}
+        self.addresses: dict[bytes, THZHistogram] = {}
+        self.errors: Counter[str] = Counter()
+        self.timeouts = 0
+        self._busy: deque[list] = deque(maxlen=minutes)  # [Minute, belegte Sekunden]
+        self._started = started
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        self.stages[stage].record(seconds)
+
+    def record_transaction(self, addr_bytes: bytes, started: float, seconds: float, error: Exception | None = None) -> None:
+        """Verbucht einen Versuch (auch fehlgeschlagene) als Belegungszeit; Latenz nur bei Erfolg."""
+        minute = int(started // 60)
+        if self._busy and self._busy[-1][0] == minute:
+            self._busy[-1][1] += seconds
+        else:
+            self._busy.append([minute, seconds])
+        if error is not None:
+            self.errors[type(error).__name__] += 1
+            return
+        histogram = self.addresses.get(addr_bytes)
+        if histogram is None:
+            histogram = self.addresses[addr_bytes] = THZHistogram()
+        histogram.record(seconds)
+
+    def busy_per_minute(self, now: float) -> list[float]:
+        """Belegte Sekunden der abgeschlossenen Minuten, älteste zuerst (Minuten ohne Verkehr = 0)."""
+        current = int(now // 60)
+        busy = {minute: seconds for minute, seconds in self._busy}
+        first = max(current - self._busy.maxlen, int(self._started // 60))
+        return [round(busy.get(minute, 0.0), 3) for minute in range(first, current)]
+
+    def utilization(self, now: float, minutes: int = 5) -> float:
+        """Anteil der Busbelegung in Prozent über die letzten abgeschlossenen Minuten.
+
+        Vor der ersten vollen Minute zählt die laufende Minute anteilig.
+        """
+        completed = self.busy_per_minute(now)[-minutes:]
+        if completed:
+            return round(sum(completed) / (60 * len(completed)) * 100, 1)
+        elapsed = now - self._started
+        if elapsed <= 0 or not self._busy:
+            return 0.0
+        return round(min(self._busy[-1][1] / elapsed, 1.0) * 100, 1)
+
+    def latency(self) -> THZHistogram:
+        """Gesamtlatenz erfolgreicher Transaktionen."""
+        return self.stages["total"]
+
+    def get_stats(self, now: float) -> dict:
+        return {
+            "stages": {stage: histogram.get_stats() for stage, histogram in self.stages.items()},
+            "addresses": {addr.hex().upper(): histogram.get_stats() for addr, histogram in self.addresses.items()},
+            "errors": dict(self.errors),
+            "timeouts": self.timeouts,
+            "utilization": self.utilization(now),
+            "busy_per_minute": self.busy_per_minute(now),
+        }
@@ -1,66 +1,87 @@
 from homeassistant.components.number import NumberEntity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
-from .register_maps.register_map_manager import RegisterMapManager_Write
+from homeassistant.core import callback # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.update_coordinator import CoordinatorEntity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from .entity_descriptors import ParameterDescriptor, get_parameter_descriptors
 from .thz_device import THZDevice
+from .coordinator import THZParameterCoordinator
 from .const import DOMAIN
-import asyncio
 
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
-# ... create THZNumber entities ...
-    entities = []
-    write_manager: RegisterMapManager_Write = hass.data[DOMAIN]["write_manager"]
-    device: THZDevice = hass.data[DOMAIN]["device"]
-    write_registers = write_manager.get_all_registers()
-    _LOGGER.debug(f"write_registers: {write_registers}")
-    for name, entry in write_registers.items():
-        if entry["type"] == "number":
-            _LOGGER.debug(f"Creating THZNumber for {name} with command {entry['command']}")
-            entity = THZNumber(
-                name=name,
-                command=entry["command"],
-                min_value=entry["min"],
-                max_value=entry["max"],
-                step=entry.get("step", 1),
-                unit=entry.get("unit", ""),
-                device_class=entry.get("device_class"),
-                device=device,
-                icon=entry.get("icon"),
-                unique_id=f"thz_{name.lower().replace(' ', '_')}",
-            )
-            entities.append(entity)
-        
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    device: THZDevice = entry_data["device"]
+    coordinator: THZParameterCoordinator = entry_data["parameter_coordinator"]
+    entities = [
+        THZNumber(descriptor, device, coordinator, config_entry.entry_id)
+        for descriptor in get_parameter_descriptors(device.firmware_version).get("number", ())
+    ]
+    _LOGGER.debug("Creating %d THZNumber entities", len(entities))
     async_add_entities(entities)
-class THZNumber(NumberEntity):
-    def __init__(self, name:str, command:bytes, min_value, max_value, step, unit, device_class, device, icon=None, unique_id=None):
-        self._attr_name = name
-        self._command = command
-        self._attr_native_min_value = float(min_value) if min_value != "" else None
-        self._attr_native_max_value = float(max_value) if max_value != "" else None
-        self._attr_native_step = float(step) if step != "" else 1
-        self._attr_native_unit_of_measurement = unit
-        self._attr_device_class = device_class
+
+
+class THZNumber(CoordinatorEntity, NumberEntity):
+    """Schreibparameter als Zahl; der Wert kommt aus dem Parameter-Snapshot."""
+
+    def __init__(self, descriptor: ParameterDescriptor, device: THZDevice, coordinator: THZParameterCoordinator, entry_id: str):
+        super().__init__(coordinator, context=descriptor.command)
+        self._desc = descriptor
         self._device = device
-        self._attr_icon = icon or "mdi:eye"
-        self._attr_unique_id = unique_id or f"thz_set_{command.lower()}_{name.lower().replace(' ', '_')}"
+        self._attr_unique_id = f"{entry_id}_{descriptor.unique_suffix}"
         self._attr_native_value = None
+        self._update_from_snapshot()
+
+    @property
+    def name(self):
+        return self._desc.key
+
+    @property
+    def entity_registry_enabled_default(self):
+        return self._desc.enabled_default
+
+    @property
+    def icon(self):
+        return self._desc.icon or "mdi:eye"
+
+    @property
+    def device_class(self):
+        return self._desc.device_class
+
+    @property
+    def native_min_value(self):
+        return self._desc.min_value
+
+    @property
+    def native_max_value(self):
+        return self._desc.max_value
+
+    @property
+    def native_step(self):
+        return self._desc.step
+
+    @property
+    def native_unit_of_measurement(self):
+        return self._desc.unit
 
     @property
     def native_value(self):
         return self._attr_native_value
 
-    async def async_update(self):
-        # _LOGGER.debug(f"Updating number {self._attr_name} with command {self._command}")
-        async with self._device.lock:
-            value_bytes = await self.hass.async_add_executor_job(self._device.read_value, bytes.fromhex(self._command), "get", 4, 2)
-        value = int.from_bytes(value_bytes, byteorder='big', signed=False)*self._attr_native_step
-        self._attr_native_value = value
+    def _update_from_snapshot(self) -> None:
+        value_bytes = (self.coordinator.data or {}).get(self._desc.command)
+        if value_bytes is not None:
+            self._attr_native_value = int.from_bytes(value_bytes, byteorder='big', signed=False)*self._desc.step
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_snapshot()
+        self.async_write_ha_state()
 
     async def async_set_native_value(self, value: float):
-        value_int = int(value)
-        async with self._device.lock:
-            await self.hass.async_add_executor_job(self._device.write_value, bytes.fromhex(self._command), value_int/self._attr_native_step)
+        value_int = round(value / self._desc.step)
+        await self._device.write_value(self._desc.command_bytes, value_int.to_bytes(2, byteorder='big', signed=False))
         self._attr_native_value = value
-
+        self.async_write_ha_state()
+        await self.coordinator.async_refresh_command(self._desc.command)
@@ -0,0 +1,73 @@
+import asyncio
+
+
+class THZPacer:
+    """Adaptive Pause zwischen zwei Anfragen an die Wärmepumpe.
+
+    Die Pause wird nach einer Serie fehlerfreier Anfragen um 10 % (mindestens
+    ``step``) verkürzt und bei einem "Timing Issue" (Antwort 01 01) sofort verdoppelt.
+    So pendelt sie sich knapp oberhalb der Grenze ein, ab der das Gerät mit
+    Timing-Fehlern antwortet. Zusätzlich werden Antwortzeiten und
+    Fehlerrate mitgeführt.
+    """
+
+    __slots__ = (
+        "gap", "min_gap", "max_gap", "step", "success_window",
+        "_streak", "_last_end", "_turnaround", "_turnaround_max", "_error_rate",
+        "requests", "timing_errors",
+    )
+
+    def __init__(self, initial_gap: float = 0.1, min_gap: float = 0.0, max_gap: float = 1.0,
+                 step: float = 0.005, success_window: int = 10):
+        self.gap = initial_gap
+        self.min_gap = min_gap
+        self.max_gap = max_gap
+        self.step = step
+        self.success_window = success_window
+        self._streak = 0
+        self._last_end = 0.0
+        self._turnaround: float | None = None
+        self._turnaround_max = 0.0
+        self._error_rate = 0.0
+        self.requests = 0
+        self.timing_errors = 0
+
+    @property
+    def turnaround(self) -> float | None:
+        """Gleitender Mittelwert der Antwortzeit (None vor der ersten Anfrage)."""
+        return self._turnaround
+
+    async def wait(self) -> None:
+        """Wartet, bis seit dem Ende der letzten Anfrage die aktuelle Pause verstrichen ist."""
+        delay = self._last_end + self.gap - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, turnaround: float, timing_error: bool = False) -> None:
+        """Verbucht eine abgeschlossene Anfrage und passt die Pause an."""
+        self._last_end = asyncio.get_running_loop().time()
+        self.requests += 1
+        self._turnaround = turnaround if self._turnaround is None else 0.9 * self._turnaround + 0.1 * turnaround
+        self._turnaround_max = max(self._turnaround_max, turnaround)
+        self._error_rate = 0.95 * self._error_rate + (0.05 if timing_error else 0.0)
+
+        if timing_error:
+            self.timing_errors += 1
+            self._streak = 0
+            self.gap = min(self.max_gap, max(self.gap * 2, self.step * 4))
+            return
+
+        self._streak += 1
+        if self._streak >= self.success_window:
+            self._streak = 0
+            self.gap = max(self.min_gap, self.gap - max(self.step, self.gap * 0.1))
+
+    def get_stats(self) -> dict:
+        return {
+            "gap": round(self.gap, 4),
+            "turnaround_avg": round(self._turnaround or 0.0, 4),
+            "turnaround_max": round(self._turnaround_max, 4),
+            "timing_error_rate": round(self._error_rate, 4),
+            "timing_errors": self.timing_errors,
+            "requests": self.requests,
+        }
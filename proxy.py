@@ -0,0 +1,191 @@
+"""Multiplexing-Proxy für die serielle Schnittstelle der Wärmepumpe.
+
+Der Proxy besitzt den seriellen Port und spricht zu beliebig vielen Clients
+das ser.net-kompatible TCP-Protokoll (rohe THZ-Telegramme inkl. Handshake).
+Jede Client-Transaktion wird als Ganzes über die Warteschlange von
+``THZDevice`` ausgeführt; gleichzeitige, identische Leseanfragen teilen sich
+dabei einen Bus-Zugriff. Home Assistant, FHEM oder Diagnose-Skripte
+verbinden sich dann per IP statt direkt auf den USB-Port.
+
+Der Proxy braucht keine laufende Home-Assistant-Instanz. Das Paket
+``custom_components.thz`` importiert aber Home Assistant, deshalb startet er
+nur in einer Python-Umgebung mit installiertem Home Assistant (z. B. im
+HA-Container bzw. dessen venv), aus dem Konfigurationsverzeichnis:
+
+    python -m custom_components.thz.proxy --serial /dev/ttyUSB0 --listen 0.0.0.0:2323
+"""
+import argparse
+import asyncio
+import logging
+from contextlib import suppress
+
+from . import const
+from .thz_device import THZDevice
+from .thz_protocol import DEVICE_ERRORS, HEADER_GET, HEADER_SET, THZFrameParser, THZProtocolError, checksum, escape
+
+_LOGGER = logging.getLogger(__name__)
+
+_ERROR_HEADERS = {error: header for header, (error, _) in DEVICE_ERRORS.items()}
+_HEADER_REQUEST_CRC = b'\x01\x02'
+
+
+def _response_frame(header: bytes, body: bytes = b"") -> bytes:
+    """Baut ein Antwort-Telegramm wie die Wärmepumpe: Header, CRC, Daten, 10 03."""
+    crc = checksum(header + b'\x00' + body)
+    return header + escape(bytes([crc]) + body) + const.DATALINKESCAPE + const.ENDOFTEXT
+
+
+class THZProxy:
+    """TCP-Server, der Client-Transaktionen auf ein gemeinsames THZDevice abbildet."""
+
+    def __init__(self, device: THZDevice, client_timeout: float = 5.0):
+        self.device = device
+        self.client_timeout = client_timeout
+        self._server: asyncio.AbstractServer | None = None
+        self._clients: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._inflight: dict[bytes, asyncio.Future] = {}
+        self._stats = {"clients": 0, "clients_total": 0, "transactions": 0, "shared": 0, "errors": 0}
+
+    async def start(self, host: str, port: int) -> int:
+        """Startet den Server und liefert den Port (bei ``port=0`` frei gewählt)."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        _LOGGER.info("THZ-Proxy lauscht auf %s", ", ".join(str(s.getsockname()) for s in self._server.sockets))
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Nimmt keine Clients mehr an, trennt die verbundenen und wartet auf ihre Tasks."""
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+        for task, writer in list(self._clients.items()):
+            writer.close()
+            task.cancel()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+        # erst danach: wait_closed wartet (ab Python 3.12) auch auf offene Verbindungen
+        if server is not None:
+            await server.wait_closed()
+
+    def get_stats(self) -> dict:
+        """Client- und Transaktionszähler; Bus-Kennzahlen (u. a. zusammengelegte Reads) liefert das Device."""
+        return {**self._stats, "bus": self.device.get_io_stats()}
+
+    def _submit(self, addr_bytes: bytes, get_or_set: str, priority: int) -> asyncio.Future:
+        """Reicht Adresse + Daten unverändert weiter; identische Reads teilen sich eine Bus-Transaktion.
+
+        Wartende Reads legt schon die Warteschlange des Device zusammen, hier
+        kommen zusätzlich Reads hinzu, deren Transaktion bereits läuft.
+        """
+        if get_or_set == "get":
+            future = self._inflight.get(addr_bytes)
+            if future is not None:
+                self._stats["shared"] += 1
+                return asyncio.shield(future)
+        future = asyncio.ensure_future(self.device.read_block(addr_bytes, get_or_set, priority=priority))
+        if get_or_set == "get":
+            self._inflight[addr_bytes] = future
+            future.add_done_callback(lambda _f, key=addr_bytes: self._inflight.pop(key, None))
+        return asyncio.shield(future)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        task = asyncio.current_task()
+        self._clients[task] = writer
+        self._stats["clients"] += 1
+        self._stats["clients_total"] += 1
+        _LOGGER.debug("Client verbunden: %s", peer)
+        try:
+            while True:
+                greeting = await reader.readexactly(1)
+                if greeting != const.STARTOFTEXT:
+                    continue
+                writer.write(const.DATALINKESCAPE)
+                async with asyncio.timeout(self.client_timeout):
+                    await self._transaction(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, TimeoutError) as err:
+            _LOGGER.debug("Client %s getrennt: %s", peer, err)
+        finally:
+            self._clients.pop(task, None)
+            self._stats["clients"] -= 1
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _transaction(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Eine vollständige Anfrage: Telegramm lesen, 10 02, auf 10 warten, Antwort, abschließendes 02."""
+        request = THZFrameParser()
+        malformed = False
+        while not request.complete:
+            try:
+                request.feed(await reader.readexactly(1))
+            except THZProtocolError as err:
+                # Rest des Telegramms verwerfen und wie bei falscher Checksumme antworten
+                _LOGGER.debug("Ungültiges Telegramm vom Client: %s", err)
+                await reader.readuntil(const.DATALINKESCAPE + const.ENDOFTEXT)
+                malformed = True
+                break
+        frame = bytes(request.frame)
+        self._stats["transactions"] += 1
+
+        result: asyncio.Future | None = None
+        if malformed or len(frame) < 4 or request.checksum != frame[2]:
+            response = _response_frame(_HEADER_REQUEST_CRC)
+        else:
+            header = frame[:2]
+            get_or_set = "set" if header == HEADER_SET else "get"
+            priority = const.PRIORITY_WRITE if get_or_set == "set" else const.PRIORITY_POLL
+            result = self._submit(frame[3:], get_or_set, priority)
+            response = None
+
+        writer.write(const.DATALINKESCAPE + const.STARTOFTEXT)
+        ack = await reader.readexactly(1)
+        if ack != const.DATALINKESCAPE:
+            if result is not None:
+                result.cancel()
+            raise ConnectionError(f"Unerwartete Bestätigung vom Client: {ack.hex()}")
+
+        if result is not None:
+            try:
+                data = await result
+            except Exception as err:
+                self._stats["errors"] += 1
+                header = _ERROR_HEADERS.get(type(err))
+                if header is None:
+                    # Kein Gerätefehler (z. B. Verbindung weg): Client läuft in seinen Timeout
+                    raise ConnectionError(f"Anfrage fehlgeschlagen: {err}") from err
+                response = _response_frame(header)
+            else:
+                response = _response_frame(HEADER_SET if get_or_set == "set" else HEADER_GET, data[1:])
+        writer.write(response)
+        await writer.drain()
+        await reader.readexactly(1)  # abschließendes 02
+
+
+async def _run(args: argparse.Namespace) -> None:
+    device = THZDevice(connection="usb", port=args.serial, baudrate=args.baudrate)
+    await device.async_initialize(None)
+    proxy = THZProxy(device)
+    host, _, port = args.listen.rpartition(":")
+    await proxy.start(host or "0.0.0.0", int(port))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await proxy.stop()
+        await device.async_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="THZ serial sharing proxy (ser.net-kompatibel)")
+    parser.add_argument("--serial", default=const.SERIAL_PORT, help="serieller Port der Wärmepumpe")
+    parser.add_argument("--baudrate", type=int, default=const.DEFAULT_BAUDRATE)
+    parser.add_argument("--listen", default=f"0.0.0.0:{const.DEFAULT_PORT}", help="host:port für TCP-Clients")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Erzeugt die Register-Map-Daten je Firmware aus den Tabellen von 00_THZ.pm.
+
+Aus ``%parsinghash`` und den ``%getsonly*``-Tabellen des FHEM-Moduls wird
+für jede Firmware-Variante eine kompakte JSON-Datei unter ``data/``
+geschrieben (Block -> Liste von [Name, Offset, Länge, Typ, Divisor]).
+Namen werden wie im ``RegisterIndex`` normalisiert, Einträge geprüft.
+``RegisterMapManager`` lädt diese Dateien statt der Python-Module; eine neue
+Firmware kostet zur Laufzeit also nur eine weitere Datei.
+
+Aufruf nach Änderungen an 00_THZ.pm:
+
+    python -m custom_components.thz.register_maps.generate [--source 00_THZ.pm] [--check]
+"""
+import argparse
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+
+from ..decoder import is_supported_type
+
+_LOGGER = logging.getLogger(__name__)
+
+SOURCE = Path(__file__).resolve().parent.parent / "00_THZ.pm"
+DATA_DIR = Path(__file__).resolve().parent / "data"
+FORMAT_VERSION = 1
+
+# Welche Get-Tabellen je Firmware gelten, in der Merge-Reihenfolge von THZ_Attr
+# (spätere Tabellen überschreiben frühere). Die Technician-Varianten von 4.39/5.39
+# unterscheiden sich nur in den Sets und teilen sich die Lese-Blöcke.
+FIRMWARE_GETS = {
+    "206": ("getsonly2xx", "getsonly206"),
+    "214": ("getsonly2xx", "getsonly214"),
+    "214j": ("getsonly2xx", "getsonly214j"),
+    "439": ("getsonly439",),
+    "539": ("getsonly539", "getsonly439"),
+}
+
+_HASH_START = re.compile(r"^\s*my\s+%(\w+)\s*=\s*\(", re.M)
+_PARSING_ENTRY = re.compile(r'"(\w+)"\s*=>\s*\[((?:\s*\[[^\[\]]*\]\s*,?)*)\s*\]')
+_FIELD = re.compile(r'\[\s*"([^"]*)"\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*"(\w+)"\s*,\s*(\d+)\s*\]')
+_GET_ENTRY = re.compile(r'"([^"]+)"\s*=>\s*\{([^{}]*)\}')
+_ATTR = re.compile(r'(\w+)\s*=>\s*"([^"]*)"')
+
+
+class MapValidationError(ValueError):
+    """Tabelle in 00_THZ.pm ist nicht konsistent."""
+
+
+def _strip_comments(text: str) -> str:
+    # In den Tabellen stehen keine "#" innerhalb von Strings
+    return re.sub(r"#[^\n]*", "", text)
+
+
+def _perl_hash(source: str, name: str) -> str:
+    """Rumpf von ``my %name = ( ... );``, ohne Kommentare."""
+    for match in _HASH_START.finditer(source):
+        if match.group(1) == name:
+            body = _strip_comments(source[match.end():])
+            return body[: body.index(");")]
+    raise MapValidationError(f"Tabelle %{name} nicht gefunden")
+
+
+def normalize_name(name: str) -> str:
+    """' p38Fanstage2AirflowInlet: ' -> 'p38Fanstage2AirflowInlet:' (Teil der Unique IDs, daher nur strip)."""
+    return name.strip()
+
+
+def parse_parsinghash(source: str) -> dict[str, list[list]]:
+    """{Nachrichtentyp: [[Name, Offset, Länge, Typ, Divisor], ...]}."""
+    table = {}
+    for msg_type, body in _PARSING_ENTRY.findall(_perl_hash(source, "parsinghash")):
+        table[msg_type] = [
+            [normalize_name(name), int(offset), int(length), decode_type, int(divisor)]
+            for name, offset, length, decode_type, divisor in _FIELD.findall(body)
+        ]
+    return table
+
+
+def parse_gets(source: str, name: str) -> dict[str, dict[str, str]]:
+    """{Reading: {"cmd2": ..., "type": ..., ...}} einer ``%getsonly*``-Tabelle."""
+    return {key: dict(_ATTR.findall(attrs)) for key, attrs in _GET_ENTRY.findall(_perl_hash(source, name))}
+
+
+def validate_block(block: str, entries: list[list]) -> None:
+    if not entries:
+        raise MapValidationError(f"{block}: keine Einträge erkannt")
+    names = set()
+    for name, offset, length, decode_type, divisor in entries:
+        if not name:
+            raise MapValidationError(f"{block}: Eintrag ohne Namen bei Offset {offset}")
+        if name in names:
+            # FHEM setzt manche Werte aus Teilstücken zusammen (Datum in FCtime: "/", "/")
+            _LOGGER.warning("%s: Name %s mehrfach vergeben", block, name)
+        names.add(name)
+        if offset < 0 or length <= 0 or divisor <= 0:
+            raise MapValidationError(f"{block}: {name} hat ungültige Werte ({offset}, {length}, {divisor})")
+        if not is_supported_type(decode_type):
+            # Der Decoder liefert solche Werte als Hex-String, das Mapping bleibt nutzbar
+            _LOGGER.warning("%s: %s hat Typ %s, der als raw dekodiert wird", block, name, decode_type)
+
+
+def build_firmware(parsing: dict[str, list[list]], gets: dict[str, dict], firmware: str) -> dict:
+    """Lese-Blöcke einer Firmware: jede Get-Zeile, deren Typ eine Blockstruktur beschreibt."""
+    merged: dict[str, dict] = {}
+    for table in FIRMWARE_GETS[firmware]:
+        merged.update(gets[table])
+
+    blocks = {}
+    for reading, attrs in merged.items():
+        cmd, msg_type = attrs.get("cmd2"), attrs.get("type")
+        # Blockstrukturen tragen das Kommando im Typnamen ("F4hc1", "0A0176Dis"),
+        # einzelne Werte wie "1clean"/"5temp" gehören zur Write-Map.
+        if not cmd or "cmd3" in attrs or not msg_type or not msg_type.startswith(cmd):
+            continue
+        if msg_type not in parsing:
+            _LOGGER.warning("FW %s: %s (%s) verweist auf unbekannten Typ %s", firmware, reading, cmd, msg_type)
+            continue
+        blocks[f"pxx{cmd.upper()}"] = parsing[msg_type]
+    return {"format": FORMAT_VERSION, "firmware": firmware, "blocks": dict(sorted(blocks.items()))}
+
+
+def generate(source_path: Path = SOURCE) -> dict[str, dict]:
+    source = source_path.read_text(encoding="utf-8", errors="replace")
+    parsing = parse_parsinghash(source)
+    gets = {table: parse_gets(source, table) for tables in FIRMWARE_GETS.values() for table in tables}
+    result = {firmware: build_firmware(parsing, gets, firmware) for firmware in FIRMWARE_GETS}
+    # Jede Blockstruktur einmal prüfen, auch wenn mehrere Firmwares sie nutzen
+    checked = set()
+    for data in result.values():
+        for block, entries in data["blocks"].items():
+            if id(entries) not in checked:
+                checked.add(id(entries))
+                validate_block(block, entries)
+    return result
+
+
+def dump(data: dict) -> str:
+    """Kompakt, aber eine Zeile je Block, damit Diffs lesbar bleiben."""
+    lines = [f'{{"format":{data["format"]},"firmware":{json.dumps(data["firmware"])},"blocks":{{']
+    blocks = list(data["blocks"].items())
+    for i, (block, entries) in enumerate(blocks):
+        sep = "," if i < len(blocks) - 1 else ""
+        lines.append(f"{json.dumps(block)}:{json.dumps(entries, separators=(',', ':'), ensure_ascii=False)}{sep}")
+    lines.append("}}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Register-Map-Daten aus 00_THZ.pm erzeugen")
+    parser.add_argument("--source", type=Path, default=SOURCE)
+    parser.add_argument("--output", type=Path, default=DATA_DIR)
+    parser.add_argument("--check", action="store_true", help="nur prüfen, ob data/ aktuell ist")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    stale = []
+    for firmware, data in generate(args.source).items():
+        target = args.output / f"{firmware}.json"
+        text = dump(data)
+        if target.exists() and target.read_text(encoding="utf-8") == text:
+            continue
+        stale.append(target.name)
+        if not args.check:
+            args.output.mkdir(parents=True, exist_ok=True)
+            target.write_text(text, encoding="utf-8")
+            _LOGGER.info("%s geschrieben (%d Blöcke)", target, len(data["blocks"]))
+    if args.check and stale:
+        _LOGGER.error("Veraltet: %s", ", ".join(stale))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,285 +0,0 @@
-REGISTER_MAP = {
-	"firmware": "206",
-	"pxx01": [
-		("p37Fanstage1AirflowInlet: ", 4, 4, "hex", 1),	
-		(" p38Fanstage2AirflowInlet: ", 8, 4, "hex", 1),	
-		(" p39Fanstage3AirflowInlet: ", 12, 4, "hex", 1),
-		(" p40Fanstage1AirflowOutlet: ", 16, 4, "hex", 1),	
-		(" p41Fanstage2AirflowOutlet: ", 20, 4, "hex", 1),	
-		(" p42Fanstage3AirflowOutlet: ", 24, 4, "hex", 1),
-		(" p43UnschedVent3: ", 	       28, 4, "hex", 1),	
-		(" p44UnschedVent2: ", 32, 4, "hex", 1),		
-		(" p45UnschedVent1: ", 36, 4, "hex", 1),
-		(" p46UnschedVent0: ", 	       40, 4, "hex", 1),	
-		(" p75PassiveCooling: ", 44, 4, "hex", 1)
-	],
-    
-"pxx03": [
-	("UpTempLimitDefrostEvaporatorEnd: ", 4, 4, "hex", 10),
-	(" MaxTimeDefrostEvaporator: ", 8, 4, "hex", 1), 
-	(" LimitTempCondenserElectBoost: ", 12, 4, "hex", 10),
-	(" LimitTempCondenserDefrostTerm: ", 16, 4, "hex", 10),
-	(" p47CompressorRestartDelay: ", 20, 2, "hex", 1),
-	(" p48MainFanSpeed: ", 22, 2, "hex", 1)
-],
-"pxx04": [
-	("MaxDefrostDurationAAExchenger: ", 4, 2, "hex", 1),
-	(" DefrostStartThreshold: ", 6, 4, "hex", 10),
-	(" VolumeFlowFilterReplacement: ", 10, 4, "hex", 1)
-],
-"pxx05": [
-	("p13GradientHC1: ", 	4, 4, "hex", 10),
-	(" p14LowEndHC1: ", 8, 4, "hex", 10),
-	(" p15RoomInfluenceHC1: ",	12, 2, "hex", 10),                                        
-	(" p16GradientHC2: ",	14, 4, "hex", 10),
-	(" p17LowEndHC2: ", 18, 4, "hex", 10),
-	(" p18RoomInfluenceHC2: ",	22, 2, "hex", 10),
-	(" p19FlowProportionHC1: ",24, 4, "hex", 1),
-	(" p20FlowProportionHC2: ", 28, 4, "hex", 1),
-	(" MaxSetHeatFlowTempHC1: ",	32, 4, "hex", 10),
-	(" MinSetHeatFlowTempHC1: ",36, 4, "hex", 10),
-	(" MaxSetHeatFlowTempHC2: ", 40, 4, "hex", 10),	
-	(" MinSetHeatFlowTempHC2: ",	44, 4, "hex", 10),
-],
-"pxx06": [
-	("p21Hyst1: ", 	 4, 2, "hex", 10),
-	(" p22Hyst2: ",			 6, 2, "hex", 10),
-	(" p23Hyst3: ", 		 8, 2, "hex", 10),                        
-	(" p24Hyst4: ", 		10, 2, "hex", 10),
-	(" p25Hyst5: ",			12, 2, "hex", 10),
-	(" p26Hyst6: ", 		14, 2, "hex", 10),
-	(" p27Hyst7: ", 		16, 2, "hex", 10),
-	(" p28Hyst8: ",			18, 2, "hex", 10),
-	(" p29HystAsymmetry: ",		20, 2, "hex", 1),
-	(" p30integralComponent: ",22, 4, "hex", 1),
-	(" p31MaxBoostStages: ",	26, 2, "hex", 1),
-	(" MaxHeatFlowTemp: ",		28, 4, "hex", 10),
-	(" p49SummerModeTemp: ", 	32, 4, "hex", 10),
-	(" p50SummerModeHysteresis: ",	36, 4, "hex", 10),
-	(" p77OutTempFilterTime: ",	40, 4, "hex", 1),
-	(" p78DualModePoint: ", 	44, 4, "hex2int", 10),
-	(" p79BoosterTimeoutHC: ",	48, 2, "hex", 1) 	      
-],
-"pxx07": [
-	("p32HystDHW: ", 	4, 2, "hex", 10),	
-	(" p33BoosterTimeoutDHW: ",	6, 2, "hex", 1),	
-	(" p34TempLimitBoostDHW: ",	8, 4, "hex2int", 10),	
-	(" p35PasteurisationInterval: ", 12, 2, "hex", 1),
-	(" p36MaxDurationDHWLoad: ",14, 2, "hex", 1),	
-	(" pasteurisationTemp: ",	16, 4, "hex", 10),	
-	(" maxBoostStagesDHW: ",	20, 2, "hex", 1),
-	(" p84EnableDHWBuffer: ",	22, 2, "hex", 1)
-],
-"pxx08": [
-	("p80EnableSolar: ", 	4, 2, "hex", 1),	
-	(" p81DiffTempSolarLoading: ",	 6, 4, "hex", 10),	
-	(" p82DelayCompStartSolar: ",	10, 2, "hex", 1),
-	(" p84DHWTempSolarMode: ",12, 4, "hex", 10),	
-	(" HystDiffTempSolar: ",	16, 4, "hex", 10),	
-	(" CollectLimitTempSolar: ",	20, 4, "hex", 10)
-],
-"pxx09": [
-	("operatingHours1: ",	 4, 4, "hex", 1),	
-	(" operatingHours2: ",	8, 4, "hex", 1),
-	(" heatingHours: ",	12, 4, "hex", 1),	
-	(" DHWhours: ",		16, 4, "hex", 1),
-	(" coolingHours: ",	20, 4, "hex", 1)
-],
-"pxx0A": [
-	("p54MinPumpCycles: ",	4, 2, "hex", 1),	
-	(" p55MaxPumpCycles: ",	 6, 4, "hex", 1),	 
-	(" p56OutTempMaxPumpCycles: ",	10, 4, "hex", 10),
-	(" p57OutTempMinPumpCycles: ",14, 4, "hex", 10),	
-	(" p58SuppressTempCaptPumpStart: ", 18, 4, "hex", 1)
-],
-"pxx0B": [
-	("progHC1StartTime: ", 4, 4, "hex2time", 1), 	
-	(" progHC1EndTime: ",	 8, 4, "hex2time", 1),
-	(" progHC1Monday: ",	13, 1, "bit0", 1),	
-	(" progHC1Tuesday: ",	13, 1, "bit1", 1),	
-	(" progHC1Wednesday: ",	13, 1, "bit2", 1),	
-	(" progHC1Thursday: ",	13, 1, "bit3", 1),
-	(" progHC1Friday: ",	12, 1, "bit0", 1),	
-	(" progHC1Saturday: ",	12, 1, "bit1", 1),
-	(" progHC1Sunday: ",	12, 1, "bit2", 1),	
-	(" progHC1Enable: ",	14, 2, "hex", 1),
-	(" progHC2StartTime: ",	16, 4, "hex2time", 1),	
-	(" progHC2EndTime: ",	20, 4, "hex2time", 1),
-	(" progHC2Monday: ", 	25, 1, "bit0", 1),	
-	(" progHC2Tuesday: ",	25, 1, "bit1", 1),	
-	(" progHC2Wednesday: ", 25, 1, "bit2", 1),	
-	(" progHC2Thursday: ",	25, 1, "bit3", 1),
-	(" progHC2Friday: ", 	24, 1, "bit0", 1),	
-	(" progHC2Saturday: ",	24, 1, "bit1", 1),
-	(" progHC2Sunday: ", 	24, 1, "bit2", 1),	
-	(" progHC2Enable: ",	26, 2, "hex", 1)
-],
-"pxx0C": [
-	("progDHWStartTime: ",	 4, 4, "hex2time", 1),	
-	(" progDHWEndTime: ",	 8, 4, "hex2time", 1),
-	(" progDHWMonday: ",	13, 1, "bit0", 1),	
-	(" progDHWTuesday: ",	13, 1, "bit1", 1),	
-	(" progDHWWednesday: ",	13, 1, "bit2", 1),	
-	(" progDHWThursday: ",	13, 1, "bit3", 1),
-	(" progDHWFriday: ",	12, 1, "bit0", 1),	
-	(" progDHWSaturday: ",	12, 1, "bit1", 1),
-	(" progDHWSunday: ",	12, 1, "bit2", 1),	
-	(" progDHWEnable: ",	14, 2, "hex", 1)
-],
-"pxxD1": [
-	("number_of_faults: ",	 4, 2, "hex", 1),	
-	(" fault0CODE: ",		 8, 4, "faultmap", 1),	
-	(" fault0TIME: ",	12, 4, "hex2time", 1),  
-	(" fault0DATE: ",	16, 4, "hexdate", 1),
-	(" fault1CODE: ",		20, 4, "faultmap", 1),	
-	(" fault1TIME: ",	24, 4, "hex2time", 1),  
-	(" fault1DATE: ",	28, 4, "hexdate", 1),
-	(" fault2CODE: ",		32, 4, "faultmap", 1),	
-	(" fault2TIME: ",	36, 4, "hex2time", 1),  
-	(" fault2DATE: ",	40, 4, "hexdate", 1),
-	(" fault3CODE: ",		44, 4, "faultmap", 1),	
-	(" fault3TIME: ",	48, 4, "hex2time", 1),  
-	(" fault3DATE: ",	52, 4, "hexdate", 1)
-],
-        
-"pxx0D": [
-	("progFAN1StartTime: ",4, 4, "hex2time", 1),	
-	(" progFAN1EndTime: ",	 8, 4, "hex2time", 1),
-	(" progFAN1Monday: ", 	13, 1, "bit0", 1),	
-	(" progFAN1Tuesday: ",	13, 1, "bit1", 1),	
-	(" progFAN1Wednesday: ",13, 1, "bit2", 1),	
-	(" progFAN1Thursday: ",	13, 1, "bit3", 1),
-	(" progFAN1Friday: ",	12, 1, "bit0", 1),	
-	(" progFAN1Saturday: ",	12, 1, "bit1", 1),
-	(" progFAN1Sunday: ",	12, 1, "bit2", 1),	
-	(" progFAN1Enable: ",	14, 2, "hex", 1),
-	(" progFAN2StartTime: ",16, 4, "hex2time", 1),	
-	(" progFAN2EndTime: ",	20, 4, "hex2time", 1),
-	(" progFAN2Monday: ",	25, 1, "bit0", 1),	
-	(" progFAN2Tuesday: ",	25, 1, "bit1", 1),	
-	(" progFAN2Wednesday: ",25, 1, "bit2", 1),	
-	(" progFAN2Thursday: ",	25, 1, "bit3", 1),
-	(" progFAN2Friday: ",	24, 1, "bit0", 1),	
-	(" progFAN2Saturday: ",	24, 1, "bit1", 1),
-	(" progFAN2Sunday: ",	24, 1, "bit2", 1),	
-	(" progFAN2Enable: ",	26, 2, "hex", 1)
-],
-   
-"pxx0E": [
-	("p59RestartBeforeSetbackEnd: ", 4, 4, "hex", 1)
-],
-"pxx0F": [
-	("pA0DurationUntilAbsenceStart: ", 4, 4, "hex", 10),	
-	(" pA0AbsenceDuration: ",	 8, 4, "hex", 10), 
-	(" pA0EnableAbsenceProg: ", 12, 2, "hex", 1)
-],
-"pxx10": [
-	("p70StartDryHeat: ", 	 4, 2, "hex", 1),	
-	(" p71BaseTemp: ",	 6, 4, "hex", 10),	
-	(" p72PeakTemp: ", 10, 4, "hex", 10),
-	(" p73TempDuration: ", 	14, 4, "hex", 1),	
-	(" p74TempIncrease: ",	18, 4, "hex", 10)
-],
-"pxx17": [
-	("p01RoomTempDay: ", 	 4, 4,  "hex", 10),	
-	(" p02RoomTempNight: ",	 8, 4, "hex", 10),
-	(" p03RoomTempStandby: ",	12, 4,  "hex", 10), 	
-	(" p04DHWsetTempDay: ",	16, 4,  "hex", 10), 
-	(" p05DHWsetTempNight: ",	20, 4,  "hex", 10), 	
-	(" p06DHWsetTempStandby: ",24, 4,  "hex", 10), 
-	(" p07FanStageDay: ",	28, 2,  "hex", 1), 	
-	(" p08FanStageNight: ",	30, 2,  "hex", 1),
-	(" p09FanStageStandby: ",	32, 2,  "hex", 1), 	
-	(" p10HCTempManual: ",	34, 4,  "hex", 10),
-	(" p11DHWsetTempManual: ",38, 4,  "hex", 10),  	
-	(" p12FanStageManual: ",	42, 2,  "hex", 1),
-],
-"pxxE8": [
-	("statusAFC: ",		4, 4, "hex", 1),		# 0=init air flow calibration (16:00) 4=normal fan operation
-	(" supplyFanSpeedCAL: ",	 8, 4, "hex", 60),	# calibration speed
-	(" exhaustFanSpeedCAL: ",	12, 4, "hex", 60), 	
-	(" supplyFanAirflowCAL: ",	16, 4, "hex", 100), 	# calibration air flow volume
-	(" exhaustFanAirflowCAL: ",	20, 4, "hex", 100),
-	(" supplyFanSpeed: ",		24, 4, "hex", 1), 	# actual fan speed in 1/s
-	(" exhaustFanSpeed: ",		28, 4, "hex", 1),
-	(" supplyFanAirflowSet: ",	32, 4, "hex", 1),		# actual air flow volume setting in m3/h
-	(" exhaustFanAirflowSet: ",	36, 4, "hex", 1),
-	(" supplyFanSpeedTarget: ",	40, 4, "hex", 1),		# target fan speed in %
-	(" exhaustFanSpeedTarget: ",	44, 4, "hex", 1),
-	(" supplyFanSpeed0: ",		48, 4, "hex", 10), 		
-	(" exhaustFanSpeed0: ",		52, 4, "hex", 10), 	
-	(" supplyFanSpeed200: ",	56, 4, "hex", 10),
-	(" exhaustFanSpeed200: ",	60, 4, "hex", 10),
-	(" airflowTolerance: ",		64, 2, "hex", 1),
-	(" airflowCalibrationInterval: ",66, 2, "hex", 1),		# calibration interval
-	(" timeToCalibration: ",	68, 2, "hex", 1)		# days to next calibration
-],
-
-"pxxEE": [
-	("opMode: ",		4, 2, 	"opmode2", 1),	
-	(" ProgStateHC: ", 	10, 2, "opmodehc", 1),	
-	(" ProgStateDHW: ",	12, 2, "opmodehc", 1),
-	(" ProgStateFAN: ", 	14, 2, 	"opmodehc", 1),	
-	(" BaseTimeAP0: ", 	16, 8, "hex", 1),
-	(" StatusAP0: ",		24, 2, "hex", 1),
-	(" StartTimeAP0: ",	26, 8, 	"hex", 1), 	
-	(" EndTimeAP0: ", 	34, 8, "hex", 1)
-],
-"pxxF6": [
-	("userSetFanStage: ",	30, 2, "hex", 1),
-	(" userSetFanRemainingTime: ", 36, 4, "hex", 1),
-	(" lastErrors: ",		4, 8, "hex2error", 1)
-],
-"pxxFB": [
-	("outsideTemp: ", 	8, 4, "hex2int", 10),	
-	(" flowTemp: ",		12, 4, "hex2int", 10),
-	(" returnTemp: ",		16, 4, "hex2int", 10),	
-	(" hotGasTemp: ", 	20, 4, "hex2int", 10),
-	(" dhwTemp: ",		24, 4, "hex2int", 10),	
-	(" flowTempHC2: ",	28, 4, "hex2int", 10),
-	(" evaporatorTemp: ",	36, 4, "hex2int", 10),	
-	(" condenserTemp: ",	40, 4, "hex2int", 10),
-	(" mixerOpen: ",		47, 1, "bit1", 1),	
-	(" mixerClosed: ",	47, 1, "bit0", 1),
-	(" heatPipeValve: ",	45, 1, "bit3", 1),	
-	(" diverterValve: ",	45, 1, "bit2", 1),
-	(" dhwPump: ",		45, 1, "bit1", 1),	
-	(" heatingCircuitPump: ",45, 1, "bit0", 1),
-	(" solarPump: ",		44, 1, "n.a", 1),	
-	(" compressor: ",	44, 1, "bit0", 1),
-	(" boosterStage3: ",	44, 1, "bit3", 1),	
-	(" boosterStage2: ",	44, 1, "bit2", 1), 	      
-	(" boosterStage1: ",	44, 1, "bit1", 1),	
-	(" highPressureSensor: ",54, 1, "bit3", 1),
-	(" lowPressureSensor: ",	54, 1, "bit2", 1),	
-	(" evaporatorIceMonitor: ",55, 1, "bit3", 1),
-	(" signalAnode: ",	54, 1, "bit1", 1),	
-	(" evuRelease: ",	48, 1, "n.a.", 1),
-	(" ovenFireplace: ",	54, 1, "bit0", 1),	
-	(" STB: ",		48, 1, "n.a.", 1),
-	(" outputVentilatorPower: ",48,2, "hex", 1),	
-	(" inputVentilatorPower: ",50, 2, "hex", 1),	
-	(" mainVentilatorPower: ",	52, 2, "hex", 255/100),          
-	(" outputVentilatorSpeed: ",56,2, "hex", 1),	
-	(" inputVentilatorSpeed: ",58, 2, "hex", 1),	
-	(" mainVentilatorSpeed: ",	60, 2, "hex", 1),          
-	(" outsideTempFiltered: ",64, 4, "hex2int", 10),	
-	(" relHumidity: ",	70, 4, "n.a.", 1),
-	(" dewPoint: ",		 5, 4, "n.a.", 1),
-	(" P_Nd: ",		 5, 4, "n.a.", 1),	
-	(" P_Hd: ",		5, 4, "n.a.", 1),
-	(" actualPower_Qc: ",	 5, 8, "n.a.", 1),	
-	(" actualPower_Pel: ",	5, 8, "n.a.", 1),
-	(" collectorTemp: ",	 4, 4, "hex2int", 10),	
-	(" insideTemp: ",	32, 4, "hex2int", 10) 
-],
-	"pxxFC": [
-		("Weekday: ",		7, 1,  "weekday", 1),	
-		(" pClockHour: ",	8, 2, "hex", 1),
-		(" pClockMinutes: ",	10, 2, "hex", 1),	
-		(" Sec: ",		12, 2, "hex", 1),
-		(" pClockYear: ",		14, 2, "hex", 1),	
-		(" pClockMonth: ",	18, 2, "hex", 1),
-		(" pClockDay: ",		20, 2, "hex", 1)
-	],
-}
\ No newline at end of file
@@ -1,87 +1,162 @@
 import sys
+import json
 import logging
-from copy import deepcopy
-from typing import Dict, List, Tuple
-from . import register_map_all, write_map_all
-from . import register_map_206
-from . import register_map_214
-
-supported_firmwares = ["206, 214"]  # Add other supported firmware versions here
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, Tuple
+from . import write_map_all
+
+# Lese-Blöcke je Firmware, erzeugt von generate.py aus 00_THZ.pm
+DATA_DIR = Path(__file__).resolve().parent / "data"
+DEFAULT_FIRMWARE = "439"  # wie in FHEM: unbekannte Firmware wird wie 4.39 behandelt
+supported_firmwares = sorted(path.stem for path in DATA_DIR.glob("*.json"))
 _LOGGER = logging.getLogger(__name__)
 
-RegisterEntry = Tuple[str, int, int, str, int]  # (name, offset, length, type, factor, refresh dict)
+
+class RegisterEntry(NamedTuple):
+    """Eintrag eines Lese-Blocks; Offset/Länge in Hex-Zeichen, Name ohne Leerzeichen."""
+
+    name: str
+    offset: int
+    length: int
+    decode: str
+    divisor: int
+
+
+class RegisterLocation(NamedTuple):
+    """Position eines Werts: Block ("pxxFB") plus Eintrag."""
+
+    block: str
+    offset: int
+    length: int
+    decode: str
+    divisor: int
+
+
 RegisterEntry_Write = Tuple[str, bytes, int, int, str, int, str, str, str, str, str]  # (name, command, min, max, unit, step, type, device_class, icon, decode type)
 
-class BaseRegisterMapManager:
-    def __init__(
-        self,
-        firmware_version: str,
-        base_map_name: str,
-        command_map_name: str,
-        map_attr: str,
-        entry_type: type,
-    ):
+
+def block_to_bytes(block: str) -> bytes:
+    """"pxxFB" -> b"\\xfb"."""
+    return bytes.fromhex(block[3:] if block.startswith("pxx") else block)
+
+
+def _load_map(module_name: str, map_attr: str, entry_type: type) -> dict[str, Any]:
+    mod = sys.modules.get(f"{__package__}.{module_name}")
+    _LOGGER.debug(f"Loading register map from module: {module_name}, found: {mod is not None}")
+    full_map = getattr(mod, map_attr, None) if mod is not None else None
+    if not full_map:
+        return {}
+    # Filter: only keep items of the correct type (list or dict), e.g. drops "firmware": "206"
+    return {k: v for k, v in full_map.items() if isinstance(v, entry_type)}
+
+
+def _load_blocks(firmware_version: str) -> dict[str, list[list]]:
+    """Lese-Blöcke aus data/<firmware>.json; ohne eigene Datei gelten die Blöcke von DEFAULT_FIRMWARE."""
+    path = DATA_DIR / f"{firmware_version}.json"
+    if not path.is_file():
+        _LOGGER.info("Keine Register-Map für Firmware %s, verwende %s", firmware_version, DEFAULT_FIRMWARE)
+        path = DATA_DIR / f"{DEFAULT_FIRMWARE}.json"
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)["blocks"]
+
+
+class RegisterIndex:
+    """Unveränderlicher, normalisierter Index der Lese-Register einer Firmware."""
+
+    __slots__ = ("firmware_version", "blocks", "block_bytes", "by_block_bytes", "by_name")
+
+    def __init__(self, firmware_version: str):
+        merged: dict[str, tuple[RegisterEntry, ...]] = {
+            block: tuple(RegisterEntry(*entry) for entry in entries)
+            for block, entries in _load_blocks(firmware_version).items()
+        }
+
         self.firmware_version = firmware_version
-        self._base_map = self._load_register_map(base_map_name, map_attr, entry_type)
-        self._command_map = self._load_register_map(f"{command_map_name}_{firmware_version}", map_attr, entry_type)
-        self._merged_map = self._merge_maps(self._base_map, self._command_map)
-
-    def _load_register_map(self, module_name: str, map_attr: str, entry_type: type) -> Dict[str, any]:
-        package_prefix = __package__
-        full_module_name = f"{package_prefix}.{module_name}"
-        mod = sys.modules.get(full_module_name)
-        _LOGGER.debug(f"Loading register map from module: {module_name}, found: {mod is not None}")
-        if mod is not None:
-            full_map = deepcopy(getattr(mod, map_attr))
-            # Filter: only keep items of the correct type (list or dict)
-            return {k: v for k, v in full_map.items() if isinstance(v, entry_type)}
-        else:
-            return {}
-
-    def _merge_maps(self, base: Dict, override: Dict) -> Dict:
-        merged = deepcopy(base)
-        for block, entries in override.items():
-            if block in merged:
-                override_names = {e[0] for e in entries}
-                merged[block] = [e for e in merged[block] if e[0] not in override_names] + entries
-            else:
-                merged[block] = entries
-        return merged
-
-    def get_all_registers(self) -> Dict:
-        return self._merged_map
-
-    def get_registers_for_block(self, block: str) -> any:
-        return self._merged_map.get(block, [])
+        self.blocks: Mapping[str, tuple[RegisterEntry, ...]] = MappingProxyType(merged)
+        self.block_bytes: Mapping[str, bytes] = MappingProxyType({block: block_to_bytes(block) for block in merged})
+        self.by_block_bytes: Mapping[bytes, tuple[RegisterEntry, ...]] = MappingProxyType(
+            {self.block_bytes[block]: entries for block, entries in merged.items()}
+        )
+        by_name: dict[str, RegisterLocation] = {}
+        for block, entries in merged.items():
+            for e in entries:
+                # Namen, die in mehreren Blöcken vorkommen (z. B. flowTemp), zeigen auf den ersten Block
+                by_name.setdefault(e.name, RegisterLocation(block, e.offset, e.length, e.decode, e.divisor))
+        self.by_name: Mapping[str, RegisterLocation] = MappingProxyType(by_name)
 
-    def get_firmware_version(self) -> str:
-        return self.firmware_version
 
-class RegisterMapManager(BaseRegisterMapManager):
+class WriteIndex:
+    """Unveränderlicher Index der Schreibparameter einer Firmware (Name und Kommando)."""
+
+    __slots__ = ("firmware_version", "entries", "by_command")
+
     def __init__(self, firmware_version: str):
-        super().__init__(
-            firmware_version,
-            base_map_name="register_map_all",
-            command_map_name="register_map",
-            map_attr="REGISTER_MAP",
-            entry_type=list,
+        merged = {
+            **_load_map("write_map_all", "WRITE_MAP", dict),
+            **_load_map(f"write_map_{firmware_version}", "WRITE_MAP", dict),
+        }
+        self.firmware_version = firmware_version
+        self.entries: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+            {name.strip(): MappingProxyType(dict(entry)) for name, entry in merged.items()}
         )
+        by_command: dict[str, tuple[str, Mapping[str, Any]]] = {}
+        for name, entry in self.entries.items():
+            by_command.setdefault(entry["command"].upper(), (name, entry))
+        self.by_command: Mapping[str, tuple[str, Mapping[str, Any]]] = MappingProxyType(by_command)
+
+
+@lru_cache(maxsize=None)
+def get_register_index(firmware_version: str) -> RegisterIndex:
+    """Index je Firmware, einmal pro Prozess gebaut (mehrere Wärmepumpen teilen ihn).
+
+    Liest eine Datei; aus dem Event-Loop daher per Executor aufrufen.
+    """
+    return RegisterIndex(firmware_version)
+
+
+@lru_cache(maxsize=None)
+def get_write_index(firmware_version: str) -> WriteIndex:
+    return WriteIndex(firmware_version)
+
+
+class RegisterMapManager:
+    """Lese-Register der Firmware; Daten kommen aus dem gecachten RegisterIndex."""
 
-class RegisterMapManager_Write(BaseRegisterMapManager):
     def __init__(self, firmware_version: str):
-        super().__init__(
-            firmware_version,
-            base_map_name="write_map_all",
-            command_map_name="write_map",
-            map_attr="WRITE_MAP",
-            entry_type=dict,
-            )
-    
-    def _merge_maps(self, base: Dict, override: Dict) -> Dict:
-        merged = deepcopy(base)
-        merged.update(override)
-        return merged
-        
+        self.firmware_version = firmware_version
+        self.index = get_register_index(firmware_version)
+
+    def get_all_registers(self) -> Mapping[str, tuple[RegisterEntry, ...]]:
+        return self.index.blocks
+
+    def get_registers_for_block(self, block: str) -> tuple[RegisterEntry, ...]:
+        return self.index.blocks.get(block, ())
+
+    def get_register(self, name: str) -> RegisterLocation | None:
+        return self.index.by_name.get(name.strip())
+
+    def get_firmware_version(self) -> str:
+        return self.firmware_version
+
+
+class RegisterMapManager_Write:
+    """Schreibparameter der Firmware; Daten kommen aus dem gecachten WriteIndex."""
+
+    def __init__(self, firmware_version: str):
+        self.firmware_version = firmware_version
+        self.index = get_write_index(firmware_version)
+
+    def get_all_registers(self) -> Mapping[str, Mapping[str, Any]]:
+        return self.index.entries
+
+    def get_by_command(self, command: str) -> tuple[str, Mapping[str, Any]] | None:
+        return self.index.by_command.get(command.upper())
+
+    def get_firmware_version(self) -> str:
+        return self.firmware_version
+
 
 # class RegisterMapManager:
 #     def __init__(self, firmware_version: str):
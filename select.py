@@ -1,97 +1,78 @@
 from homeassistant.components.select import SelectEntity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
-from .register_maps.register_map_manager import RegisterMapManager_Write
+from homeassistant.core import callback # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.update_coordinator import CoordinatorEntity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from .entity_descriptors import ParameterDescriptor, get_parameter_descriptors
 from .thz_device import THZDevice
-import asyncio
+from .coordinator import THZParameterCoordinator
+from .const import DOMAIN
 
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
-SELECT_MAP = {
-    "2opmode":     {"1":"standby", "11":"automatic", "3":"DAYmode", "4":"setback", "5":"DHWmode", "14":"manual", "0":"emergency"},   
-    "OpModeHC":   {"1":"normal", "2":"setback", "3":"standby", "4":"restart", "5":"restart"},
-    "OpMode2":    {"0" :"manual", "1" : "automatic"},
-    "SomWinMode": {"01" :"winter", "02" : "summer"},
-    "weekday":    {"0" :"Monday", "1" : "Tuesday", "2" :"Wednesday", "3" : "Thursday", "4" : "Friday", "5" :"Saturday", "6" : "Sunday" },
-    "faultmap":   { "0" :"n.a.", "1" : "F01_AnodeFault", "2" : "F02_SafetyTempDelimiterEngaged", "3" : "F03_HighPreasureGuardFault", "4" : "F04_LowPreasureGuardFault", "5" : "F05_OutletFanFault", "6" : "F06_InletFanFault", "7" : "F07_MainOutputFanFault", "11" : "F11_LowPreasureSensorFault", "12": "F12_HighPreasureSensorFault", "15" : "F15_DHW_TemperatureFault",  "17" : "F17_DefrostingDurationExceeded", "20" : "F20_SolarSensorFault", "21" : "F21_OutsideTemperatureSensorFault", "22" : "F22_HotGasTemperatureFault", "23" : "F23_CondenserTemperatureSensorFault", "24" : "F24_EvaporatorTemperatureSensorFault", "26" : "F26_ReturnTemperatureSensorFault", "28" : "F28_FlowTemperatureSensorFault", "29" : "F29_DHW_TemperatureSensorFault", "30" : "F30_SoftwareVersionFault", "31" : "F31_RAMfault", "32" : "F32_EEPromFault", "33" : "F33_ExtractAirHumiditySensor", "34" : "F34_FlowSensor", "35" : "F35_minFlowCooling", "36" : "F36_MinFlowRate", "37" : "F37_MinWaterPressure", "40" : "F40_FloatSwitch", "50" : "F50_SensorHeatPumpReturn", "51" : "F51_SensorHeatPumpFlow",  "52" : "F52_SensorCondenserOutlet" },
-}
-
 async def async_setup_entry(hass, config_entry, async_add_entities):
-# ... create THZSelect entities ...
-    entities = []
-    write_manager: RegisterMapManager_Write = hass.data["thz"]["write_manager"]
-    device: THZDevice = hass.data["thz"]["device"]
-    write_registers = write_manager.get_all_registers()
-    _LOGGER.debug(f"write_registers: {write_registers}")
-    for name, entry in write_registers.items():
-        if entry["type"] == "select":
-            _LOGGER.debug(f"Creating Select for {name} with command {entry['command']}")
-            entity = THZSelect(
-                name=name,
-                command=entry["command"],
-                min_value=entry["min"],
-                max_value=entry["max"],
-                step=entry.get("step", 1),
-                unit=entry.get("unit", ""),
-                device_class=entry.get("device_class"),
-                device=device,
-                icon=entry.get("icon"),
-                decode_type=entry.get("decode_type"),
-                unique_id=f"thz_{name.lower().replace(' ', '_')}",
-            )
-            entities.append(entity)
-
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    device: THZDevice = entry_data["device"]
+    coordinator: THZParameterCoordinator = entry_data["parameter_coordinator"]
+    entities = [
+        THZSelect(descriptor, device, coordinator, config_entry.entry_id)
+        for descriptor in get_parameter_descriptors(device.firmware_version).get("select", ())
+    ]
+    _LOGGER.debug("Creating %d THZSelect entities", len(entities))
     async_add_entities(entities)
-class THZSelect(SelectEntity):
-    _attr_should_poll = True
 
-    def __init__(self, name: str, command, min_value, max_value, step, unit, device_class, decode_type: str, device, icon=None, unique_id=None,  options=None):
-        self._attr_name = name
-        self._command = command
-        self._device = device
-        self._attr_icon = icon or "mdi:eye"
-        self._attr_unique_id = unique_id or f"thz_set_{command.lower()}_{name.lower().replace(' ', '_')}"
-        self._decode_type = decode_type
 
-        if decode_type in SELECT_MAP:
-            self._attr_options = list(SELECT_MAP[decode_type].values())
-            _LOGGER.debug(f"Options for {name} ({decode_type}): {self._attr_options}")
+class THZSelect(CoordinatorEntity, SelectEntity):
+    """Schreibparameter als Auswahl; der Wert kommt aus dem Parameter-Snapshot."""
 
+    def __init__(self, descriptor: ParameterDescriptor, device: THZDevice, coordinator: THZParameterCoordinator, entry_id: str):
+        super().__init__(coordinator, context=descriptor.command)
+        self._desc = descriptor
+        self._device = device
+        self._attr_unique_id = f"{entry_id}_{descriptor.unique_suffix}"
         self._attr_current_option = None
+        self._update_from_snapshot()
+
+    @property
+    def name(self):
+        return self._desc.key
+
+    @property
+    def entity_registry_enabled_default(self):
+        return self._desc.enabled_default
+
+    @property
+    def icon(self):
+        return self._desc.icon or "mdi:eye"
+
+    @property
+    def options(self):
+        return self._desc.options or ()
 
     @property
     def current_option(self):
         return self._attr_current_option
 
-    async def async_update(self):
-        # Read the value from the device and map it to an option
-        async with self._device.lock:
-            value_bytes = await self.hass.async_add_executor_job(self._device.read_value, bytes.fromhex(self._command), "get", 4, 2)
-            _LOGGER.debug(f"Read bytes for {self._attr_name} ({self._command}): {value_bytes.hex() if value_bytes else 'None'}")
-        value = int.from_bytes(value_bytes, byteorder='little', signed=False)
-        _LOGGER.debug(f"Value for {self._attr_name} ({self._command}): {value}")
-        # Map value to option string (you must define this mapping)
-        if self._decode_type in SELECT_MAP:
-            value_str = str(value).zfill(2) if self._decode_type == "SomWinMode" else str(value)
-            _LOGGER.debug(f"Mapping value {value_str} to option for {self._attr_name} ({self._command})")
-            self._attr_current_option = SELECT_MAP[self._decode_type].get(value_str, None)
-            _LOGGER.debug(f"Current option for {self._attr_name} ({self._command}): {self._attr_current_option}")
-        else:
-            self._attr_current_option = None
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_snapshot()
+        self.async_write_ha_state()
 
-    async def select_option(self, option: str):
-        # Map option string back to value
-        if self._decode_type in SELECT_MAP:
-            reverse_map = {v: int(k) for k, v in SELECT_MAP[self._decode_type].items()}
-            if option in reverse_map:
-                _LOGGER.debug(f"Setting {self._attr_name} to {option} (value: {reverse_map[option]})")
-                value_int = reverse_map[option]
-                _LOGGER.debug(f"Writing value {value_int} to command {self._command}")
-                value_bytes = value_int.to_bytes(2, byteorder='little', signed=False)
-                _LOGGER.debug(f"Value bytes to write: {value_bytes.hex()}")
-                async with self._device.lock:
-                    await self.hass.async_add_executor_job(self._device.write_value(bytes.fromhex(self._command), value_bytes))
-                    await asyncio.sleep(0.01)  # Kurze Pause, um sicherzustellen, dass das Gerät bereit ist
-                _LOGGER.debug(f"Set {self._attr_name} to {option} (value: {value_int})")
-                self._attr_current_option = option
+    def _update_from_snapshot(self) -> None:
+        value_bytes = (self.coordinator.data or {}).get(self._desc.command)
+        if value_bytes is None:
+            return
+        value = int.from_bytes(value_bytes, byteorder='little', signed=False)
+        option_by_value = self._desc.option_by_value
+        self._attr_current_option = option_by_value.get(value) if option_by_value is not None else None
 
+    async def async_select_option(self, option: str):
+        value_by_option = self._desc.value_by_option
+        if value_by_option is None or option not in value_by_option:
+            return
+        value_int = value_by_option[option]
+        _LOGGER.debug(f"Setting {self._desc.key} to {option} (value: {value_int})")
+        await self._device.write_value(self._desc.command_bytes, value_int.to_bytes(2, byteorder='little', signed=False))
+        self._attr_current_option = option
+        self.async_write_ha_state()
+        await self.coordinator.async_refresh_command(self._desc.command)
@@ -1,107 +1,109 @@
 # custom_components/thz/sensor.py
+import asyncio
 import logging
-from homeassistant.helpers.entity import Entity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from datetime import timedelta
+from typing import Callable, NamedTuple
+from homeassistant.components.sensor import SensorEntity, SensorStateClass # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.core import callback # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.entity import Entity, EntityCategory # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.update_coordinator import CoordinatorEntity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from time import monotonic
+
+from .const import CONF_HEARTBEAT, DOMAIN
+from .coordinator import THZBlockCoordinator
 from .thz_device import THZDevice
-from .register_maps.register_map_manager import RegisterMapManager, RegisterMapManager_Write
-from .sensor_meta import SENSOR_META
-import asyncio
+from .entity_descriptors import SensorDescriptor, get_sensor_descriptors
 
 _LOGGER = logging.getLogger(__name__)
 
+# Gilt nur für die Bus-Diagnosesensoren; die Register-Sensoren aktualisiert ihr Coordinator
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+class _BusSensor(NamedTuple):
+    key: str
+    name: str
+    unit: str | None
+    state_class: str
+    value: Callable[[THZDevice], float | int]
+
+
+BUS_SENSORS = (
+    _BusSensor("bus_utilization", "Bus utilization", "%", SensorStateClass.MEASUREMENT,
+               lambda device: device.metrics.utilization(asyncio.get_running_loop().time())),
+    _BusSensor("bus_latency_p50", "Bus latency p50", "ms", SensorStateClass.MEASUREMENT,
+               lambda device: round(device.metrics.latency().percentile(50) * 1000, 1)),
+    _BusSensor("bus_latency_p95", "Bus latency p95", "ms", SensorStateClass.MEASUREMENT,
+               lambda device: round(device.metrics.latency().percentile(95) * 1000, 1)),
+    _BusSensor("bus_errors", "Bus errors", None, SensorStateClass.TOTAL_INCREASING,
+               lambda device: sum(device.metrics.errors.values())),
+    _BusSensor("bus_timeouts", "Bus timeouts", None, SensorStateClass.TOTAL_INCREASING,
+               lambda device: device.metrics.timeouts),
+)
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
 
-    # 4. Mapping setzen
-    register_manager: RegisterMapManager = hass.data["thz"]["register_manager"]
-    write_manager: RegisterMapManager_Write = hass.data["thz"]["write_manager"]
-    device: THZDevice = hass.data["thz"]["device"]
-
-    # 5. Sensoren anlegen
-    sensors = []
-    all_registers = register_manager.get_all_registers()
-    for block, entries in all_registers.items():
-        block = block.strip("pxx")  # Entferne "pxx" Präfix
-        block_bytes = bytes.fromhex(block)
-        for name, offset, length, decode_type, factor in entries:
-            meta = SENSOR_META.get(name.strip(), {})
-            entry = {
-                "name": name.strip(),
-                "offset": offset//2, # Register-Offset in Bytes
-                "length": (length + 1) //2, # Register-Länge in Bytes; +1 um immer mindestens 1 Byte zu haben
-                "decode": decode_type,
-                "factor": factor,
-                "unit": meta.get("unit"),
-                "device_class": meta.get("device_class"),
-                "icon": meta.get("icon"),
-                "translation_key": meta.get("translation_key"),
-            }
-            sensors.append(THZGenericSensor(entry=entry, block=block_bytes, device=device)
-                           )         
-    async_add_entities(sensors, True)
-
-
-def decode_value(raw: bytes, decode_type: str, factor: float = 1.0):
-    if decode_type == "hex2int":
-        #raw = raw[:2]  # Nur 2 Byte nutzen, Register meint mit 4 Anzahl Zeichen im Hex-String
-        return int.from_bytes(raw, byteorder="big", signed=True) / factor
-    elif decode_type == "hex":
-        #raw = raw[:2]  # Nur 2 Byte nutzen, Register meint mit 4 Anzahl Zeichen im Hex-String
-        return int.from_bytes(raw, byteorder="big")
-    elif decode_type.startswith("bit"):
-        bitnum = int(decode_type[3:])
-        # _LOGGER.debug(f"Decode bit {bitnum} from raw {raw.hex()}")
-        return (raw[0] >> bitnum) & 0x01
-    elif decode_type.startswith("nbit"):
-        bitnum = int(decode_type[4:])
-        # _LOGGER.debug(f"Decode bit {bitnum} from raw {raw.hex()}")
-        return not ((raw[0] >> bitnum) & 0x01)
-    elif decode_type == "esp_mant":
-        # Dummy Beispiel für spezielle Darstellung
-        mant = int.from_bytes(raw[:4], byteorder="big")
-        exp = int.from_bytes(raw[4:], byteorder="big")
-        return mant * (2 ** exp)
-    else:
-        return raw.hex()
-    
-def normalize_entry(entry): #um nach und nach Mapping zu erweitern
-    if isinstance(entry, tuple):
-        name, offset, length, decode, factor = entry
-        return {
-            "name": name.strip(),
-            "offset": offset,
-            "length": length,
-            "decode": decode,
-            "factor": factor,
-            "unit": None,
-            "device_class": None,
-            "icon": None,
-            "translation_key": None
-        }
-    elif isinstance(entry, dict):
-        return entry
-    else:
-        raise ValueError("Unsupported sensor entry format.")
-
-class THZGenericSensor(Entity):
-    def __init__(self, entry, block, device):
-        e = normalize_entry(entry)
-        self._name = e["name"]
-        self._block = block
-        self._offset = e["offset"]
-        self._length = e["length"]
-        self._decode_type = e["decode"]
-        self._factor = e["factor"]
-        self._unit = e.get("unit")
-        self._device_class = e.get("device_class")
-        self._icon = e.get("icon")
-        self._translation_key = e.get("translation_key")
-        self._refresh_dict = e.get("refresh_dict")
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    device: THZDevice = entry_data["device"]
+    coordinators: dict[str, THZBlockCoordinator] = entry_data["coordinators"]
+
+    # Je Block ein Coordinator, der alle Sensoren des Blocks versorgt; die
+    # Deskriptoren sind je Firmware gecacht und werden nur referenziert
+    sensors = [
+        THZGenericSensor(descriptor, coordinators[block], device, config_entry.entry_id)
+        for block, descriptors in get_sensor_descriptors(device.firmware_version).items()
+        for descriptor in descriptors
+    ]
+    sensors.extend(THZBusSensor(description, device, config_entry.entry_id) for description in BUS_SENSORS)
+    async_add_entities(sensors)
+
+
+class THZGenericSensor(CoordinatorEntity, Entity):
+    """Sensor auf einem Register-Block; wird vom Block-Coordinator aktualisiert (kein eigenes Polling)."""
+
+    def __init__(self, descriptor: SensorDescriptor, coordinator: THZBlockCoordinator, device, entry_id: str):
+        super().__init__(coordinator)
+        self._desc = descriptor
         self._device = device
+        self._attr_unique_id = f"{entry_id}_{descriptor.unique_suffix}"
+        self._field = coordinator.field_by_index[descriptor.index]
+        self._heartbeat = descriptor.heartbeat
+        self._last_available: bool | None = None
+        self._last_stale: bool | None = None
+        self._last_write = 0.0
         self._state = None
+        if coordinator.data is not None:
+            self._state = coordinator.data[descriptor.index]
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._load_heartbeat()
+
+    @callback
+    def async_registry_entry_updated(self) -> None:
+        # z. B. nach thz.set_heartbeat
+        self._load_heartbeat()
+
+    def _load_heartbeat(self) -> None:
+        """Heartbeat je Entity über die Registry-Optionen überschreibbar (0 = aus, ohne Option: Descriptor)."""
+        self._heartbeat = self._desc.heartbeat
+        if self.registry_entry is not None:
+            heartbeat = self.registry_entry.options.get(DOMAIN, {}).get(CONF_HEARTBEAT)
+            if heartbeat is not None:
+                self._heartbeat = float(heartbeat) or None
 
     @property
     def name(self):
-        return self._name
+        return self._desc.key
+
+    @property
+    def entity_registry_enabled_default(self):
+        return self._desc.enabled_default
+
+    @property
+    def entity_category(self):
+        return EntityCategory.DIAGNOSTIC if self._desc.diagnostic else None
 
     @property
     def state(self):
@@ -109,30 +111,61 @@ class THZGenericSensor(Entity):
     
     @property
     def native_unit_of_measurement(self):
-        return self._unit
+        return self._desc.unit
 
     @property
     def device_class(self):
-        return self._device_class
+        return self._desc.device_class
 
     @property
     def icon(self):
-        return self._icon
+        return self._desc.icon
 
     @property
     def translation_key(self):
-        return self._translation_key
+        return self._desc.translation_key
     
     @property
-    def unique_id(self):
-        return f"thz_{self._block}_{self._offset}_{self._name.lower().replace(' ', '_')}"
-
-
-    async def async_update(self):
-        async with self._device.lock:
-            payload = await self.hass.async_add_executor_job(self._device.read_block_cached, self._block)
-            await asyncio.sleep(0.01)  # Kurze Pause, um sicherzustellen, dass das Gerät bereit ist   
-        #_LOGGER.debug(f"Updating sensor {self._name} with payload: {payload.hex()}, offset: {self._offset}, length: {self._length}")
-        raw_bytes = payload[self._offset:self._offset + self._length]
-        self._state = decode_value(raw_bytes, self._decode_type, self._factor)
-        #_LOGGER.debug(f"Sensor {self._name} updated with state: {self._state}")
\ No newline at end of file
+    def extra_state_attributes(self):
+        return {"stale": self._device.block_is_stale(self._desc.block_bytes)}
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._last_available = self.available
+        self._last_stale = self._device.block_is_stale(self._desc.block_bytes)
+        self._last_write = monotonic()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Alle Sensoren eines Blocks laufen hier im selben Tick durch; geschrieben wird nur,
+        # wenn sich die eigenen Bytes, die Verfügbarkeit oder "stale" ändern oder der Heartbeat fällig ist
+        coordinator = self.coordinator
+        if (
+            coordinator.last_update_success == self._last_available
+            and self._device.block_is_stale(self._desc.block_bytes) == self._last_stale
+            and not coordinator.field_changed(self._field)
+            and (self._heartbeat is None or monotonic() - self._last_write < self._heartbeat)
+        ):
+            return
+        if coordinator.data is not None:
+            self._state = coordinator.data[self._desc.index]
+        self.async_write_ha_state()
+
+
+class THZBusSensor(SensorEntity):
+    """Diagnosesensor aus den Bus-Messwerten des Geräts (keine Kommunikation, nur Auslesen der Zähler)."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, description: _BusSensor, device: THZDevice, entry_id: str):
+        self._description = description
+        self._device = device
+        self._attr_unique_id = f"{entry_id}_thz_{description.key}"
+        self._attr_name = description.name
+        self._attr_native_unit_of_measurement = description.unit
+        self._attr_state_class = description.state_class
+        self._attr_native_value = description.value(device)
+
+    async def async_update(self) -> None:
+        self._attr_native_value = self._description.value(self._device)
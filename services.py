@@ -0,0 +1,93 @@
+"""Services: Telegramm-Mitschnitt ein-/ausschalten und exportieren, Heartbeat von Sensoren setzen."""
+import logging
+from datetime import datetime
+
+import voluptuous as vol # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.const import ATTR_ENTITY_ID # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.core import HomeAssistant, ServiceCall # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.exceptions import HomeAssistantError # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers import config_validation as cv # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers import entity_registry as er # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from .const import CONF_HEARTBEAT, DOMAIN
+from .thz_device import THZDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_TRACE = "trace"
+SERVICE_EXPORT_TRACE = "export_trace"
+SERVICE_SET_HEARTBEAT = "set_heartbeat"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_ENABLED = "enabled"
+ATTR_SIZE = "size"
+ATTR_CLEAR = "clear"
+ATTR_PATH = "path"
+ATTR_HEARTBEAT = "heartbeat"
+
+TRACE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENABLED): cv.boolean,
+    vol.Optional(ATTR_SIZE): vol.All(vol.Coerce(int), vol.Range(min=10, max=100000)),
+    vol.Optional(ATTR_CLEAR, default=False): cv.boolean,
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+EXPORT_TRACE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_PATH): cv.string,
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+SET_HEARTBEAT_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+    # Sekunden; 0 = aus, ohne Angabe gilt wieder der Standard der Register-Map
+    vol.Optional(ATTR_HEARTBEAT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+})
+
+
+def _devices(hass: HomeAssistant, call: ServiceCall) -> dict[str, THZDevice]:
+    """Geräte der angegebenen bzw. aller geladenen Config Entries."""
+    entries = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is not None:
+        if entry_id not in entries:
+            raise HomeAssistantError(f"Kein geladener THZ-Eintrag mit ID {entry_id}")
+        return {entry_id: entries[entry_id]["device"]}
+    return {entry_id: entry_data["device"] for entry_id, entry_data in entries.items()}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+
+    async def async_trace(call: ServiceCall) -> None:
+        for device in _devices(hass, call).values():
+            if call.data[ATTR_CLEAR]:
+                device.trace.clear()
+            if call.data[ATTR_ENABLED]:
+                device.trace.start(call.data.get(ATTR_SIZE))
+            else:
+                device.trace.stop()
+
+    async def async_export_trace(call: ServiceCall) -> None:
+        devices = _devices(hass, call)
+        path = call.data.get(ATTR_PATH)
+        if path is not None and len(devices) > 1:
+            raise HomeAssistantError("Bei mehreren Wärmepumpen config_entry_id angeben")
+        for entry_id, device in devices.items():
+            if path is None:
+                target = hass.config.path(f"thz_trace_{entry_id}_{datetime.now():%Y%m%d-%H%M%S}.jsonl")
+            elif hass.config.is_allowed_path(path):
+                target = path
+            else:
+                raise HomeAssistantError(f"Pfad nicht freigegeben (allowlist_external_dirs): {path}")
+            count = await hass.async_add_executor_job(device.trace.export, target, device.firmware_version)
+            _LOGGER.info("THZ-Mitschnitt exportiert: %d Telegramme nach %s", count, target)
+
+    async def async_set_heartbeat(call: ServiceCall) -> None:
+        registry = er.async_get(hass)
+        heartbeat = call.data.get(ATTR_HEARTBEAT)
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            registry_entry = registry.async_get(entity_id)
+            if registry_entry is None or registry_entry.platform != DOMAIN:
+                raise HomeAssistantError(f"Keine THZ-Entity: {entity_id}")
+            options = None if heartbeat is None else {CONF_HEARTBEAT: heartbeat}
+            registry.async_update_entity_options(entity_id, DOMAIN, options)
+
+    hass.services.async_register(DOMAIN, SERVICE_TRACE, async_trace, schema=TRACE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_EXPORT_TRACE, async_export_trace, schema=EXPORT_TRACE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SET_HEARTBEAT, async_set_heartbeat, schema=SET_HEARTBEAT_SCHEMA)
@@ -1,70 +1,73 @@
 from homeassistant.components.switch import SwitchEntity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
-from .register_maps.register_map_manager import RegisterMapManager_Write
+from homeassistant.core import callback # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.update_coordinator import CoordinatorEntity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from .entity_descriptors import ParameterDescriptor, get_parameter_descriptors
 from .thz_device import THZDevice
-import asyncio
+from .coordinator import THZParameterCoordinator
+from .const import DOMAIN
 
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
-    entities = []
-    write_manager: RegisterMapManager_Write = hass.data["thz"]["write_manager"]
-    device: THZDevice = hass.data["thz"]["device"]
-    write_registers = write_manager.get_all_registers()
-    _LOGGER.debug(f"write_registers: {write_registers}")
-    for name, entry in write_registers.items():
-        if entry["type"] == "switch":
-            _LOGGER.debug(f"Creating Switch for {name} with command {entry['command']}")
-            entity = THZSwitch(
-                name=name,
-                command=entry["command"],
-                min_value=entry["min"],
-                max_value=entry["max"],
-                step=entry.get("step", 1),
-                unit=entry.get("unit", ""),
-                device_class=entry.get("device_class"),
-                device=device,
-                icon=entry.get("icon"),
-                unique_id=f"thz_{name.lower().replace(' ', '_')}",
-            )
-            entities.append(entity)
-        
-    async_add_entities(entities, True)
-class THZSwitch(SwitchEntity):
-    _attr_should_poll = True
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    device: THZDevice = entry_data["device"]
+    coordinator: THZParameterCoordinator = entry_data["parameter_coordinator"]
+    entities = [
+        THZSwitch(descriptor, device, coordinator, config_entry.entry_id)
+        for descriptor in get_parameter_descriptors(device.firmware_version).get("switch", ())
+    ]
+    _LOGGER.debug("Creating %d THZSwitch entities", len(entities))
+    async_add_entities(entities)
 
-    def __init__(self, name, command, min_value, max_value, step, unit, device_class, device, icon=None, unique_id=None):
-        self._attr_name = name
-        self._command = command
+
+class THZSwitch(CoordinatorEntity, SwitchEntity):
+    """Schreibparameter als Schalter; der Wert kommt aus dem Parameter-Snapshot."""
+
+    def __init__(self, descriptor: ParameterDescriptor, device: THZDevice, coordinator: THZParameterCoordinator, entry_id: str):
+        super().__init__(coordinator, context=descriptor.command)
+        self._desc = descriptor
         self._device = device
-        self._attr_icon = icon or "mdi:eye"
-        self._attr_unique_id = unique_id or f"thz_set_{command.lower()}_{name.lower().replace(' ', '_')}"
+        self._attr_unique_id = f"{entry_id}_{descriptor.unique_suffix}"
         self._is_on = False
+        self._update_from_snapshot()
+
+    @property
+    def name(self):
+        return self._desc.key
+
+    @property
+    def entity_registry_enabled_default(self):
+        return self._desc.enabled_default
+
+    @property
+    def icon(self):
+        return self._desc.icon or "mdi:eye"
 
     @property
     def is_on(self):
         return self._is_on
 
+    def _update_from_snapshot(self) -> None:
+        # Jeder Wert ungleich 0 gilt als eingeschaltet
+        value_bytes = (self.coordinator.data or {}).get(self._desc.command)
+        if value_bytes is not None:
+            self._is_on = bool(int.from_bytes(value_bytes, byteorder='big', signed=False))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_snapshot()
+        self.async_write_ha_state()
 
-    #TODO debugging um die richtigen Werte zu bekommen
-    async def async_update(self):
-        # Read the value from the device and interpret as on/off
-        _LOGGER.debug(f"Updating switch {self._attr_name} with command {self._command}")
-        async with self._device.lock:
-            value_bytes = await self.hass.async_add_executor_job(self._device.read_value, bytes.fromhex(self._command), "get", 4, 2)
-            await asyncio.sleep(0.01)  # Kurze Pause, um sicherzustellen, dass das Gerät bereit ist
-        value = int.from_bytes(value_bytes, byteorder='big', signed=False)
-        self._is_on = bool(value)
+    async def _async_write(self, on: bool) -> None:
+        await self._device.write_value(self._desc.command_bytes, int(on).to_bytes(2, byteorder='big', signed=False))
+        self._is_on = on
+        self.async_write_ha_state()
+        await self.coordinator.async_refresh_command(self._desc.command)
 
-    async def turn_on(self, **kwargs):
-        value_int = 1
-        async with self._device.lock:
-            await self.hass.async_add_executor_job(self._device.write_value, bytes.fromhex(self._command), value_int.to_bytes(2, byteorder='big', signed=False))
-        self._is_on = True
+    async def async_turn_on(self, **kwargs):
+        await self._async_write(True)
 
-    async def turn_off(self, **kwargs):
-        value_int = 0
-        async with self._device.lock:
-            await self.hass.async_add_executor_job(self._device.write_value, (bytes.fromhex(self._command), value_int.to_bytes(2, byteorder='big', signed=False)))
-        self._is_on = False
\ No newline at end of file
+    async def async_turn_off(self, **kwargs):
+        await self._async_write(False)
@@ -0,0 +1,29 @@
+import json
+import os
+
+import pytest
+
+_POLL_REPORTS = pytest.StashKey[list]()
+
+
+@pytest.fixture
+def poll_reports(request) -> list[dict]:
+    """Sammelt die Ergebnisse der Poll-Zyklus-Benchmarks für die Zusammenfassung."""
+    return request.config.stash.setdefault(_POLL_REPORTS, [])
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Ergebnisse der Poll-Zyklus-Benchmarks als Tabelle (und optional als JSON) ausgeben."""
+    reports = config.stash.get(_POLL_REPORTS, [])
+    if not reports:
+        return
+    columns = list(reports[0])
+    widths = {c: max(len(c), *(len(str(r[c])) for r in reports)) for c in columns}
+    terminalreporter.section("THZ poll cycle")
+    terminalreporter.write_line("  ".join(c.rjust(widths[c]) for c in columns))
+    for report in reports:
+        terminalreporter.write_line("  ".join(str(report[c]).rjust(widths[c]) for c in columns))
+    path = os.environ.get("THZ_POLL_REPORT")
+    if path:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(reports, file, indent=2)
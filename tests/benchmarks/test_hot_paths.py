@@ -0,0 +1,116 @@
+"""Micro-Benchmarks der Pfade, die bei jedem Poll für jeden Block bzw. jede Entity laufen.
+
+Ohne ``--benchmark-enable`` (siehe pytest.ini) läuft jede Funktion nur einmal
+als normaler Test. Messen und mit der gespeicherten Baseline derselben
+Python-Version vergleichen (so auch in CI)::
+
+    make benchmark-check
+
+Neue Baseline nach einer gewollten Änderung bzw. für eine neue Python-Version::
+
+    make benchmark-save
+"""
+import importlib
+from datetime import time
+
+import pytest
+
+from custom_components.thz.decoder import THZDecoderPlan
+from custom_components.thz.register_maps.register_map_manager import get_register_index, supported_firmwares
+from custom_components.thz.thz_device import THZDevice
+from custom_components.thz.thz_protocol import FOOTER, THZFrameParser, build_telegram, checksum, escape, unescape
+from custom_components.thz.time import quarters_to_time, time_to_quarters
+from tests.simulator import payloads_from_register_map
+
+MappingParser = importlib.import_module("custom_components.thz.000_mapping_parser").MappingParser
+
+
+def _body(payload: bytes) -> bytes:
+    """Antwort ohne Escapes: Header 01 00, Checksumme, Payload."""
+    body = b"\x01\x00\x00" + payload
+    return body[:2] + bytes([checksum(body)]) + body[3:]
+
+
+# Alle Blöcke und Parameter aller Firmwares, so wie der Simulator sie sendet
+PAYLOADS = {fw: payloads_from_register_map(fw) for fw in supported_firmwares}
+BODIES = [_body(payload) for payloads in PAYLOADS.values() for payload in payloads.values()]
+FRAMES = [escape(body) + FOOTER for body in BODIES]
+# Schlimmster Fall: jedes Byte muss escaped werden (0x10 -> 10 10, 0x2B -> 2B 18)
+WORST_BODY = _body(b"\xfb" + b"\x10\x2b" * 128)
+WORST_FRAME = escape(WORST_BODY) + FOOTER
+
+
+def test_checksum(benchmark):
+    result = benchmark(lambda: [checksum(body) for body in BODIES])
+    assert result == [body[2] for body in BODIES]
+
+
+@pytest.mark.parametrize("frames", [FRAMES, [WORST_FRAME] * 50], ids=["blocks", "escape_heavy"])
+def test_unescape(benchmark, frames):
+    result = benchmark(lambda: [unescape(frame[2:-2]) for frame in frames])
+    assert result[0] == (BODIES[0] if frames is FRAMES else WORST_BODY)[2:]
+
+
+@pytest.mark.parametrize("frames", [FRAMES, [WORST_FRAME] * 50], ids=["blocks", "escape_heavy"])
+def test_frame_parser(benchmark, frames):
+    def parse():
+        parsers = []
+        for frame in frames:
+            parser = THZFrameParser()
+            parser.feed(frame)
+            parsers.append(parser)
+        return parsers
+
+    parsers = benchmark(parse)
+    assert all(p.complete and p.checksum == p.frame[2] for p in parsers)
+
+
+@pytest.mark.parametrize("frames", [FRAMES, [WORST_FRAME] * 50], ids=["blocks", "escape_heavy"])
+def test_decode_response(benchmark, frames):
+    device = THZDevice()
+    result = benchmark(lambda: [device.decode_response(frame) for frame in frames])
+    assert result[-1] == (BODIES[-1] if frames is FRAMES else WORST_BODY)[2:]
+
+
+def test_build_telegram(benchmark):
+    addresses = [addr for payloads in PAYLOADS.values() for addr in payloads]
+    result = benchmark(lambda: [build_telegram(addr) for addr in addresses] + [build_telegram(addr, "set", b"\x10\x2b") for addr in addresses])
+    assert all(telegram.endswith(FOOTER) for telegram in result)
+
+
+def test_construct_telegram(benchmark):
+    device = THZDevice()
+    addresses = [addr for payloads in PAYLOADS.values() for addr in payloads]
+    result = benchmark(lambda: [device.construct_telegram(addr, b"\x01\x00", FOOTER, device.thz_checksum(b"\x01\x00\x00" + addr)) for addr in addresses])
+    assert result[0] == build_telegram(addresses[0])
+
+
+@pytest.mark.parametrize("firmware", supported_firmwares)
+def test_decode_blocks(benchmark, firmware):
+    """Dekodieren aller Blöcke einer Firmware: der Teil eines Poll-Zyklus, der für jeden Sensor läuft."""
+    index = get_register_index(firmware)
+    payloads = PAYLOADS[firmware]
+    work = [
+        (THZDecoderPlan(entries), _body(payloads[index.block_bytes[block]])[2:])
+        for block, entries in index.blocks.items()
+    ]
+    result = benchmark(lambda: [plan.decode(payload) for plan, payload in work])
+    # ein Wert je Eintrag, auch bei doppelten Namen innerhalb eines Blocks (439/539)
+    assert [len(values) for values in result] == [len(entries) for entries in index.blocks.values()]
+
+
+def test_mapping_parser(benchmark):
+    index = get_register_index("206")
+    payloads = PAYLOADS["206"]
+    work = [
+        (MappingParser(entries), _body(payloads[index.block_bytes[block]])[2:])
+        for block, entries in index.blocks.items()
+    ]
+    result = benchmark(lambda: [parser.parse(payload) for parser, payload in work])
+    assert all(result)
+
+
+def test_time_quarters(benchmark):
+    times = [time(q // 4, q % 4 * 15) for q in range(96)]
+    result = benchmark(lambda: [quarters_to_time(time_to_quarters(t)) for t in times])
+    assert result == times
@@ -0,0 +1,186 @@
+"""End-to-End-Benchmark eines Poll-Zyklus: Integration gegen den Simulator.
+
+Je Modus wird die Integration über einen Config Entry eingerichtet und
+dann N Zyklen lang alle Blöcke plus der Parameter-Snapshot gelesen, so wie
+die Coordinatoren es tun (inkl. Dekodieren und State-Schreiben der
+Entities). Gemessen werden Zykluszeit, Anfragen pro Sekunde,
+Executor-Nutzung, Verzögerung der Event-Loop (max/p99) und der Speicher
+je Entity, den das Setup der Plattformen belegt (nur im vollen Lauf, sonst
+None). Modi: Pause zwischen den Anfragen fest auf dem Minimum oder wie im
+Betrieb vom adaptiven Pacer bestimmt.
+
+Im normalen Testlauf läuft je Modus ein Zyklus als Test. Voller Lauf mit
+Tabelle am Ende::
+
+    pytest tests/benchmarks/test_poll_cycle.py --benchmark-enable -s
+
+``THZ_POLL_CYCLES``, ``THZ_POLL_PERIOD`` und ``THZ_SIM_LATENCY`` (Sekunden)
+ändern Zyklen, Abstand der Zyklen und Antwortzeit des Simulators;
+``THZ_POLL_REPORT`` schreibt die Ergebnisse zusätzlich als JSON.
+"""
+import asyncio
+import os
+import threading
+import time
+import tracemalloc
+from typing import NamedTuple
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from custom_components.thz.const import DOMAIN
+from tests.simulator import THZSimulator, payloads_from_register_map
+
+class PollMode(NamedTuple):
+    name: str
+    adaptive: bool  # Pause vom THZPacer statt fest auf min_gap
+
+
+MODES = (
+    PollMode("min_gap", adaptive=False),
+    PollMode("adaptive_gap", adaptive=True),
+)
+
+
+def _percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+class LoopLagProbe:
+    """Misst, wie viel später als geplant ein kurzer Sleep auf der Event-Loop zurückkehrt."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - start - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class ExecutorProbe:
+    """Zählt Executor-Jobs, ihre Laufzeit und die beteiligten Threads."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.jobs = 0
+        self.busy = 0.0
+        self.threads: set[int] = set()
+        self._original = loop.run_in_executor
+
+    def _wrap(self, executor, func, *args):
+        def timed():
+            self.threads.add(threading.get_ident())
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.busy += time.perf_counter() - start
+
+        self.jobs += 1
+        return self._original(executor, timed)
+
+    def __enter__(self):
+        self.loop.run_in_executor = self._wrap
+        return self
+
+    def __exit__(self, *exc):
+        del self.loop.run_in_executor
+
+
+@pytest.mark.parametrize("mode", MODES, ids=[m.name for m in MODES])
+async def test_poll_cycle(hass, enable_custom_integrations, socket_enabled, poll_reports, request, mode):
+    full = request.config.getoption("benchmark_enable")
+    cycles = int(os.environ.get("THZ_POLL_CYCLES", 10)) if full else 1
+    period = float(os.environ.get("THZ_POLL_PERIOD", 0.25)) if full else 0.0
+    simulator = THZSimulator(payloads_from_register_map("206"), latency=float(os.environ.get("THZ_SIM_LATENCY", 0.002)))
+    port = await simulator.start_tcp()
+    entry = MockConfigEntry(domain=DOMAIN, data={"connection_type": "ip", "host": "127.0.0.1", "port": port, "refresh_intervals": {}})
+    entry.add_to_hass(hass)
+
+    # Speicher nur um das Setup der Plattformen messen (Entities anlegen, Registry, erster State),
+    # nicht Verbindung und Register-Maps; tracemalloc verlangsamt stark, daher nur im vollen Lauf
+    entity_memory = None
+    forward_entry_setups = hass.config_entries.async_forward_entry_setups
+
+    async def traced_forward_entry_setups(*args):
+        nonlocal entity_memory
+        tracemalloc.start()
+        try:
+            await forward_entry_setups(*args)
+            entity_memory, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    if full:
+        hass.config_entries.async_forward_entry_setups = traced_forward_entry_setups
+    try:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    finally:
+        vars(hass.config_entries).pop("async_forward_entry_setups", None)
+
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    device = entry_data["device"]
+    coordinators = list(entry_data["coordinators"].values())
+    parameter_coordinator = entry_data["parameter_coordinator"]
+    if not mode.adaptive:
+        device._pacer.gap = device._pacer.min_gap
+    entities = len(hass.states.async_all())
+
+    probe = LoopLagProbe()
+    requests_before = sum(simulator.requests.values())
+    cycle_times, block_times = [], []
+    with ExecutorProbe(hass.loop) as executor:
+        probe.start()
+        start = time.perf_counter()
+        for i in range(cycles):
+            if i and period:
+                await asyncio.sleep(period)
+            cycle_start = time.perf_counter()
+            await asyncio.gather(*(c.async_refresh() for c in coordinators))
+            block_times.append(time.perf_counter() - cycle_start)
+            await parameter_coordinator.async_refresh()
+            cycle_times.append(time.perf_counter() - cycle_start)
+        elapsed = time.perf_counter() - start
+        await probe.stop()
+    requests = sum(simulator.requests.values()) - requests_before
+
+    report = {
+        "mode": mode.name,
+        "cycles": cycles,
+        "entities": entities,
+        "cycle_avg_ms": round(sum(cycle_times) / len(cycle_times) * 1000, 1),
+        "cycle_max_ms": round(max(cycle_times) * 1000, 1),
+        "blocks_avg_ms": round(sum(block_times) / len(block_times) * 1000, 1),
+        "requests": requests,
+        "requests_per_s": round(requests / elapsed, 1),
+        "executor_jobs": executor.jobs,
+        "executor_threads": len(executor.threads),
+        "executor_busy_ms": round(executor.busy * 1000, 1),
+        "loop_lag_max_ms": round(max(probe.lags, default=0.0) * 1000, 2),
+        "loop_lag_p99_ms": round(_percentile(probe.lags, 99) * 1000, 2),
+        "memory_per_entity_b": None if entity_memory is None else entity_memory // max(entities, 1),
+    }
+    poll_reports.append(report)
+
+    assert all(c.last_update_success for c in coordinators)
+    assert requests >= cycles * len(coordinators)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await simulator.close()
@@ -0,0 +1,281 @@
+"""Simulierte THZ-Wärmepumpe für Tests und Benchmarks (ohne Hardware).
+
+Spricht das echte Protokoll: ``02`` -> ``10``, Telegramm -> ``10 02``,
+``10`` -> Daten bis ``10 03``, abschließendes ``02``. Erreichbar über einen
+lokalen TCP-Port (wie ser.net) oder ein Pseudo-Terminal (wie der USB-Adapter).
+
+Payloads kommen aus den Register-Maps einer Firmware (deterministische
+Werte in der Länge des Blocks) oder aus einem mit ``thz.export_trace``
+aufgezeichneten Mitschnitt. Antwortzeit und Fehler sind einstellbar:
+
+* ``latency``: Wartezeit vor ``10 02`` (Verarbeitungszeit des Geräts)
+* ``errors``: feste Fehlerantwort je Adresse (``01 01`` .. ``01 04``)
+* ``inject()``: einmalige Fehler in der Reihenfolge des Aufrufs
+* ``silent``: schluckt alle Bytes ohne Antwort (halboffene Verbindung)
+* ``disconnect()``: trennt alle TCP-Clients (Gateway-Neustart)
+* ``fault_rates``: zufällige Fehler je Art mit fester Saat
+
+Fehlerarten (FAULTS): ``timing``, ``request_crc``, ``unknown_command``,
+``unknown_register`` (Header 01 01..01 04), ``crc`` (falsche Checksumme in
+der Antwort), ``drop`` (Antwort bricht nach der Hälfte ab).
+
+Aufruf als Skript::
+
+    python -m tests.simulator --firmware 206 --tcp 2323 --latency 0.02
+    python -m tests.simulator --trace thz_trace.jsonl --pty
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tty
+from collections import Counter, deque
+from pathlib import Path
+
+from custom_components.thz.frame_trace import RX, read_trace
+from custom_components.thz.register_maps.register_map_manager import DATA_DIR, DEFAULT_FIRMWARE, get_write_index
+from custom_components.thz.thz_protocol import DEVICE_ERRORS, checksum, escape
+
+DLE = 0x10
+STX = 0x02
+ETX = 0x03
+
+FAULTS = {
+    "timing": b"\x01\x01",
+    "request_crc": b"\x01\x02",
+    "unknown_command": b"\x01\x03",
+    "unknown_register": b"\x01\x04",
+    "crc": None,
+    "drop": None,
+}
+assert all(header in DEVICE_ERRORS for header in FAULTS.values() if header is not None)
+
+
+def _frame(header: bytes, payload: bytes = b"") -> bytes:
+    """Header + Checksumme + Payload (ohne Escapes)."""
+    body = header + b"\x00" + payload
+    return header + bytes([checksum(body)]) + payload
+
+
+def _block_payload(addr: bytes, entries: list) -> bytes:
+    """Adresse + deterministische Werte, so lang wie der längste Eintrag des Blocks (Offsets ab CRC-Byte)."""
+    size = max(((offset + length + 1) // 2 for _, offset, length, _, _ in entries), default=len(addr) + 1)
+    values = bytes((i * 7) % 256 for i in range(max(0, size - 1 - len(addr))))
+    return addr + values
+
+
+def payloads_from_register_map(firmware_version: str = DEFAULT_FIRMWARE) -> dict[bytes, bytes]:
+    """Payloads (Adresse + Daten) aller Lese-Blöcke und Schreibparameter einer Firmware."""
+    path = DATA_DIR / f"{firmware_version}.json"
+    blocks = json.loads(path.read_text(encoding="utf-8"))["blocks"]
+    payloads = {}
+    for block, entries in blocks.items():
+        addr = bytes.fromhex(block[3:])
+        payloads[addr] = _block_payload(addr, entries)
+    for entry in get_write_index(firmware_version).entries.values():
+        addr = bytes.fromhex(entry["command"])
+        payloads.setdefault(addr, addr + b"\x00\x00")
+    # Firmware-Version (Block FD, Offset 2 Bytes)
+    payloads[b"\xfd"] = b"\xfd" + int(firmware_version.rstrip("j")).to_bytes(2, "big")
+    return payloads
+
+
+def payloads_from_trace(path: str | Path) -> dict[bytes, bytes]:
+    """Letzte erfolgreiche Antwort je Adresse aus einem exportierten Mitschnitt."""
+    _, records = read_trace(str(path))
+    payloads = {}
+    for record in records:
+        if record.direction == RX and record.data[:2] == b"\x01\x00":
+            payloads[record.addr] = record.data[3:]
+    return payloads
+
+
+class THZSimulator:
+    """Zustand und Protokoll der simulierten Wärmepumpe; beliebig viele Verbindungen teilen ihn."""
+
+    def __init__(
+        self,
+        payloads: dict[bytes, bytes] | None = None,
+        latency: float = 0.0,
+        fault_rates: dict[str, float] | None = None,
+        seed: int = 0,
+    ):
+        self.payloads = dict(payloads) if payloads is not None else payloads_from_register_map()
+        self.latency = latency
+        self.silent = False
+        self.errors: dict[bytes, bytes] = {}
+        self.fault_rates = dict(fault_rates or {})
+        self.requests: Counter[bytes] = Counter()
+        self.faults: Counter[str] = Counter()
+        self._pending: deque[tuple[str, bytes | None]] = deque()
+        self._random = random.Random(seed)
+        self._servers: list[asyncio.AbstractServer] = []
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._tasks: list[asyncio.Task] = []
+        self._fds: list[int] = []
+
+    def inject(self, fault: str, count: int = 1, addr: bytes | None = None) -> None:
+        """Die nächsten ``count`` Anfragen (an ``addr`` bzw. beliebige) schlagen mit ``fault`` fehl."""
+        if fault not in FAULTS:
+            raise ValueError(f"Unbekannte Fehlerart: {fault}")
+        self._pending.extend([(fault, addr)] * count)
+
+    def _fault_for(self, addr: bytes) -> str | None:
+        for i, (fault, target) in enumerate(self._pending):
+            if target is None or target == addr:
+                del self._pending[i]
+                return fault
+        for fault, rate in self.fault_rates.items():
+            if self._random.random() < rate:
+                return fault
+        return None
+
+    def respond(self, telegram: bytes) -> tuple[bytes, str | None]:
+        """Antwort-Telegramm (ohne Escapes) auf ein empfangenes Telegramm und ggf. die Fehlerart."""
+        header, crc, addr_payload = telegram[:2], telegram[2], telegram[3:]
+        if len(telegram) < 4 or checksum(telegram) != crc:
+            return _frame(b"\x01\x02"), "request_crc"
+        addr = addr_payload
+        if header == b"\x01\x80":
+            # Schreibtelegramm: Adresse + Wert; die längste bekannte Adresse gewinnt (0A0112 vor 0A)
+            addr = max(
+                (a for a in self.payloads if addr_payload.startswith(a) and len(a) < len(addr_payload)),
+                key=len,
+                default=addr_payload[:1],
+            )
+        self.requests[addr] += 1
+        fault = self._fault_for(addr)
+        if fault is None and addr in self.errors:
+            return _frame(self.errors[addr]), "device_error"
+        if fault is not None and FAULTS[fault] is not None:
+            return _frame(FAULTS[fault]), fault
+        if header == b"\x01\x80":
+            # Schreiben: neuer Wert ist ab sofort lesbar
+            self.payloads[addr] = addr_payload
+            body = _frame(b"\x01\x80", addr)
+        elif addr in self.payloads:
+            body = _frame(b"\x01\x00", self.payloads[addr])
+        else:
+            return _frame(b"\x01\x04"), "unknown_register"
+        if fault == "crc":
+            body = body[:2] + bytes([(body[2] + 1) % 256]) + body[3:]
+        return body, fault
+
+    async def handle(self, reader: asyncio.StreamReader, write) -> None:
+        """Bedient eine Verbindung bis zu ihrem Ende; ``write`` sendet Bytes."""
+        try:
+            while True:
+                if (await reader.readexactly(1))[0] != STX or self.silent:
+                    continue
+                write(b"\x10")
+                telegram = await self._read_telegram(reader)
+                if telegram is None:
+                    continue
+                response, fault = self.respond(telegram)
+                if fault is not None:
+                    self.faults[fault] += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                write(b"\x10\x02")
+                if (await reader.readexactly(1))[0] != DLE:
+                    continue
+                data = escape(response) + b"\x10\x03"
+                if fault == "drop":
+                    write(data[: len(data) // 2])
+                    continue
+                write(data)
+                await reader.readexactly(1)  # abschließendes 02
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+
+    @staticmethod
+    async def _read_telegram(reader: asyncio.StreamReader) -> bytes | None:
+        telegram = bytearray()
+        while True:
+            b = (await reader.readexactly(1))[0]
+            if b == DLE:
+                b2 = (await reader.readexactly(1))[0]
+                if b2 == ETX:
+                    return bytes(telegram)
+                if b2 != DLE:
+                    return None
+                telegram.append(DLE)
+            elif b == 0x2B:
+                telegram.append(b)
+                b2 = (await reader.readexactly(1))[0]
+                if b2 != 0x18:
+                    telegram.append(b2)
+            else:
+                telegram.append(b)
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Lauscht auf TCP (wie ser.net) und liefert den Port."""
+        async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            self._writers.add(writer)
+            try:
+                await self.handle(reader, writer.write)
+            finally:
+                self._writers.discard(writer)
+                writer.close()
+
+        server = await asyncio.start_server(serve, host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    def disconnect(self) -> None:
+        """Trennt alle TCP-Clients; der Server nimmt weiter Verbindungen an."""
+        for writer in list(self._writers):
+            writer.transport.abort()
+
+    async def start_pty(self) -> str:
+        """Öffnet ein Pseudo-Terminal und liefert den Pfad der Gegenstelle (z. B. /dev/pts/5)."""
+        master, slave = os.openpty()
+        tty.setraw(master)
+        tty.setraw(slave)
+        self._fds += [master, slave]
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(master, "rb", buffering=0, closefd=False))
+        self._tasks.append(loop.create_task(self.handle(reader, lambda data: os.write(master, data))))
+        return os.ttyname(slave)
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for fd in self._fds:
+            os.close(fd)
+        self._servers, self._tasks, self._fds = [], [], []
+
+
+async def _main(args: argparse.Namespace) -> None:
+    payloads = payloads_from_trace(args.trace) if args.trace else payloads_from_register_map(args.firmware)
+    fault_rates = dict((kind, float(rate)) for kind, rate in (item.split("=") for item in args.fault)) if args.fault else None
+    simulator = THZSimulator(payloads, latency=args.latency, fault_rates=fault_rates, seed=args.seed)
+    if args.pty:
+        print(f"Pseudo-Terminal: {await simulator.start_pty()}")
+    if args.tcp is not None or not args.pty:
+        print(f"TCP: 127.0.0.1:{await simulator.start_tcp(port=args.tcp or 0)}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--firmware", default=DEFAULT_FIRMWARE)
+    parser.add_argument("--trace", help="Payloads aus einem exportierten Mitschnitt")
+    parser.add_argument("--tcp", type=int, help="TCP-Port (0 = frei wählen)")
+    parser.add_argument("--pty", action="store_true", help="Pseudo-Terminal öffnen")
+    parser.add_argument("--latency", type=float, default=0.0, help="Antwortzeit in Sekunden")
+    parser.add_argument("--fault", action="append", help="Zufallsfehler, z. B. timing=0.01 oder drop=0.001")
+    parser.add_argument("--seed", type=int, default=0)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
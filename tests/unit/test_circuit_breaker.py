@@ -0,0 +1,47 @@
+from custom_components.thz.circuit_breaker import THZCircuitBreaker
+from custom_components.thz.thz_protocol import THZTimingError, THZUnknownRegisterError
+
+
+def test_breaker_opens_after_threshold():
+    breaker = THZCircuitBreaker(failure_threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.record_failure(THZTimingError("Timing Issue vom Gerät"))
+        assert breaker.allow()
+    breaker.record_failure(THZTimingError("Timing Issue vom Gerät"))
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_breaker_opens_immediately_on_permanent_error():
+    breaker = THZCircuitBreaker(failure_threshold=3, cooldown=60)
+    breaker.record_failure(THZUnknownRegisterError("Unbekannte Register Anfrage"))
+    assert not breaker.allow()
+
+
+def test_breaker_probes_after_cooldown():
+    breaker = THZCircuitBreaker(cooldown=0, max_cooldown=0)
+    breaker.record_failure(THZUnknownRegisterError("Unbekannte Register Anfrage"))
+    assert breaker.allow()  # Probe
+    assert not breaker.allow()  # nur eine Probe gleichzeitig
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_probe_doubles_cooldown():
+    breaker = THZCircuitBreaker(cooldown=0, max_cooldown=10)
+    breaker.cooldown = breaker.base_cooldown = 1
+    breaker.opened_at = -10.0
+    assert breaker.allow()
+    breaker.record_failure(THZUnknownRegisterError("Unbekannte Register Anfrage"))
+    assert breaker.cooldown == 2
+    assert breaker.state == "open"
+
+
+def test_released_probe_allows_next_probe():
+    breaker = THZCircuitBreaker(cooldown=0, max_cooldown=0)
+    breaker.record_failure(THZUnknownRegisterError("Unbekannte Register Anfrage"))
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
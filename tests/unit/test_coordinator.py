@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+from custom_components.thz.coordinator import THZBlockCoordinator
+from custom_components.thz.decoder import THZDecoderPlan
+
+
+class FakeDevice:
+    def __init__(self, payloads):
+        self.payloads = list(payloads)
+        self.register_map_manager = SimpleNamespace(index=SimpleNamespace(block_bytes={"pxxFB": b"\xfb"}))
+        self.decoder_plans = {"pxxFB": THZDecoderPlan([("a", 4, 4, "hex", 1), ("b", 8, 2, "hex", 1)])}
+
+    async def refresh_block(self, block):
+        return self.payloads.pop(0)
+
+
+async def test_block_coordinator_reports_changed_fields(hass):
+    device = FakeDevice([bytes.fromhex("00fb000102"), bytes.fromhex("00fb000103"), bytes.fromhex("00fb000103")])
+    coordinator = THZBlockCoordinator(hass, device, "pxxFB", 60)
+    a, b = coordinator.field_by_index
+
+    await coordinator.async_refresh()
+    assert coordinator.field_changed(a) and coordinator.field_changed(b)  # erster Payload: alles neu
+
+    await coordinator.async_refresh()
+    assert not coordinator.field_changed(a)
+    assert coordinator.field_changed(b)
+
+    await coordinator.async_refresh()
+    assert coordinator.changed_fields == frozenset()
@@ -0,0 +1,60 @@
+import importlib
+
+from custom_components.thz.decoder import THZDecoderPlan, compile_register_map
+from custom_components.thz.register_maps.register_map_manager import RegisterMapManager
+
+
+def test_plan_decodes_hex_fields_with_divisor():
+    plan = THZDecoderPlan([("outsideTemp: ", 8, 4, "hex2int", 10), ("count: ", 12, 4, "hex", 10)])
+    payload = bytes.fromhex("00fb0000ff9c0123")
+    assert plan.names == ("outsideTemp:", "count:")
+    assert plan.decode(payload) == (-10.0, 29.1)
+
+
+def test_plan_decodes_nibble_bits():
+    # Offset 4 = oberes Nibble von Byte 2, Offset 5 = unteres Nibble
+    plan = THZDecoderPlan([("high0", 4, 1, "bit0", 1), ("high1", 4, 1, "bit1", 1), ("low0", 5, 1, "bit0", 1), ("nlow0", 5, 1, "nbit0", 1)])
+    assert plan.decode(bytes.fromhex("0000 21".replace(" ", ""))) == (0, 1, 1, 0)
+
+
+def test_plan_shares_byte_extraction_between_fields():
+    plan = THZDecoderPlan([("a", 4, 1, "bit0", 1), ("b", 5, 1, "bit0", 1), ("c", 4, 2, "hex", 1)])
+    assert plan.fields == ((2, 3),)
+
+
+def test_plan_string_types():
+    plan = THZDecoderPlan([
+        ("time", 0, 4, "hex2time", 1),
+        ("date", 4, 4, "hexdate", 1),
+        ("ver", 8, 4, "swver", 1),
+        ("mode", 12, 2, "somwinmode", 1),
+        ("day", 15, 1, "weekday", 1),
+        ("esp", 16, 8, "esp_mant", 1),
+    ])
+    payload = bytes.fromhex("04b0") + bytes.fromhex("0a2d") + bytes.fromhex("0207") + bytes.fromhex("02") + bytes.fromhex("03") + bytes.fromhex("3fc00000")
+    assert plan.decode(payload) == ("12:00", "26.05", "2.07", "summer", "Thursday", 1.5)
+
+
+def test_plan_returns_none_outside_payload():
+    plan = THZDecoderPlan([("short", 0, 2, "hex", 1), ("missing", 8, 4, "hex", 1)])
+    assert plan.decode(b"\x05") == (5, None)
+
+
+def test_plan_keeps_duplicate_names_apart():
+    # pxxFC bei 439/539 enthält zweimal "/"
+    plan = THZDecoderPlan([("/", 0, 2, "hex", 1), ("/", 2, 2, "hex", 1)])
+    assert plan.decode(b"\x01\x02") == (1, 2)
+
+
+def test_all_register_maps_compile():
+    for firmware in ("206", "214"):
+        plans = compile_register_map(RegisterMapManager(firmware).get_all_registers())
+        assert plans
+        for plan in plans.values():
+            plan.decode(bytes(256))
+
+
+def test_mapping_parser_returns_values_by_name():
+    parser_cls = importlib.import_module("custom_components.thz.000_mapping_parser").MappingParser
+    parser = parser_cls([("outsideTemp: ", 8, 4, "hex2int", 10), ("/", 12, 2, "hex", 1), ("/", 14, 2, "hex", 1)])
+    assert parser.parse(bytes.fromhex("00fb0000ff9c0102")) == {"outsideTemp:": -10.0, "/": 2}
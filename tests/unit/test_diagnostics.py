@@ -0,0 +1,23 @@
+from pytest_homeassistant_custom_component.common import MockConfigEntry # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from custom_components.thz.const import DOMAIN
+from custom_components.thz.diagnostics import async_get_config_entry_diagnostics
+
+
+async def test_diagnostics_contain_latency_histograms(hass, enable_custom_integrations, socket_enabled, simulator):
+    port = await simulator.start_tcp()
+    entry = MockConfigEntry(domain=DOMAIN, data={"connection_type": "ip", "host": "127.0.0.1", "port": port, "refresh_intervals": {}})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    latency = diagnostics["latency"]
+    assert latency["stages"]["total"]["count"] > 0
+    assert latency["addresses"]["FD"]["count"] >= 1  # Firmware beim Setup
+    assert latency["addresses"]["FB"]["count"] >= 1  # erster Refresh des Coordinators
+    assert diagnostics["entry"]["data"]["host"] == "**REDACTED**"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
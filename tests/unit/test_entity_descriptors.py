@@ -0,0 +1,53 @@
+import pytest
+
+from custom_components.thz.entity_descriptors import get_parameter_descriptors, get_sensor_descriptors
+
+
+def test_descriptors_are_built_once_and_shared():
+    assert get_sensor_descriptors("206") is get_sensor_descriptors("206")
+    assert get_parameter_descriptors("206") is get_parameter_descriptors("206")
+
+
+def test_sensor_unique_suffix_matches_previous_format():
+    descriptor = get_sensor_descriptors("206")["pxxFB"][0]
+    block_bytes = b"\xfb"
+    assert descriptor.block_bytes == block_bytes
+    assert descriptor.unique_suffix == f"thz_{block_bytes}_{descriptor.offset}_{descriptor.key.lower().replace(' ', '_')}"
+
+
+def test_sensor_index_addresses_duplicate_names():
+    descriptors = [d for d in get_sensor_descriptors("439")["pxxFC"] if d.key == "/"]
+    assert len(descriptors) == 2
+    assert descriptors[0].index != descriptors[1].index
+    assert descriptors[0].unique_suffix != descriptors[1].unique_suffix
+    assert [d.index for d in get_sensor_descriptors("439")["pxxFC"]] == list(range(len(get_sensor_descriptors("439")["pxxFC"])))
+
+
+def test_descriptors_are_immutable():
+    descriptor = get_sensor_descriptors("206")["pxxFB"][0]
+    with pytest.raises(AttributeError):
+        descriptor.key = "x"
+    assert not hasattr(descriptor, "__dict__")
+
+
+def test_select_option_tables():
+    (opmode,) = [d for d in get_parameter_descriptors("206")["select"] if d.key == "pOpMode"]
+    assert opmode.command_bytes == b"\x0a\x01\x12"
+    assert opmode.option_by_value[11] == "automatic"
+    assert opmode.value_by_option["automatic"] == 11
+    assert "automatic" in opmode.options
+
+
+def test_number_limits_are_precomputed():
+    numbers = get_parameter_descriptors("206")["number"]
+    assert all(isinstance(d.step, float) or d.step == 1 for d in numbers)
+    assert all(d.min_value is None or isinstance(d.min_value, float) for d in numbers)
+
+
+def test_noisy_entities_are_disabled_by_default():
+    hc1 = {d.key: d for d in get_sensor_descriptors("214")["pxxF4"]}
+    assert hc1["x08:"].diagnostic and not hc1["x08:"].enabled_default
+    assert hc1["outsideTemp:"].enabled_default
+    parameters = [d for descriptors in get_parameter_descriptors("206").values() for d in descriptors]
+    assert not any(d.enabled_default for d in parameters if d.decode_type == "7prog")
+    assert all(d.enabled_default for d in parameters if d.decode_type != "7prog")
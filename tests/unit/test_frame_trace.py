@@ -0,0 +1,26 @@
+from custom_components.thz.frame_trace import RX, TX, THZFrameTrace, read_trace
+
+
+def test_trace_is_bounded_and_off_by_default():
+    trace = THZFrameTrace(size=3)
+    assert not trace.enabled
+    trace.start()
+    for i in range(5):
+        trace.record(TX, b"\xfb", bytes([i]))
+    assert [r.data for r in trace.records()] == [b"\x02", b"\x03", b"\x04"]
+    trace.start(size=2)
+    assert [r.data for r in trace.records()] == [b"\x03", b"\x04"]
+
+
+def test_trace_export_round_trip(tmp_path):
+    trace = THZFrameTrace()
+    trace.start()
+    trace.record(TX, b"\xfb", bytes.fromhex("0100fdfb1003"))
+    trace.record(RX, b"\xfb", bytes.fromhex("0100fdfb0102"))
+    path = tmp_path / "trace.jsonl"
+    assert trace.export(str(path), "206") == 2
+
+    header, records = read_trace(str(path))
+    assert header["firmware"] == "206"
+    records = list(records)
+    assert [(r.direction, r.addr, r.data) for r in records] == [(r.direction, r.addr, r.data) for r in trace.records()]
@@ -0,0 +1,72 @@
+from homeassistant.config_entries import ConfigEntryState # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers import entity_registry as er # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from pytest_homeassistant_custom_component.common import MockConfigEntry # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from custom_components.thz import _migrate_unique_id
+from custom_components.thz.const import DOMAIN
+from custom_components.thz.entity_descriptors import get_sensor_descriptors
+
+
+def test_migrate_unique_id_is_idempotent():
+    old = er.RegistryEntry(entity_id="sensor.outsidetemp", unique_id="thz_outsidetemp", platform=DOMAIN)
+    new = er.RegistryEntry(entity_id="sensor.outsidetemp", unique_id="abc_thz_outsidetemp", platform=DOMAIN)
+    assert _migrate_unique_id("abc", old) == {"new_unique_id": "abc_thz_outsidetemp"}
+    assert _migrate_unique_id("abc", new) is None
+
+
+async def test_unique_ids_are_migrated_once_on_setup(hass, enable_custom_integrations, socket_enabled, simulator):
+    port = await simulator.start_tcp()
+    entry = MockConfigEntry(domain=DOMAIN, data={"connection_type": "ip", "host": "127.0.0.1", "port": port, "refresh_intervals": {}})
+    entry.add_to_hass(hass)
+    suffix = get_sensor_descriptors("206")["pxxFB"][0].unique_suffix
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_or_create("sensor", DOMAIN, suffix, config_entry=entry).entity_id
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert registry.async_get(entity_id).unique_id == f"{entry.entry_id}_{suffix}"
+
+    # erneutes Laden darf das Präfix nicht noch einmal voranstellen
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert registry.async_get(entity_id).unique_id == f"{entry.entry_id}_{suffix}"
+    assert registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_{suffix}") == entity_id
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_setup_retries_when_firmware_cannot_be_read(hass, enable_custom_integrations, socket_enabled, simulator):
+    simulator.errors[b"\xfd"] = b"\x01\x04"
+    port = await simulator.start_tcp()
+    entry = MockConfigEntry(domain=DOMAIN, data={"connection_type": "ip", "host": "127.0.0.1", "port": port, "refresh_intervals": {}})
+    entry.add_to_hass(hass)
+
+    assert not await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Verbindung und I/O-Task sind wieder zu (sonst schlägt der Lingering-Task-Check fehl)
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+    assert entry.entry_id not in hass.data.get(DOMAIN, {})
+
+
+async def test_setup_removes_sensors_missing_from_register_map(hass, enable_custom_integrations, socket_enabled, simulator):
+    port = await simulator.start_tcp()
+    entry = MockConfigEntry(domain=DOMAIN, data={"connection_type": "ip", "host": "127.0.0.1", "port": port, "refresh_intervals": {}})
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    current = get_sensor_descriptors("206")["pxxFB"][0].unique_suffix
+    kept = registry.async_get_or_create("sensor", DOMAIN, current, config_entry=entry).entity_id
+    # z. B. pxxFB solarPump: in der generierten 2.06-Map nicht mehr vorhanden (noch ohne Entry-Präfix)
+    orphaned = registry.async_get_or_create("sensor", DOMAIN, "thz_b'\\xfb'_52_solarpump:", config_entry=entry).entity_id
+    bus = registry.async_get_or_create("sensor", DOMAIN, f"{entry.entry_id}_thz_bus_errors", config_entry=entry).entity_id
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert registry.async_get(orphaned) is None
+    assert registry.async_get(kept) is not None
+    assert registry.async_get(bus) is not None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,26 @@
+from custom_components.thz.metrics import THZBusMetrics, THZHistogram
+from custom_components.thz.thz_protocol import THZTimingError
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    histogram = THZHistogram()
+    for _ in range(90):
+        histogram.record(0.015)
+    for _ in range(10):
+        histogram.record(0.3)
+    assert histogram.percentile(50) == 0.02
+    assert histogram.percentile(95) == 0.3  # Bucket-Obergrenze 0.5, begrenzt auf das Maximum
+    stats = histogram.get_stats()
+    assert stats["count"] == 100
+    assert stats["max_ms"] == 300.0
+
+
+def test_bus_metrics_count_errors_and_busy_time():
+    metrics = THZBusMetrics(started=0.0)
+    metrics.record_transaction(b"\xfb", 10.0, 0.5)
+    metrics.record_transaction(b"\xfb", 20.0, 0.4, THZTimingError("Timing"))
+    metrics.record_transaction(b"\xfb", 70.0, 1.2)
+    assert metrics.errors == {"THZTimingError": 1}
+    assert metrics.addresses[b"\xfb"].count == 2
+    assert metrics.busy_per_minute(now=130.0) == [0.9, 1.2]
+    assert metrics.utilization(now=130.0) == round(2.1 / 120 * 100, 1)
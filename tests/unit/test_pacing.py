@@ -0,0 +1,27 @@
+from custom_components.thz.pacing import THZPacer
+
+
+async def test_pacer_shortens_gap_after_success_window():
+    pacer = THZPacer(initial_gap=0.1, step=0.01, success_window=5)
+    for _ in range(10):
+        pacer.record(0.05)
+    assert round(pacer.gap, 4) == 0.08
+    assert pacer.get_stats()["requests"] == 10
+
+
+async def test_pacer_backs_off_on_timing_error():
+    pacer = THZPacer(initial_gap=0.1, max_gap=0.3, success_window=5)
+    pacer.record(0.05, timing_error=True)
+    assert pacer.gap == 0.2
+    pacer.record(0.05, timing_error=True)
+    assert pacer.gap == 0.3
+    stats = pacer.get_stats()
+    assert stats["timing_errors"] == 2
+    assert stats["timing_error_rate"] > 0
+
+
+async def test_pacer_never_drops_below_min_gap():
+    pacer = THZPacer(initial_gap=0.01, min_gap=0.005, step=0.01, success_window=1)
+    for _ in range(5):
+        pacer.record(0.01)
+    assert pacer.gap == 0.005
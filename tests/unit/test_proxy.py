@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from custom_components.thz.proxy import THZProxy
+from custom_components.thz.thz_device import THZDevice
+from custom_components.thz.thz_protocol import HEADER_GET, THZUnknownRegisterError, build_telegram
+
+
+async def _device(port: int) -> THZDevice:
+    device = THZDevice(connection="ip", host="127.0.0.1", tcp_port=port, read_timeout=0.5)
+    await device.async_initialize(None)
+    device._pacer.gap = 0.0
+    return device
+
+
+@pytest.fixture
+async def proxy(simulator, socket_enabled):
+    """Proxy am Simulator (statt am seriellen Port) und zwei Clients, wie HA und FHEM."""
+    upstream = await _device(await simulator.start_tcp())
+    proxy = THZProxy(upstream)
+    port = await proxy.start("127.0.0.1", 0)
+    clients = [await _device(port), await _device(port)]
+    yield proxy, clients
+    for client in clients:
+        await client.async_close()
+    await proxy.stop()
+    await upstream.async_close()
+
+
+async def test_proxy_shares_concurrent_reads(proxy, simulator):
+    proxy, clients = proxy
+    simulator.latency = 0.05
+    simulator.requests.clear()
+
+    results = await asyncio.gather(*(client.read_block(b"\xfb", "get") for client in clients))
+
+    assert results[0] == results[1]
+    assert results[0][1:] == simulator.payloads[b"\xfb"]
+    assert simulator.requests[b"\xfb"] == 1
+    assert proxy.get_stats()["transactions"] >= 2
+
+
+async def test_proxy_forwards_writes(proxy, simulator):
+    _, (client, other) = proxy
+
+    await client.write_value(b"\x0a\x01\x12", b"\x00\x0b")
+
+    assert simulator.payloads[b"\x0a\x01\x12"] == b"\x0a\x01\x12\x00\x0b"
+    assert (await other.read_block(b"\x0a\x01\x12", "get"))[-2:] == b"\x00\x0b"
+
+
+async def test_proxy_passes_device_errors_to_client(proxy, simulator):
+    proxy, (client, _) = proxy
+    simulator.errors[b"\xf4"] = b"\x01\x04"
+
+    with pytest.raises(THZUnknownRegisterError):
+        await client.read_block(b"\xf4", "get")
+    assert proxy.get_stats()["errors"] >= 1
+
+
+async def test_proxy_stop_disconnects_clients(proxy):
+    proxy, _ = proxy
+    assert proxy.get_stats()["clients"] == 2
+
+    await proxy.stop()
+
+    assert proxy.get_stats()["clients"] == 0
+
+
+async def _raw_transaction(reader, writer, telegram: bytes) -> bytes:
+    """Eine Transaktion Byte für Byte wie ein Client, liefert das Antwort-Telegramm."""
+    writer.write(b"\x02")
+    assert await reader.readexactly(1) == b"\x10"
+    writer.write(telegram)
+    assert await reader.readexactly(2) == b"\x10\x02"
+    writer.write(b"\x10")
+    response = await reader.readuntil(b"\x10\x03")
+    writer.write(b"\x02")
+    return response
+
+
+async def test_proxy_naks_malformed_frame_and_keeps_client(proxy, simulator):
+    proxy, (client, _) = proxy
+    reader, writer = await asyncio.open_connection("127.0.0.1", client.tcp_port)  # Port des Proxys
+
+    # ungültige Escape-Sequenz 10 05 mitten im Telegramm
+    response = await _raw_transaction(reader, writer, b"\x01\x00\x10\x05\xfb\x10\x03")
+    assert response[:2] == b"\x01\x02"  # wie die Wärmepumpe: Request-CRC falsch
+
+    # dieselbe Verbindung bleibt nutzbar, ebenso die anderen Clients
+    response = await _raw_transaction(reader, writer, build_telegram(b"\xfb"))
+    assert response[:2] == HEADER_GET
+    assert (await client.read_block(b"\xfb", "get"))[1:] == simulator.payloads[b"\xfb"]
+    assert proxy.get_stats()["clients"] == 3
+
+    writer.close()
+    await writer.wait_closed()
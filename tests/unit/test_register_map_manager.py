@@ -0,0 +1,81 @@
+import pytest
+
+from custom_components.thz.register_maps import generate
+from custom_components.thz.register_maps.register_map_manager import (
+    DEFAULT_FIRMWARE,
+    RegisterMapManager,
+    RegisterMapManager_Write,
+    block_to_bytes,
+    get_register_index,
+)
+
+
+def test_index_is_built_once_per_firmware():
+    assert RegisterMapManager("206").index is RegisterMapManager("206").index
+    assert RegisterMapManager("206").index is not RegisterMapManager("214").index
+
+
+def test_index_is_normalized_and_immutable():
+    index = get_register_index("206")
+    entries = index.blocks["pxxFB"]
+    assert all(e.name == e.name.strip() for e in entries)
+    assert index.block_bytes["pxxFB"] == b"\xfb"
+    assert index.by_block_bytes[b"\xfb"] is entries
+    with pytest.raises(TypeError):
+        index.blocks["pxxFB"] = ()
+
+
+def test_name_lookup_prefers_first_block():
+    # Blöcke liegen sortiert in den Daten: outsideTemp steht in F3, F4 und FB
+    location = RegisterMapManager("206").get_register(" outsideTemp: ")
+    assert location.block == "pxxF3"
+    assert (location.offset, location.length, location.decode, location.divisor) == (8, 4, "hex2int", 10)
+
+
+def test_write_index_by_command():
+    manager = RegisterMapManager_Write("206")
+    name, entry = manager.get_by_command("0a0112")
+    assert name == "pOpMode"
+    assert entry["type"] == "select"
+
+
+def test_firmware_specific_blocks():
+    # 2.14 hat eigene Strukturen für F4/FB, 2.06 kennt den Display-Block nicht
+    assert get_register_index("214").blocks["pxxF4"] != get_register_index("206").blocks["pxxF4"]
+    assert "pxx0A0176" not in get_register_index("206").blocks
+    assert "pxx0A0176" in get_register_index("539").blocks
+    assert block_to_bytes("pxx0A") == b"\x0a"
+
+
+def test_unknown_firmware_uses_default_blocks():
+    assert RegisterMapManager("762").get_all_registers() == get_register_index(DEFAULT_FIRMWARE).blocks
+
+
+def test_generated_data_is_up_to_date():
+    for firmware, data in generate.generate().items():
+        path = generate.DATA_DIR / f"{firmware}.json"
+        assert path.read_text(encoding="utf-8") == generate.dump(data), f"{path.name}: generate.py erneut ausführen"
+
+
+def test_generator_parses_perl_tables():
+    source = """
+my %parsinghash = (
+  "F4hc1" => [["outsideTemp: ", 4, 4, "hex2int", 10],	[" x08: ", 8, 4, "hex2int", 10]  # Kommentar
+	     ],
+  "1clean" => [["", 4, 4, "hex", 1]],
+ );
+my %getsonly439 = (
+  "sHC1"		=> {cmd2=>"F4",     type =>"F4hc1",  unit =>""},
+  "sBoost"	=> {cmd2=>"0A0924", cmd3=>"0A0925",	type =>"1clean", unit =>" kWh"},
+  "sMissing"	=> {cmd2=>"F5",     type =>"F5hc2",  unit =>""},
+ );
+"""
+    parsing = generate.parse_parsinghash(source)
+    gets = {"getsonly439": generate.parse_gets(source, "getsonly439")}
+    data = generate.build_firmware(parsing, gets, "439")
+    assert data["blocks"] == {"pxxF4": [["outsideTemp:", 4, 4, "hex2int", 10], ["x08:", 8, 4, "hex2int", 10]]}
+
+
+def test_generator_rejects_invalid_entries():
+    with pytest.raises(generate.MapValidationError):
+        generate.validate_block("pxxF4", [["outsideTemp:", 4, 0, "hex2int", 10]])
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+from homeassistant.helpers import entity_registry as er # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.entity import Entity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.setup import async_setup_component # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from custom_components.thz import sensor
+from custom_components.thz.const import CONF_HEARTBEAT, DOMAIN
+from custom_components.thz.coordinator import THZBlockCoordinator
+from custom_components.thz.decoder import THZDecoderPlan
+from custom_components.thz.entity_descriptors import SensorDescriptor
+
+
+class FakeDevice:
+    def __init__(self, payloads):
+        self.payloads = list(payloads)
+        self.stale = False
+        self.register_map_manager = SimpleNamespace(index=SimpleNamespace(block_bytes={"pxxFB": b"\xfb"}))
+        self.decoder_plans = {"pxxFB": THZDecoderPlan([("a", 4, 4, "hex", 1), ("b", 8, 2, "hex", 1)])}
+
+    async def refresh_block(self, block):
+        return self.payloads.pop(0)
+
+    def block_is_stale(self, block):
+        return self.stale
+
+
+def _descriptor(heartbeat=None):
+    return SensorDescriptor("a", "pxxFB", b"\xfb", 0, 2, "pxxFB_a", None, None, None, None, False, True, heartbeat)
+
+
+async def _sensor(hass, monkeypatch, payloads, heartbeat=None):
+    """Sensor an einem Coordinator; gezählt werden die State-Schreibvorgänge."""
+    writes = []
+    monkeypatch.setattr(Entity, "async_write_ha_state", lambda self: writes.append(self.state))
+    device = FakeDevice(payloads)
+    coordinator = THZBlockCoordinator(hass, device, "pxxFB", 60)
+    coordinator.update_interval = None  # nur manuelle Refreshs
+    entity = sensor.THZGenericSensor(_descriptor(heartbeat), coordinator, device, "entry")
+    coordinator.async_add_listener(entity._handle_coordinator_update)
+    return entity, coordinator, device, writes
+
+
+async def test_sensor_writes_only_when_own_bytes_change(hass, monkeypatch):
+    payloads = ["00fb000102", "00fb000103", "00fb000203", "00fb000203"]
+    _, coordinator, _, writes = await _sensor(hass, monkeypatch, [bytes.fromhex(p) for p in payloads])
+
+    for _ in payloads:
+        await coordinator.async_refresh()
+
+    # "b" ändert sich im zweiten Payload, betrifft den Sensor "a" aber nicht
+    assert writes == [1, 2]
+
+
+async def test_sensor_writes_when_stale_changes(hass, monkeypatch):
+    _, coordinator, device, writes = await _sensor(hass, monkeypatch, [bytes.fromhex("00fb000102")] * 3)
+
+    await coordinator.async_refresh()
+    device.stale = True
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert len(writes) == 2
+
+
+async def test_sensor_heartbeat_rewrites_unchanged_state(hass, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sensor, "monotonic", lambda: now[0])
+    _, coordinator, _, writes = await _sensor(hass, monkeypatch, [bytes.fromhex("00fb000102")] * 3, heartbeat=300)
+
+    await coordinator.async_refresh()
+    now[0] += 60
+    await coordinator.async_refresh()
+    now[0] += 300
+    await coordinator.async_refresh()
+
+    assert len(writes) == 2
+
+
+async def test_set_heartbeat_service_updates_entity(hass, monkeypatch, enable_custom_integrations):
+    monkeypatch.setattr(Entity, "async_write_ha_state", lambda self: None)
+    assert await async_setup_component(hass, DOMAIN, {})
+    device = FakeDevice([])
+    coordinator = THZBlockCoordinator(hass, device, "pxxFB", 60)
+    coordinator.update_interval = None
+    entity = sensor.THZGenericSensor(_descriptor(heartbeat=600), coordinator, device, "entry")
+    registry = er.async_get(hass)
+    entity.registry_entry = registry.async_get_or_create("sensor", DOMAIN, entity.unique_id)
+    entity.hass = hass
+    entity.entity_id = entity.registry_entry.entity_id
+    await entity.async_added_to_hass()
+    assert entity._heartbeat == 600
+
+    for heartbeat, expected in ((120, 120), (0, None), (None, 600)):
+        data = {"entity_id": entity.entity_id} | ({} if heartbeat is None else {"heartbeat": heartbeat})
+        await hass.services.async_call(DOMAIN, "set_heartbeat", data, blocking=True)
+        entity.registry_entry = registry.async_get(entity.entity_id)
+        entity.async_registry_entry_updated()
+        assert registry.async_get(entity.entity_id).options.get(DOMAIN, {}).get(CONF_HEARTBEAT) == heartbeat
+        assert entity._heartbeat == expected
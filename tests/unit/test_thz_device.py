@@ -1,45 +1,243 @@
+import asyncio
+
 import pytest
+
+from custom_components.thz import const
+from custom_components.thz.circuit_breaker import THZCircuitBreaker
+from custom_components.thz.frame_trace import TX
 from custom_components.thz.thz_device import THZDevice
-from tests.conftest import FakeSerial
+from custom_components.thz.thz_protocol import THZUnknownRegisterError
+from tests.simulator import payloads_from_trace
+
 
 @pytest.fixture
-def fake_device():
-    # Simulierte Rohdaten für zwei Blöcke
-    responses = {
-        "block1": b'\x02\x03\x02\x1A\x0B\x12\x34',
-        "block2": b'\x02\x03\x02\x1C\x0C\x11\x22',
-    }
-    serial = FakeSerial(responses)
-    device = THZDevice(serial_port=None)  # port=None, Serial wird ersetzt
-    device._serial = serial  # FakeSerial einbinden
-    return device
-
-def test_read_block_cached(fake_device):
-    # Erster Aufruf liest aus FakeSerial
-    data1 = fake_device.read_block_cached(10, "block1")
-    assert data1 == b'\x02\x03\x02\x1A\x0B\x12\x34'
-
-    # Zweiter Aufruf innerhalb Cache-Zeit sollte gleichen Wert zurückgeben
-    data2 = fake_device.read_block_cached(10, "block1")
+async def device(simulator, socket_enabled):
+    """THZDevice über TCP gegen den Simulator, wie mit ser.net."""
+    port = await simulator.start_tcp()
+    device = THZDevice(connection="ip", host="127.0.0.1", tcp_port=port, read_timeout=0.2)
+    await device.async_initialize(None)
+    device._pacer.gap = 0.0
+    yield device
+    await device.async_close()
+
+
+async def test_firmware_is_read_on_initialize(device):
+    assert device.firmware_version == "206"
+    assert "pxxFB" in device.available_reading_blocks
+
+
+async def test_refresh_block_reads_and_stores_payload(device, simulator):
+    data1 = await device.refresh_block(b"\xfb")
+    assert data1[1:] == simulator.payloads[b"\xfb"]  # Payload beginnt mit dem CRC-Byte
+    assert device.cached_payloads() == {b"\xfb": data1}
+
+    data2 = await device.refresh_block(b"\xfb")
     assert data2 == data1
-    # Prüfe, dass FakeSerial nur einmal gelesen hat
-    assert fake_device._serial.read_count["block1"] == 1
+    assert simulator.requests[b"\xfb"] == 2  # jeder Poll liest vom Bus
 
-def test_read_block_with_different_blocks(fake_device):
-    data1 = fake_device.read_block_cached(10, "block1")
-    data2 = fake_device.read_block_cached(10, "block2")
+
+async def test_read_block_with_different_blocks(device, simulator):
+    data1 = await device.refresh_block(b"\xfb")
+    data2 = await device.refresh_block(b"\xf4")
     assert data1 != data2
-    assert fake_device._serial.read_count["block1"] == 1
-    assert fake_device._serial.read_count["block2"] == 1
-
-def test_parse_block_values(fake_device):
-    # Lese Block und parse Werte
-    raw = fake_device.read_block_cached(10, "block1")
-    result = fake_device.parse_block(raw, "block1")
-    assert isinstance(result, dict)
-    assert "p02RoomTempNightHC1" in result
-    assert isinstance(result["p02RoomTempNightHC1"], float)
-
-def test_error_on_missing_block(fake_device):
-    with pytest.raises(KeyError):
-        fake_device.read_block_cached(10, "nonexistent_block")
+    assert simulator.requests[b"\xfb"] == 1
+    assert simulator.requests[b"\xf4"] == 1
+
+
+async def test_parse_block_values(device):
+    raw = await device.refresh_block(b"\xfb")
+    plan = device.decoder_plans["pxxFB"]
+    result = plan.decode(raw)
+    assert len(result) == len(plan.names)
+    assert isinstance(result[plan.names.index("outsideTemp:")], float)
+
+
+async def test_error_on_missing_block(device, simulator):
+    with pytest.raises(THZUnknownRegisterError):
+        await device.refresh_block(b"\x99")
+    assert simulator.requests[b"\x99"] == 1  # nicht wiederholbar
+
+
+@pytest.mark.parametrize("fault", ["timing", "crc", "drop"])
+async def test_transient_faults_are_retried(device, simulator, fault):
+    simulator.inject(fault, addr=b"\xfb")
+    data = await device.refresh_block(b"\xfb")
+    assert data[1:] == simulator.payloads[b"\xfb"]
+    assert simulator.requests[b"\xfb"] == 2
+    assert device.get_io_stats()["retries"] == 1
+
+
+async def test_write_value_over_pty(simulator):
+    path = await simulator.start_pty()
+    device = THZDevice(connection="usb", port=path, read_timeout=0.5)
+    try:
+        await device.async_initialize(None, "206")
+        await device.write_value(b"\x0a\x01\x12", b"\x00\x0b")
+        assert await device.read_value(b"\x0a\x01\x12", "get", 4, 2) == b"\x00\x0b"
+    finally:
+        await device.async_close()
+
+
+async def test_simulator_replays_recorded_trace(device, simulator, tmp_path):
+    device.trace.start()
+    await device.refresh_block(b"\xfb")
+    path = tmp_path / "trace.jsonl"
+    device.trace.export(str(path), device.firmware_version)
+
+    assert payloads_from_trace(path) == {b"\xfb": simulator.payloads[b"\xfb"]}
+
+
+def _open_breaker(device, block):
+    """Sperrt den Block mit abgelaufener Sperrzeit: die nächste Anfrage ist die Probe."""
+    breaker = device._breakers[block] = THZCircuitBreaker(cooldown=0)
+    breaker.record_failure(THZUnknownRegisterError("Unbekannte Register Anfrage"))
+    return breaker
+
+
+async def test_probe_is_released_on_connection_error(device, monkeypatch):
+    breaker = _open_breaker(device, b"\xfb")
+
+    async def disconnected(*args, **kwargs):
+        raise ConnectionError("Verbindung verloren")
+
+    monkeypatch.setattr(device, "read_block", disconnected)
+    with pytest.raises(ConnectionError):
+        await device.refresh_block(b"\xfb")
+    assert not breaker.probing
+
+    monkeypatch.undo()
+    await device.refresh_block(b"\xfb")
+    assert breaker.state == "closed"
+
+
+async def test_probe_is_released_when_cancelled(device, monkeypatch):
+    breaker = _open_breaker(device, b"\xfb")
+    started = asyncio.Event()
+
+    async def hanging(*args, **kwargs):
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(device, "read_block", hanging)
+    caller = asyncio.ensure_future(device.refresh_block(b"\xfb"))
+    await started.wait()
+    assert breaker.probing
+    device._inflight[b"\xfb"].cancel()  # wie beim Entladen
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert not breaker.probing
+    assert breaker.allow()
+
+
+async def _busy(device, simulator, addr=b"\xfb"):
+    """Startet einen langsamen Lesevorgang; danach eingereihte Anfragen warten in der Queue."""
+    simulator.latency = 0.05
+    task = asyncio.ensure_future(device.read_block(addr, "get"))
+    await asyncio.sleep(0.01)
+    return task
+
+
+async def test_write_overtakes_queued_polls(device, simulator):
+    device.trace.start()
+    busy = await _busy(device, simulator)
+    polls = [asyncio.ensure_future(device.read_block(addr, "get")) for addr in (b"\xf4", b"\xf3")]
+    write = asyncio.ensure_future(device.write_value(b"\x0a\x01\x12", b"\x00\x0b"))
+
+    await asyncio.gather(busy, write, *polls)
+
+    sent = [record.addr for record in device.trace.records() if record.direction == TX]
+    assert sent == [b"\xfb", b"\x0a\x01\x12", b"\xf4", b"\xf3"]
+
+
+async def test_queued_reads_of_same_block_are_merged(device, simulator):
+    busy = await _busy(device, simulator)
+    results = await asyncio.gather(device.read_block(b"\xf4", "get"), device.read_block(b"\xf4", "get"), busy)
+
+    assert results[0] == results[1]
+    assert simulator.requests[b"\xf4"] == 1
+    assert device.get_io_stats()["merged"] == 1
+
+
+async def test_merged_waiter_cancelled_or_errored(device, simulator):
+    busy = await _busy(device, simulator)
+    first = asyncio.ensure_future(device.read_block(b"\xf4", "get"))
+    second = asyncio.ensure_future(device.read_block(b"\xf4", "get"))
+    await asyncio.sleep(0)
+    first.cancel()
+    # ein abgebrochener Aufrufer bricht die geteilte Anfrage nicht ab
+    assert (await second)[1:] == simulator.payloads[b"\xf4"]
+    assert first.cancelled()
+
+    simulator.errors[b"\xf5"] = b"\x01\x04"
+    await busy
+    busy = await _busy(device, simulator)
+    waiters = [device.read_block(b"\xf5", "get") for _ in range(2)]
+    results = await asyncio.gather(*waiters, busy, return_exceptions=True)
+    assert all(isinstance(result, THZUnknownRegisterError) for result in results[:2])
+    assert simulator.requests[b"\xf5"] == 1
+
+
+@pytest.mark.parametrize("error", [None, b"\x01\x04"], ids=["payload", "device_error"])
+async def test_concurrent_refreshes_share_one_read(device, simulator, monkeypatch, error):
+    if error is not None:
+        simulator.errors[b"\xfb"] = error
+    calls = []
+    read_block = device.read_block
+
+    async def counted(*args, **kwargs):
+        calls.append(args)
+        return await read_block(*args, **kwargs)
+
+    monkeypatch.setattr(device, "read_block", counted)
+    results = await asyncio.gather(*(device.refresh_block(b"\xfb") for _ in range(5)), return_exceptions=True)
+
+    assert len(calls) == 1
+    if error is None:
+        assert all(result == results[0] for result in results)
+    else:
+        assert all(isinstance(result, THZUnknownRegisterError) for result in results)
+        assert len({id(result) for result in results}) == 1  # dieselbe Exception
+    assert device.get_cache_stats()["coalesced"] == 4
+    assert device.get_cache_stats()["inflight"] == 0
+
+
+async def test_block_ttl_and_stale_limit(device, simulator):
+    device.set_refresh_intervals({"pxxFB": 10})
+    assert device.block_ttl(b"\xfb") == 10
+    assert device.block_is_stale(b"\xfb")  # noch nie gelesen
+
+    payload = await device.refresh_block(b"\xfb")
+    assert not device.block_is_stale(b"\xfb")
+
+    # älter als TTL * STALE_HARD_LIMIT_FACTOR
+    timestamp, _ = device._cache[b"\xfb"]
+    device._cache[b"\xfb"] = (timestamp - 10 * const.STALE_HARD_LIMIT_FACTOR - 1, payload)
+    assert device.block_is_stale(b"\xfb")
+
+    # ein fehlgeschlagenes Nachlesen behält den letzten Wert und bleibt veraltet
+    simulator.errors[b"\xfb"] = b"\x01\x04"
+    with pytest.raises(THZUnknownRegisterError):
+        await device.refresh_block(b"\xfb")
+    assert device.cached_payloads()[b"\xfb"] == payload
+    assert device.block_is_stale(b"\xfb")
+
+
+async def test_seeded_block_is_stale_until_read(device):
+    device.seed_block(b"\xf4", b"\x00\xf4\x01")
+    assert device.cached_payloads()[b"\xf4"] == b"\x00\xf4\x01"
+    assert device.block_is_stale(b"\xf4")
+
+    await device.refresh_block(b"\xf4")
+    assert not device.block_is_stale(b"\xf4")
+
+
+async def test_transactions_fill_latency_histograms(device):
+    await device.read_block(b"\xfb", "get")
+
+    stats = device.get_latency_stats()
+    assert {stage: s["count"] for stage, s in stats["stages"].items()} == {"greeting": 2, "telegram": 2, "data": 2, "total": 2}
+    assert stats["addresses"]["FB"]["count"] == 1  # plus FD (Firmware) aus async_initialize
+    assert stats["addresses"]["FB"]["max_ms"] > 0
+    # Start- und Transaktionszeitpunkte von derselben Uhr: Anteil der laufenden Minute
+    assert 0 < stats["utilization"] <= 100
+    assert stats["busy_per_minute"] == []
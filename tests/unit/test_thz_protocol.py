@@ -0,0 +1,60 @@
+import pytest
+from custom_components.thz.thz_protocol import THZFrameParser, THZFrameError, build_telegram, checksum, unescape
+
+
+def _checksum(data: bytes) -> int:
+    return sum(b for i, b in enumerate(data) if i != 2) % 256
+
+
+def test_frame_parser_unescapes_in_one_pass():
+    raw = b'\x01\x00\x5a\x0a\x01\x76\x10\x10\x2b\x18\x00\x10\x03'
+    parser = THZFrameParser()
+    assert parser.feed(raw) == len(raw)
+    assert parser.complete
+    assert bytes(parser.frame) == unescape(raw[:-2])
+    assert parser.checksum == _checksum(bytes(parser.frame))
+
+
+def test_frame_parser_handles_split_escape_sequences():
+    raw = b'\x01\x00\x00\xfb\x10\x10\x2b\x18\x01\x10\x03'
+    parser = THZFrameParser()
+    for i in range(len(raw)):
+        assert not parser.complete
+        parser.feed(raw[i:i + 1])
+    assert parser.complete
+    assert bytes(parser.frame) == b'\x01\x00\x00\xfb\x10\x2b\x01'
+
+
+def test_frame_parser_stops_at_end_of_frame():
+    parser = THZFrameParser()
+    used = parser.feed(b'\x01\x01\x02\x10\x03\x02\x10')
+    assert parser.complete
+    assert used == 5
+    assert bytes(parser.frame) == b'\x01\x01\x02'
+
+
+def test_frame_parser_escaped_dle_is_not_a_terminator():
+    parser = THZFrameParser()
+    parser.feed(b'\x01\x00\x00\x10\x10\x03')
+    assert not parser.complete
+
+
+def test_frame_parser_rejects_invalid_escape():
+    parser = THZFrameParser()
+    with pytest.raises(THZFrameError):
+        parser.feed(b'\x01\x00\x00\x10\x05')
+
+
+def test_build_telegram_escapes_checksum_and_address():
+    telegram = build_telegram(b'\x0a\x01\x10')
+    assert telegram.startswith(b'\x01\x00') and telegram.endswith(b'\x10\x03')
+    parser = THZFrameParser()
+    parser.feed(telegram)
+    assert parser.complete
+    assert bytes(parser.frame[3:]) == b'\x0a\x01\x10'
+    assert parser.frame[2] == parser.checksum
+
+
+def test_checksum_skips_crc_byte():
+    data = b'\x01\x00\xff\xfb'
+    assert checksum(data) == _checksum(data)
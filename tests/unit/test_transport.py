@@ -0,0 +1,130 @@
+import asyncio
+import socket
+
+import pytest
+
+from custom_components.thz import transport as thz_transport
+from custom_components.thz.thz_device import THZDevice
+from custom_components.thz.thz_protocol import THZHandshakeError, build_telegram
+from custom_components.thz.transport import THZTcpTransport
+
+
+@pytest.fixture
+async def device(simulator, socket_enabled):
+    """THZDevice über TCP gegen den Simulator, mit kurzem Backoff."""
+    port = await simulator.start_tcp()
+    device = THZDevice(connection="ip", host="127.0.0.1", tcp_port=port, read_timeout=0.2)
+    await device.async_initialize(None)
+    device._pacer.gap = 0.0
+    device.ser.backoff_min = 0.01
+    yield device
+    await device.async_close()
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+def _closed_port() -> int:
+    """Port, auf dem niemand lauscht (Verbindungsversuche werden abgewiesen)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def test_socket_has_nodelay_and_keepalive(device):
+    sock = device.ser._protocol.transport.get_extra_info("socket")
+
+    assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE) == THZTcpTransport.KEEPALIVE_IDLE
+
+
+async def test_reconnects_after_connection_drop(device, simulator):
+    assert device.ser.link_state == "connected"
+    await device.read_block(b"\xfb", "get")
+
+    simulator.disconnect()
+    await _wait_for(lambda: device.ser.get_link_stats()["connects"] == 2)
+
+    stats = device.ser.get_link_stats()
+    assert stats["state"] == "connected"
+    assert stats["disconnects"] == 1
+    assert stats["reconnect_attempts"] >= 1
+    assert stats["connected_since"] is not None
+    assert stats["next_attempt_in"] is None
+    assert (await device.read_block(b"\xfb", "get"))[1:] == simulator.payloads[b"\xfb"]
+
+
+async def test_backoff_grows_up_to_backoff_max(simulator, socket_enabled, monkeypatch):
+    transport = THZTcpTransport("127.0.0.1", await simulator.start_tcp(), read_timeout=0.2)
+    transport.backoff_min, transport.backoff_max = 1.0, 8.0
+    await transport.async_open()
+
+    # ohne Jitter und ohne echtes Warten: nur die Wartezeiten des Reconnect-Tasks mitschreiben
+    delays = []
+    enough = asyncio.Event()
+    sleep = asyncio.sleep
+
+    async def record_sleep(delay, *args, **kwargs):
+        if asyncio.current_task().get_name() == "THZ reconnect":
+            delays.append(delay)
+            if len(delays) == 6:
+                enough.set()
+            delay = 0
+        return await sleep(delay, *args, **kwargs)
+
+    monkeypatch.setattr(thz_transport.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+
+    transport.port = _closed_port()  # Gateway ist weg
+    simulator.disconnect()
+    async with asyncio.timeout(2):
+        await enough.wait()
+
+    stats = transport.get_link_stats()
+    assert delays[:6] == [1.0, 2.0, 4.0, 8.0, 8.0, 8.0]
+    assert stats["state"] == "reconnecting"
+    assert stats["disconnects"] == 1
+    assert stats["reconnect_attempts"] >= 5
+    assert stats["last_error"]
+    assert stats["connected_since"] is None
+
+    await transport.async_close()
+    assert transport.link_state == "disconnected"
+
+
+async def test_silent_timeouts_abort_half_open_connection(device, simulator):
+    simulator.silent = True
+
+    for _ in range(device.ser.HALF_OPEN_TIMEOUTS):
+        assert device.ser.link_state == "connected"
+        with pytest.raises(THZHandshakeError):
+            await device.send_request(build_telegram(b"\xfb"))
+
+    assert device.ser.get_link_stats()["half_open_detected"] == 1
+    assert device.ser.link_state != "connected"
+
+    simulator.silent = False
+    await _wait_for(lambda: device.ser.connected)
+    assert device.ser.get_link_stats()["disconnects"] == 1
+    assert (await device.read_block(b"\xfb", "get"))[1:] == simulator.payloads[b"\xfb"]
+
+
+async def test_answered_request_resets_silent_timeouts(device, simulator):
+    simulator.silent = True
+    for _ in range(device.ser.HALF_OPEN_TIMEOUTS - 1):
+        with pytest.raises(THZHandshakeError):
+            await device.send_request(build_telegram(b"\xfb"))
+    simulator.silent = False
+    await device.read_block(b"\xfb", "get")
+
+    simulator.silent = True
+    with pytest.raises(THZHandshakeError):
+        await device.send_request(build_telegram(b"\xfb"))
+
+    assert device.ser.get_link_stats()["half_open_detected"] == 0
+    assert device.ser.link_state == "connected"
@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from custom_components.thz.const import DOMAIN
+from custom_components.thz.coordinator import THZBlockCoordinator, THZParameterCoordinator
+from custom_components.thz.decoder import THZDecoderPlan
+from custom_components.thz.warm_start import THZWarmStartCache
+
+
+class FakeDevice:
+    firmware_version = "206"
+
+    def __init__(self):
+        self.register_map_manager = SimpleNamespace(index=SimpleNamespace(block_bytes={"pxxFB": b"\xfb"}))
+        self.decoder_plans = {"pxxFB": THZDecoderPlan([("a", 4, 4, "hex", 1), ("b", 8, 2, "hex", 1)])}
+        self.cache = {}
+
+    def seed_block(self, block, payload):
+        self.cache.setdefault(block, payload)
+
+    def cached_payloads(self):
+        return dict(self.cache)
+
+
+async def test_warm_start_round_trip(hass):
+    device = FakeDevice()
+    device.cache[b"\xfb"] = bytes.fromhex("00fb000102")
+    parameter_coordinator = THZParameterCoordinator(hass, device, ["0a0112"], 600)
+    parameter_coordinator.data = {"0a0112": bytes.fromhex("000b")}
+    cache = THZWarmStartCache(hass, "entry")
+    cache.restore(device, {}, parameter_coordinator)
+    await cache.async_save()
+
+    restored_device = FakeDevice()
+    coordinator = THZBlockCoordinator(hass, restored_device, "pxxFB", 60)
+    parameters = THZParameterCoordinator(hass, restored_device, ["0a0112"], 600)
+    cache = THZWarmStartCache(hass, "entry")
+    await cache.async_load()
+
+    assert cache.firmware_version == "206"
+    assert cache.restore(restored_device, {"pxxFB": coordinator}, parameters) == [coordinator]
+    assert restored_device.cache == {b"\xfb": bytes.fromhex("00fb000102")}
+    assert coordinator.data == (1, 2)
+    assert parameters.data == {"0a0112": bytes.fromhex("000b")}
+
+
+async def test_firmware_change_reloads_once_with_new_map(hass, hass_storage, enable_custom_integrations, socket_enabled, simulator):
+    port = await simulator.start_tcp()  # meldet Firmware 206
+    entry = MockConfigEntry(domain=DOMAIN, data={"connection_type": "ip", "host": "127.0.0.1", "port": port, "refresh_intervals": {}})
+    entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+        "version": 1, "minor_version": 1, "key": f"{DOMAIN}.{entry.entry_id}",
+        "data": {"firmware": "439", "blocks": {}, "parameters": {}},
+    }
+    setups = []
+    original = THZWarmStartCache.restore
+
+    def record_restore(self, device, *args):
+        setups.append(device.firmware_version)
+        return original(self, device, *args)
+
+    THZWarmStartCache.restore = record_restore
+    try:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        for _ in range(100):
+            if len(setups) >= 2 and hass.data[DOMAIN].get(entry.entry_id):
+                break
+            await asyncio.sleep(0.05)
+        await hass.async_block_till_done()
+        await asyncio.sleep(0.3)  # Firmware-Prüfung nach dem Neuladen
+    finally:
+        THZWarmStartCache.restore = original
+
+    assert setups == ["439", "206"]
+    assert hass.data[DOMAIN][entry.entry_id]["device"].firmware_version == "206"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]["firmware"] == "206"
@@ -1,14 +1,73 @@
-import serial # pyright: ignore[reportMissingModuleSource]
-import socket 
 import time
 import asyncio
+import itertools
+from functools import lru_cache
+from types import MappingProxyType
 import logging
 from . import const
-from .register_maps.register_map_manager import RegisterMapManager, RegisterMapManager_Write
+from .thz_protocol import (
+    DEVICE_ERRORS,
+    THZFrameError,
+    THZFrameParser,
+    THZHandshakeError,
+    THZRequestCrcError,
+    THZResponseCrcError,
+    THZTimingError,
+    THZUnknownResponseError,
+    build_telegram,
+    checksum,
+    escape,
+    unescape,
+)
+from .frame_trace import ERROR, RX, TX, THZFrameTrace
+from .metrics import THZBusMetrics
+from .circuit_breaker import THZCircuitBreaker, THZCircuitOpenError
+from .pacing import THZPacer
+from .transport import THZSerialTransport, THZTcpTransport, THZTransport
+from .register_maps.register_map_manager import RegisterMapManager, RegisterMapManager_Write, block_to_bytes
+from .decoder import THZDecoderPlan, compile_register_map
 from homeassistant.core import HomeAssistant # pyright: ignore[reportMissingImports, reportMissingModuleSource]
 
 _LOGGER = logging.getLogger(__name__)
 
+# Wiederholungen je Fehlerklasse: (Anzahl Wiederholungen, Pause in Sekunden).
+# Nicht aufgeführte bzw. nicht wiederholbare Fehler (unbekanntes Register/Kommando) werden nicht wiederholt.
+_RETRY_POLICY = {
+    THZTimingError: (3, 0.05),
+    THZRequestCrcError: (2, 0.0),
+    THZResponseCrcError: (2, 0.0),
+    THZFrameError: (2, 0.0),
+    THZHandshakeError: (1, 0.1),
+}
+
+
+class _THZRequest:
+    """Eine Bus-Transaktion in der Warteschlange des I/O-Tasks."""
+
+    __slots__ = ("addr_bytes", "get_or_set", "payload", "priority", "future", "enqueued", "started")
+
+    def __init__(self, addr_bytes: bytes, get_or_set: str, payload: bytes, priority: int, future: asyncio.Future, enqueued: float):
+        self.addr_bytes = addr_bytes
+        self.get_or_set = get_or_set
+        self.payload = payload
+        self.priority = priority
+        self.future = future
+        self.enqueued = enqueued
+        self.started = False
+
+
+@lru_cache(maxsize=None)
+def _firmware_tables(firmware_version: str) -> tuple[MappingProxyType, MappingProxyType]:
+    """Vorab gebaute "get"-Telegramme und Decoder-Pläne, einmal je Firmware und Prozess."""
+    registers = RegisterMapManager(firmware_version)
+    writes = RegisterMapManager_Write(firmware_version)
+    addresses = {b'\xFD'}
+    addresses.update(registers.index.block_bytes.values())
+    addresses.update(bytes.fromhex(entry["command"]) for entry in writes.get_all_registers().values())
+    telegrams = MappingProxyType({addr: build_telegram(addr) for addr in addresses})
+    return telegrams, MappingProxyType(compile_register_map(registers.get_all_registers()))
+
+
 class THZDevice:
     """Repräsentiert die Verbindung zur THZ-Wärmepumpe."""
 
@@ -31,296 +90,436 @@ class THZDevice:
         self._initialzed = False
 
         # Platzhalter
-        self.ser = None
+        self.ser: THZTransport | None = None
         self._firmware_version: str | None = None
         self.register_map_manager: RegisterMapManager = None
         self.write_register_map_manager: RegisterMapManager_Write = None
         self._cache = {}
-        self._cache_duration = 60
-
-        # Thread-Lock für parallele Zugriffe
-        self.lock = asyncio.Lock()
-        self._last_access = 0
-        self._min_interval = 0.1  # minimale Zeit zwischen zwei Reads in Sekunden
+        self._cache_duration = const.DEFAULT_UPDATE_INTERVAL
+        self._block_ttl: dict[bytes, float] = {}
+        self._inflight: dict[bytes, asyncio.Task] = {}
+        self._cache_stats = {"reads": 0, "coalesced": 0}
+        self._telegrams: MappingProxyType[bytes, bytes] = MappingProxyType({})
+        self.decoder_plans: MappingProxyType[str, THZDecoderPlan] = MappingProxyType({})
+
+        # Ein einziger Task besitzt die Verbindung und arbeitet die Warteschlange ab
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._queued_reads: dict[bytes, _THZRequest] = {}
+        self._seq = itertools.count()
+        self._worker: asyncio.Task | None = None
+        self._io_stats = {"requests": 0, "merged": 0, "max_queue_depth": 0}
+        self._wait_stats = {prio: [0, 0.0, 0.0] for prio in const.PRIORITY_NAMES}  # [Anzahl, Summe, Maximum]
+        # Pause zwischen zwei Anfragen, passt sich an Antwortzeit und Timing-Fehler des Geräts an
+        self._pacer = THZPacer(initial_gap=0.1)
+        self._breakers: dict[bytes, THZCircuitBreaker] = {}
+        self._retry_stats = {"retries": 0, "gave_up": 0}
+        # Phasen, Latenz je Adresse, Fehlerklassen und Busbelegung jeder Transaktion
+        # (angelegt in async_initialize: alle Zeitpunkte kommen von der Uhr der Event-Loop)
+        self._metrics: THZBusMetrics | None = None
+        # Roh-Telegramme, nur bei Bedarf eingeschaltet (Service thz.trace)
+        self.trace = THZFrameTrace()
 
             # ---------------------------------------------------------------------
 
-    async def async_initialize(self, hass: HomeAssistant) -> None:
-        """Öffnet Verbindung und initialisiert Firmware-abhängige Datenstrukturen."""
+    async def async_initialize(self, hass: HomeAssistant, firmware_version: str | None = None) -> None:
+        """Öffnet Verbindung und initialisiert Firmware-abhängige Datenstrukturen.
+
+        Ist ``firmware_version`` bekannt (Warmstart), wird sie nicht erneut gelesen.
+        """
         _LOGGER.debug("Initialisiere THZ-Device (%s)", self.connection)
 
         # Verbindung öffnen
         if self.connection == "usb":
-            self._connect_serial()
+            self.ser = THZSerialTransport(self.port, self.baudrate, self.read_timeout)
         elif self.connection == "ip":
-            self._connect_tcp()
-            pass
+            self.ser = THZTcpTransport(self.host, self.tcp_port, self.read_timeout)
         else:
             raise ValueError(f"Unbekannter Verbindungstyp: {self.connection}")
-
-        # Firmware lesen (läuft synchron im Executor)
-        self._firmware_version = await hass.async_add_executor_job(self.read_firmware_version)
-        _LOGGER.info("Firmware-Version erkannt: %s", self._firmware_version)
-
-        # Firmware-spezifische Register-Maps laden
+        await self.ser.async_open()
+        loop = asyncio.get_running_loop()
+        self._metrics = THZBusMetrics(loop.time())
+        self._worker = loop.create_task(self._io_worker(), name=f"THZ I/O ({self.connection})")
+
+        # Firmware lesen
+        if firmware_version is None:
+            firmware_version = await self.read_firmware_version()
+            _LOGGER.info("Firmware-Version erkannt: %s", firmware_version)
+        self._firmware_version = firmware_version
+
+        # Firmware-spezifische Register-Maps laden (Dateizugriff beim ersten Mal im Executor)
+        if hass is not None:
+            await hass.async_add_executor_job(_firmware_tables, self._firmware_version)
         self.register_map_manager = RegisterMapManager(self._firmware_version)
         self.write_register_map_manager = RegisterMapManager_Write(self._firmware_version)
+        self._telegrams, self.decoder_plans = _firmware_tables(self._firmware_version)
 
-        self._cache = {}  # { block_name: (timestamp, payload) }
-        self._cache_duration = 60  # seconds
+        self._cache = {}  # { block_bytes: (timestamp, payload) }
 
         self._initialzed = True
 
-    def _connect_serial(self):
-        """Öffnet die USB/Serielle Verbindung."""
-        _LOGGER.debug(f"Öffne serielle Verbindung: {self.port} @ {self.baudrate} baud")
-        self.ser = serial.Serial(
-            self.port,
-            baudrate=self.baudrate,
-            timeout=self.read_timeout,
-        )
-
-    def _connect_tcp(self):
-        """Verbindet sich mit ser.net (TCP/IP)."""
-        _LOGGER.debug(f"Öffne TCP-Verbindung: {self.host}:{self.tcp_port}")
-        self.ser = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.ser.settimeout(self.read_timeout)
-        self.ser.connect((self.host, self.tcp_port))
-
-    def read_block_cached(self, block: str, cache_duration: float = 60) -> bytes:
-        now = time.time()
-        if block in self._cache:
-            ts, data = self._cache[block]
-            if now - ts < cache_duration:
-                return data
-
-        data = self.read_block(block, "get")
-        self._cache[block] = (now, data)
+    def set_refresh_intervals(self, refresh_intervals: dict[str, int]) -> None:
+        """Übernimmt die im Config-Flow gewählten Intervalle je Block ("pxxFB": 30) für block_is_stale."""
+        self._block_ttl = {
+            block_to_bytes(block): float(interval)
+            for block, interval in refresh_intervals.items()
+        }
+
+    def block_ttl(self, block: bytes) -> float:
+        return self._block_ttl.get(block, self._cache_duration)
+
+    def block_is_stale(self, block: bytes) -> bool:
+        """True, wenn der letzte Wert älter als das harte Limit (TTL * STALE_HARD_LIMIT_FACTOR) ist."""
+        cached = self._cache.get(block)
+        if cached is None:
+            return True
+        return time.monotonic() - cached[0] > self.block_ttl(block) * const.STALE_HARD_LIMIT_FACTOR
+
+    def seed_block(self, block: bytes, payload: bytes) -> None:
+        """Übernimmt einen gespeicherten Payload (Warmstart); er gilt bis zum ersten Lesen als veraltet."""
+        if block not in self._cache:
+            age = self.block_ttl(block) * const.STALE_HARD_LIMIT_FACTOR + 1
+            self._cache[block] = (time.monotonic() - age, payload)
+
+    def cached_payloads(self) -> dict[bytes, bytes]:
+        """Letzter Payload je Block (für den Warmstart-Speicher)."""
+        return {block: payload for block, (_, payload) in self._cache.items()}
+
+    async def refresh_block(self, block: bytes) -> bytes:
+        """Liest den Block neu; gleichzeitige Aufrufer für denselben Block teilen sich einen Lesevorgang."""
+        task = self._inflight.get(block)
+        if task is not None:
+            self._cache_stats["coalesced"] += 1
+        else:
+            self._cache_stats["reads"] += 1
+            task = self._start_fetch(block)
+        return await asyncio.shield(task)
+
+    def _start_fetch(self, block: bytes) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._fetch_block(block))
+        self._inflight[block] = task
+        task.add_done_callback(lambda _t, b=block: self._inflight.pop(b, None))
+        # Fehler auch dann abholen, wenn alle Wartenden abgebrochen wurden (z. B. beim Entladen)
+        task.add_done_callback(self._log_background_error)
+        return task
+
+    @staticmethod
+    def _log_background_error(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.debug("Hintergrund-Aktualisierung fehlgeschlagen: %s", task.exception())
+
+    async def _fetch_block(self, block: bytes) -> bytes:
+        breaker = self._breakers.get(block)
+        if breaker is None:
+            breaker = self._breakers[block] = THZCircuitBreaker()
+        if not breaker.allow():
+            raise THZCircuitOpenError(f"Block {block.hex()} gesperrt nach wiederholten Fehlern ({breaker.last_error})")
+        try:
+            data = await self.read_block(block, "get")
+        except (THZCircuitOpenError, THZHandshakeError, ConnectionError):
+            # Verbindungsprobleme betreffen alle Blöcke und sperren keinen einzelnen
+            raise
+        except Exception as err:
+            was_open = breaker.opened_at is not None
+            breaker.record_failure(err)
+            if not was_open and breaker.opened_at is not None:
+                _LOGGER.warning("Block %s wird für %ds nicht mehr abgefragt: %s", block.hex(), breaker.cooldown, breaker.last_error)
+            raise
+        finally:
+            # Verbindungsfehler und Abbruch (CancelledError) werten die Probe nicht; ohne
+            # Freigabe bliebe der Block bis zum Neuladen gesperrt
+            breaker.release_probe()
+        if breaker.opened_at is not None:
+            _LOGGER.info("Block %s antwortet wieder", block.hex())
+        breaker.record_success()
+        self._cache[block] = (time.monotonic(), data)
         return data
 
-    def send_request(self, telegram: bytes) -> bytes:
-        """Sende Anfrage über USB oder TCP, empfange Antwort."""
-        is_socket = hasattr(self.ser, "recv")  # TCP Socket
+    def get_link_stats(self) -> dict:
+        """Verbindungszustand des Transports (connected/reconnecting/disconnected) und Zähler."""
+        if self.ser is None:
+            return {"state": "disconnected"}
+        return self.ser.get_link_stats()
+
+    def get_breaker_stats(self) -> dict:
+        """Zustand der Circuit Breaker je Block ("FB": {"state": "closed", ...})."""
+        return {block.hex().upper(): breaker.get_stats() for block, breaker in self._breakers.items()}
+
+    def get_cache_stats(self) -> dict:
+        """Lesevorgänge und zusammengelegte Aufrufe von refresh_block, gespeicherte Blöcke."""
+        return {**self._cache_stats, "inflight": len(self._inflight), "blocks": len(self._cache)}
+
+    def _enqueue(self, addr_bytes: bytes, get_or_set: str, payload: bytes, priority: int) -> asyncio.Future:
+        """Reiht eine Anfrage ein; identische, noch wartende Lese-Anfragen werden zusammengelegt."""
+        loop = asyncio.get_running_loop()
+        key = addr_bytes if get_or_set == "get" and not payload else None
+        if key is not None:
+            queued = self._queued_reads.get(key)
+            if queued is not None:
+                self._io_stats["merged"] += 1
+                if priority < queued.priority:
+                    # erneut mit höherer Priorität einreihen, der alte Eintrag wird übersprungen
+                    queued.priority = priority
+                    self._queue.put_nowait((priority, next(self._seq), queued))
+                return queued.future
+
+        request = _THZRequest(addr_bytes, get_or_set, payload, priority, loop.create_future(), loop.time())
+        if key is not None:
+            self._queued_reads[key] = request
+        self._queue.put_nowait((priority, next(self._seq), request))
+        self._io_stats["requests"] += 1
+        self._io_stats["max_queue_depth"] = max(self._io_stats["max_queue_depth"], self._queue.qsize())
+        return request.future
+
+    async def _submit(self, addr_bytes: bytes, get_or_set: str = "get", payload: bytes = b"", priority: int = const.PRIORITY_POLL) -> bytes:
+        """Übergibt eine Anfrage an den I/O-Task und wartet auf die Antwort."""
+        if self._worker is None or self._worker.done():
+            raise ConnectionError("I/O-Task der Wärmepumpe läuft nicht")
+        future = self._enqueue(addr_bytes, get_or_set, payload, priority)
+        # shield: ein abgebrochener Aufrufer darf die geteilte Anfrage nicht abbrechen
+        return await asyncio.shield(future)
+
+    async def _io_worker(self) -> None:
+        """Einziger Besitzer der Verbindung: arbeitet Anfragen nach Priorität ab."""
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, request = await self._queue.get()
+            if request.started:
+                continue
+            request.started = True
+            if self._queued_reads.get(request.addr_bytes) is request:
+                del self._queued_reads[request.addr_bytes]
+
+            wait = loop.time() - request.enqueued
+            stats = self._wait_stats[request.priority]
+            stats[0] += 1
+            stats[1] += wait
+            stats[2] = max(stats[2], wait)
+
+            try:
+                result = await self._execute(request)
+            except asyncio.CancelledError:
+                request.future.cancel()
+                raise
+            except Exception as err:
+                if not request.future.done():
+                    request.future.set_exception(err)
+            else:
+                if not request.future.done():
+                    request.future.set_result(result)
+
+    async def _execute(self, request: _THZRequest) -> bytes:
+        """Führt eine Anfrage aus und wiederholt sie je nach Fehlerklasse (_RETRY_POLICY)."""
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            if self.ser is None or not self.ser.connected:
+                # Fail fast: während des Reconnects nicht erst die Pause abwarten
+                raise ConnectionError(f"Keine Verbindung zur Wärmepumpe ({self.get_link_stats()['state']})")
+            await self._pacer.wait()
+            started = loop.time()
+            try:
+                result = await self.read_write_register(request.addr_bytes, request.get_or_set, request.payload)
+            except Exception as err:
+                elapsed = loop.time() - started
+                self._metrics.record_transaction(request.addr_bytes, started, elapsed, err)
+                if self.trace.enabled:
+                    self.trace.record(ERROR, request.addr_bytes, type(err).__name__.encode())
+                self._pacer.record(elapsed, timing_error=isinstance(err, THZTimingError))
+                retries, delay = self._retry_policy(err)
+                if attempt >= retries:
+                    if retries:
+                        self._retry_stats["gave_up"] += 1
+                    raise
+                attempt += 1
+                self._retry_stats["retries"] += 1
+                _LOGGER.debug("Wiederhole %s (Versuch %d/%d): %s", request.addr_bytes.hex(), attempt, retries, err)
+                if self.ser is not None:
+                    self.ser.reset_input_buffer()
+                if delay:
+                    await asyncio.sleep(delay)
+                continue
+            elapsed = loop.time() - started
+            self._metrics.record_transaction(request.addr_bytes, started, elapsed)
+            self._pacer.record(elapsed)
+            return result
+
+    @staticmethod
+    def _retry_policy(err: Exception) -> tuple[int, float]:
+        if not getattr(err, "retryable", False):
+            return 0, 0.0
+        for cls in type(err).__mro__:
+            policy = _RETRY_POLICY.get(cls)
+            if policy is not None:
+                return policy
+        return 0, 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def get_io_stats(self) -> dict:
+        """Kennzahlen zur Bus-Auslastung: Warteschlangentiefe und Wartezeiten je Priorität."""
+        return {
+            **self._io_stats,
+            "queue_depth": self._queue.qsize(),
+            "wait_time": {
+                const.PRIORITY_NAMES[prio]: {
+                    "count": count,
+                    "avg": total / count if count else 0.0,
+                    "max": maximum,
+                }
+                for prio, (count, total, maximum) in self._wait_stats.items()
+            },
+            "pacing": self._pacer.get_stats(),
+            **self._retry_stats,
+        }
+
+    def get_latency_stats(self) -> dict:
+        """Zeiten je Phase und Adresse (ms, Perzentile), Fehler je Klasse, Timeouts und Busbelegung."""
+        return self._metrics.get_stats(asyncio.get_running_loop().time())
+
+    @property
+    def metrics(self) -> THZBusMetrics:
+        return self._metrics
+
+    async def send_request(self, telegram: bytes) -> THZFrameParser:
+        """Sende Anfrage über USB oder TCP, empfange Antwort als geparstes Telegramm."""
         timeout = self.read_timeout
-        data = bytearray()
+        # Handshake-Bytes kommen sofort: nicht das volle read_timeout abwarten
+        turnaround = self._pacer.turnaround
+        handshake_timeout = min(timeout, max(const.HANDSHAKE_TIMEOUT_MIN, 3 * turnaround)) if turnaround else timeout
+        metrics = self._metrics
+        clock = asyncio.get_running_loop().time
+        started = stage_start = clock()
 
         # 1. Greeting senden (0x02)
-        self._write_bytes(const.STARTOFTEXT)
+        self.ser.write(const.STARTOFTEXT)
         # _LOGGER.info("Greeting gesendet (0x02)")
 
         # 2. 0x10 Antwort erwarten
-        response = self._read_exact(1, timeout)
+        response = await self.ser.read_exact(1, handshake_timeout)
+        self.ser.note_response(bool(response))
         if response != const.DATALINKESCAPE:
-            raise ValueError(f"Handshake 1 fehlgeschlagen, erhalten: {response.hex()}")
+            if not response:
+                metrics.timeouts += 1
+            raise THZHandshakeError(f"Handshake 1 fehlgeschlagen, erhalten: {response.hex()}")
+        now = clock()
+        metrics.record_stage("greeting", now - stage_start)
+        stage_start = now
 
         # 3. Telegram senden
-        self._reset_input_buffer()
-        self._write_bytes(telegram)
+        self.ser.reset_input_buffer()
+        self.ser.write(telegram)
         # _LOGGER.info(f"Request gesendet: {telegram.hex()}")
 
         # 4. 0x10 0x02 Antwort erwarten
-        response = self._read_exact(2, timeout)
+        response = await self.ser.read_exact(2, handshake_timeout)
         if response != const.DATALINKESCAPE + const.STARTOFTEXT:
-            raise ValueError(f"Handshake 2 fehlgeschlagen, erhalten: {response.hex()}")
+            if len(response) < 2:
+                metrics.timeouts += 1
+            raise THZHandshakeError(f"Handshake 2 fehlgeschlagen, erhalten: {response.hex()}")
+        now = clock()
+        metrics.record_stage("telegram", now - stage_start)
+        stage_start = now
 
         # 5. Bestätigung senden (0x10)
-        self._write_bytes(const.DATALINKESCAPE)
-
-        # 6. Daten-Telegramm empfangen bis 0x10 0x03
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            chunk = self._read_available()
-            if chunk:
-                data.extend(chunk)
-                if len(data) >= 8 and data[-2:] == const.DATALINKESCAPE + const.ENDOFTEXT:
-                    break
-            else:
-                time.sleep(0.01)
+        self.ser.write(const.DATALINKESCAPE)
 
-        # _LOGGER.info(f"Empfangene Rohdaten: {data.hex()}")
+        # 6. Daten-Telegramm empfangen bis 0x10 0x03 (Escapes werden dabei aufgelöst)
+        frame = THZFrameParser()
+        if not await self.ser.read_frame(frame, timeout):
+            metrics.timeouts += 1
+            raise THZHandshakeError("Keine gültige Antwort nach Datenanfrage erhalten")
+        now = clock()
+        metrics.record_stage("data", now - stage_start)
 
-        if not (len(data) >= 8 and data[-2:] == const.DATALINKESCAPE + const.ENDOFTEXT):
-            raise ValueError("Keine gültige Antwort nach Datenanfrage erhalten")
+        # _LOGGER.info(f"Empfangene Daten: {frame.frame.hex()}")
 
         # 7. Ende der Kommunikation
-        self._write_bytes(const.STARTOFTEXT)
-        return bytes(data)
-
-
-    # Hilfsmethoden ergänzen
-    def _write_bytes(self, data: bytes):
-        """Sendet Bytes je nach Verbindungstyp."""
-        if hasattr(self.ser, "send"):  # TCP Socket
-            self.ser.send(data)
-        else:  # Serial
-            self.ser.write(data)
-            self.ser.flush()
-
-
-    def _read_exact(self, size: int, timeout: float) -> bytes:
-        """Liest exakt n Bytes, egal ob USB oder TCP."""
-        end_time = time.time() + timeout
-        buf = bytearray()
-        while len(buf) < size and time.time() < end_time:
-            chunk = self._read_available()
-            if chunk:
-                buf.extend(chunk)
-            else:
-                time.sleep(0.01)
-        return bytes(buf)
-
-
-    def _read_available(self) -> bytes:
-        """Liest verfügbare Bytes."""
-        if hasattr(self.ser, "recv"):  # TCP Socket
-            try:
-                self.ser.setblocking(False)
-                return self.ser.recv(1024)
-            except BlockingIOError:
-                return b""
-        else:
-            waiting = getattr(self.ser, "in_waiting", 0)
-            if waiting > 0:
-                return self.ser.read(waiting)
-            return b""
-
-
-    def _reset_input_buffer(self):
-        """Buffer löschen, falls möglich."""
-        if hasattr(self.ser, "reset_input_buffer"):
-            self.ser.reset_input_buffer()
-    #TCP hat keinen Input Buffer, daher kein Reset nötig
-
-
-    def close(self):
-        self.ser.close()
+        self.ser.write(const.STARTOFTEXT)
+        metrics.record_stage("total", now - started)
+        return frame
+
+
+    async def async_close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        while not self._queue.empty():
+            _, _, request = self._queue.get_nowait()
+            if not request.future.done():
+                request.future.set_exception(ConnectionError("Verbindung zur Wärmepumpe geschlossen"))
+                request.future.exception()  # als abgeholt markieren, der Aufrufer ist evtl. schon abgebrochen
+        self._queued_reads.clear()
+        if self.ser is not None:
+            await self.ser.async_close()
 
     def thz_checksum(self, data: bytes) -> bytes:
-        checksum = sum(b for i, b in enumerate(data) if i != 2)
-        checksum = checksum % 256
-        return bytes([checksum])
-
-    # def send_request(self, telegram: bytes) -> bytes:
-    #     # 1. Send greeting
-    #     self.ser.write(const.STARTOFTEXT)
-    #     self.ser.flush()
-    #     #_LOGGER.debug("Greeting gesendet: 02")
-
-    #     # 2. Wait for 0x10 response
-    #     response = self.ser.read(1)
-    #     #_LOGGER.debug(f"Greeting Antwort: {response.hex()}")
-    #     if response != const.DATALINKESCAPE:
-    #         raise ValueError("Handshake Schritt 1 fehlgeschlagen: keine 0x10 Antwort")
-
-    #     # 3. Send request telegram
-    #     # telegram = self.build_request(telegram)
-    #     self.ser.reset_input_buffer()
-    #     self.ser.write(telegram)
-    #     self.ser.flush()
-    #     _LOGGER.debug("Request gesendet: %s", telegram.hex())
-
-    #     # 4. Wait for 0x10 0x02 response
-    #     response = self.ser.read(2)
-    #     #_LOGGER.debug(f"Antwort nach Request: {response.hex()}")
-    #     if response != const.DATALINKESCAPE + const.STARTOFTEXT:
-    #         raise ValueError("Handshake Schritt 2 fehlgeschlagen: keine 0x10 0x02 Antwort")
-
-    #     # 5. Send confirmation 0x10
-    #     self.ser.write(const.DATALINKESCAPE)
-    #     self.ser.flush()
-    #     #_LOGGER.debug("Bestätigung gesendet: 10")
-
-    #     # 6. Read data telegram (ends with 0x10 0x03)
-    #     data = bytearray()
-    #     start_time = time.time()
-    #     max_wait = self.read_timeout
-    #     while time.time() - start_time < max_wait:
-    #         if self.ser.in_waiting > 0:
-    #             chunk = self.ser.read(self.ser.in_waiting)
-    #             data.extend(chunk)
-    #             # Check for footer (0x10 0x03) and minimum length
-    #             if len(data) >= 8 and data[-2:] == const.DATALINKESCAPE + const.ENDOFTEXT:
-    #                 break
-    #         else:
-    #            asyncio.sleep(0.01)
-    #     _LOGGER.debug(f"Empfangene Rohdaten: {data.hex()}")
-
-    #     if not (len(data) >= 8 and data[-2:] == const.DATALINKESCAPE + const.ENDOFTEXT):
-    #         raise ValueError("Keine gültige Antwort nach Datenanfrage erhalten")
-        
-    #     # 7. End of communication
-    #     self.ser.write(const.STARTOFTEXT)
-    #     self.ser.flush()
-    #     #_LOGGER.debug("Greeting gesendet: 02")
-
-
-    #     # Unescaping is already handled in decode_response
-    #     return bytes(data)
+        return bytes([checksum(data)])
 
     def unescape(self, data: bytes) -> bytes:
-        # 0x10 0x10 -> 0x10
-        data = data.replace(const.DATALINKESCAPE+const.DATALINKESCAPE, const.DATALINKESCAPE)
-        # 0x2B 0x18 -> 0x2B
-        data = data.replace(b'\x2B\x18', b'\x2B')
-        return data
+        return unescape(data)
 
     def decode_response(self, data: bytes):
+        """Dekodiert ein vollständiges Roh-Telegramm (inkl. 0x10 0x03)."""
         if len(data) < 6:
-            raise ValueError(f"Antwort zu kurz: {data.hex()}")
+            raise THZFrameError(f"Antwort zu kurz: {data.hex()}")
+
+        frame = THZFrameParser()
+        frame.feed(data)
+        if not frame.complete:
+            raise THZFrameError(f"Telegrammende fehlt: {data.hex()}")
+        return self.decode_frame(frame)
 
-        data = self.unescape(data)
+    def decode_frame(self, frame: THZFrameParser) -> bytes:
+        """Prüft Header und CRC eines geparsten Telegramms und liefert CRC + Payload."""
+        data = frame.frame
+        if len(data) < 3:
+            raise THZFrameError(f"Antwort zu kurz: {data.hex()}")
 
         # Header sind die ersten 2 Bytes
-        header = data[0:2]
+        header = bytes(data[0:2])
         if header == b'\x01\x80' or header == b'\x01\x00':  # normale Antwort b'\x01\x80' for "set" commands, b'\x01\x00' for "get"
-            # CRC ist Byte 2 (index 2)
+            # CRC ist Byte 2 (index 2), die Checksumme wurde beim Empfang mitgerechnet
             crc = data[2]
-            # Payload = zwischen Byte 3 und vorletzte 2 Bytes (ETX)
-            payload = data[3:-2]
-            # Prüfe CRC
-            # Für CRC berechnung: alles außer CRC und ETX (letzte 2 Bytes)
-            # hexstring zum Prüfen zusammensetzen
-            check_data = data[:2] + b'\x00' + payload
-            #_LOGGER.debug(f"Payload: {payload.hex()}, Checksumme: {crc:02X}, Checkdaten: {check_data.hex()}")
-            checksum_bytes = self.thz_checksum(check_data)
-            calc_crc = checksum_bytes[0]
+            calc_crc = frame.checksum
             if calc_crc != crc:
-                raise ValueError(f"CRC Fehler in Antwort. Erwartet {crc:02X}, berechnet {calc_crc:02X}")
-
-            return checksum_bytes + payload
-        elif header == b'\x01\x01':
-            raise ValueError("Timing Issue vom Gerät")
-        elif header == b'\x01\x02':
-            raise ValueError("CRC Fehler in Anfrage")
-        elif header == b'\x01\x03':
-            raise ValueError("Befehl nicht bekannt")
-        elif header == b'\x01\x04':
-            raise ValueError("Unbekannte Register Anfrage")
+                raise THZResponseCrcError(f"CRC Fehler in Antwort. Erwartet {crc:02X}, berechnet {calc_crc:02X}")
+
+            return bytes(data[2:])
+        elif header in DEVICE_ERRORS:
+            error, message = DEVICE_ERRORS[header]
+            raise error(message)
         else:
-            raise ValueError(f"Unbekannte Antwort: {data.hex()}")
+            raise THZUnknownResponseError(f"Unbekannte Antwort: {data.hex()}")
 
-    def read_write_register(self, addr_bytes: bytes, get_or_set: str = "get", payload_to_deliver: bytes = bytes()) -> bytes:
+    async def read_write_register(self, addr_bytes: bytes, get_or_set: str = "get", payload_to_deliver: bytes = bytes()) -> bytes:
         """Register lesen, z.B. "\xFB" für global status."""
-        header = b'\x01\x00' if get_or_set == "get" else b'\x01\x80'  # Standard Header für "get" und "set"
-        footer = const.DATALINKESCAPE+const.ENDOFTEXT  # Standard Footer
-
-        checksum = self.thz_checksum(header + b'\x00' + addr_bytes + payload_to_deliver)  # xx = Platzhalter für die Checksumme
-        telegram = self.construct_telegram(addr_bytes + payload_to_deliver, header, footer, checksum)
-        raw_response = self.send_request(telegram)
-        payload = self.decode_response(raw_response)
+        telegram = None
+        if get_or_set == "get" and not payload_to_deliver:
+            telegram = self._telegrams.get(addr_bytes)
+        if telegram is None:
+            telegram = build_telegram(addr_bytes, get_or_set, payload_to_deliver)
+        trace = self.trace
+        if trace.enabled:
+            trace.record(TX, addr_bytes, telegram)
+        frame = await self.send_request(telegram)
+        if trace.enabled:
+            trace.record(RX, addr_bytes, frame.frame)
+        payload = self.decode_frame(frame)
         #_LOGGER.debug("Payload dekodiert: %s", payload.hex())
         return payload
     
     def construct_telegram(self, addr_bytes: bytes, header: bytes, footer: bytes, checksum: bytes) -> bytes:
         """
         Constructs a telegram for the THZ device based on the given address bytes.
-        Returns: telegram ready to send
+        Returns: telegram ready to send (0x10/0x2B escaped)
         """
-        telegram = header + checksum + addr_bytes + footer
+        telegram = header + escape(checksum + addr_bytes) + footer
         return telegram
     
 
-    def read_firmware_version(self) -> str:
+    async def read_firmware_version(self) -> str:
         """
         Reads the firmware version from the THZ device.
 
@@ -330,7 +529,7 @@ class THZDevice:
         - Interpreted as: unsigned big-endian integer
         """
         try:
-            value_raw = self.read_value(b'\xFD', "get", 2, 2)            
+            value_raw = await self.read_value(b'\xFD', "get", 2, 2, priority=const.PRIORITY_USER)            
             #_LOGGER.debug(f"Rohdaten Firmware-Version: {value_raw.hex()}")
             firmware_version = int.from_bytes(value_raw, byteorder='big', signed=False)
             _LOGGER.debug(f"Firmware-Version gelesen: {firmware_version}")
@@ -340,36 +539,38 @@ class THZDevice:
             raise RuntimeError(f"Firmware-Version konnte nicht gelesen werden: {e}")
         
 
-    def read_value(self, addr_bytes: bytes, get_or_set: str, offset: int, length: int) -> bytes:
+    async def read_value(self, addr_bytes: bytes, get_or_set: str, offset: int, length: int, priority: int = const.PRIORITY_POLL) -> bytes:
         """
         Reads a value from the THZ device.
         addr_bytes: bytes (e.g. b'\xFB')
         get_or_set: "get" or "set"
+        priority: queue priority (const.PRIORITY_*)
         Returns: byte value read from the device
         """
-        response = self.read_write_register(addr_bytes, get_or_set)
+        response = await self._submit(addr_bytes, get_or_set, priority=priority)
         # _LOGGER.info(f"Antwort von Wärmepumpe: {response.hex()}")
         value_raw = response[offset: offset + length]
         # _LOGGER.info(f"Gelesener Wert (Offset {offset}, Length {length}): {value_raw.hex()}")
         return value_raw
     
-    def write_value(self, addr_bytes: bytes, value: bytes) -> None:
+    async def write_value(self, addr_bytes: bytes, value: bytes) -> None:
         """
         Writes a value to the THZ device.
         addr_bytes: bytes (e.g. b'\xFB')
         value: integer value to write
         """
-        self.read_write_register(addr_bytes, "set", value)
+        await self._submit(addr_bytes, "set", value, priority=const.PRIORITY_WRITE)
         _LOGGER.debug(f"Wert {value} an Adresse {addr_bytes.hex()} geschrieben.")
     
-    def read_block(self, addr_bytes: bytes, get_or_set: str) -> bytes:
+    async def read_block(self, addr_bytes: bytes, get_or_set: str, priority: int = const.PRIORITY_POLL) -> bytes:
         """
         Reads a value from the THZ device.
         addr_bytes: bytes (e.g. "\xFB")
         get_or_set: "get" or "set"
+        priority: queue priority (const.PRIORITY_*)
         Returns: block read from the device
         """
-        response = self.read_write_register(addr_bytes, get_or_set)
+        response = await self._submit(addr_bytes, get_or_set, priority=priority)
         return response
 
     @property
@@ -381,26 +582,3 @@ class THZDevice:
         if self.register_map_manager:
             return list(self.register_map_manager.get_all_registers().keys())
         return []
-
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator # pyright: ignore[reportMissingImports, reportMissingModuleSource]
-class THZCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, device, refresh_interval: int):
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="THZ Coordinator",
-            update_interval= time.timedelta(seconds=refresh_interval),
-        )
-        self.device = device
-
-    async def _async_update_data(self):
-        return await self.device.read_all()
-
-
-
-if __name__ == "__main__":
-    logging.basicConfig(level=logging.DEBUG)
-    dev = THZDevice('/dev/ttyUSB0')
-
-
-
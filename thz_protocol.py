@@ -0,0 +1,171 @@
+import re
+
+from . import const
+
+_DLE = const.DATALINKESCAPE[0]
+_ETX = const.ENDOFTEXT[0]
+_PLUS = 0x2B  # 0x2B 0x18 -> 0x2B
+_PLUS_ESCAPE = 0x18
+_SPECIAL = re.compile(b"[\x10\x2b]")
+
+HEADER_GET = b'\x01\x00'
+HEADER_SET = b'\x01\x80'
+FOOTER = const.DATALINKESCAPE + const.ENDOFTEXT
+
+
+class THZError(Exception):
+    """Basisklasse aller Fehler der THZ-Kommunikation."""
+
+    #: Ob eine Wiederholung der Anfrage Aussicht auf Erfolg hat
+    retryable = False
+
+
+class THZProtocolError(THZError, ValueError):
+    """Fehlerhafte oder abgelehnte Antwort der Wärmepumpe (ValueError aus Kompatibilität)."""
+
+
+class THZFrameError(THZProtocolError):
+    """Antwort verletzt das DLE/STX/ETX-Framing."""
+
+    retryable = True
+
+
+class THZHandshakeError(THZProtocolError):
+    """Handshake (02 -> 10, Telegramm -> 10 02) fehlgeschlagen oder ausgeblieben."""
+
+    retryable = True
+
+
+class THZResponseCrcError(THZProtocolError):
+    """Checksumme der Antwort stimmt nicht."""
+
+    retryable = True
+
+
+class THZTimingError(THZProtocolError):
+    """Gerät meldet "Timing Issue" (Header 01 01): Anfrage kam zu früh."""
+
+    retryable = True
+
+
+class THZRequestCrcError(THZProtocolError):
+    """Gerät meldet CRC-Fehler in der Anfrage (Header 01 02)."""
+
+    retryable = True
+
+
+class THZUnknownCommandError(THZProtocolError):
+    """Gerät kennt den Befehl nicht (Header 01 03)."""
+
+
+class THZUnknownRegisterError(THZProtocolError):
+    """Gerät kennt das Register nicht (Header 01 04), z. B. Block fehlt in dieser Firmware."""
+
+
+class THZUnknownResponseError(THZProtocolError):
+    """Unbekannter Antwort-Header."""
+
+
+#: Header-Fehlercodes der Wärmepumpe -> Exception
+DEVICE_ERRORS = {
+    b'\x01\x01': (THZTimingError, "Timing Issue vom Gerät"),
+    b'\x01\x02': (THZRequestCrcError, "CRC Fehler in Anfrage"),
+    b'\x01\x03': (THZUnknownCommandError, "Befehl nicht bekannt"),
+    b'\x01\x04': (THZUnknownRegisterError, "Unbekannte Register Anfrage"),
+}
+
+
+class THZFrameParser:
+    """Inkrementeller Parser für Datentelegramme der Wärmepumpe.
+
+    Verarbeitet die Bytes so, wie sie eintreffen: Escape-Sequenzen
+    (0x10 0x10, 0x2B 0x18) werden direkt aufgelöst, das Telegrammende
+    (0x10 0x03) wird am abschließenden Byte erkannt und die Checksumme
+    läuft mit. ``frame`` enthält Header, CRC und Payload ohne Escapes.
+    """
+
+    __slots__ = ("frame", "complete", "_sum", "_pending")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.frame = bytearray()
+        self.complete = False
+        self._sum = 0
+        self._pending: int | None = None
+
+    @property
+    def checksum(self) -> int:
+        """THZ-Checksumme über alle Bytes außer dem CRC-Byte (Index 2)."""
+        crc = self.frame[2] if len(self.frame) > 2 else 0
+        return (self._sum - crc) % 256
+
+    def feed(self, data: bytes | bytearray) -> int:
+        """Verarbeitet data und liefert die Anzahl verbrauchter Bytes.
+
+        Nach dem Telegrammende werden keine weiteren Bytes verbraucht.
+        """
+        frame = self.frame
+        i = 0
+        n = len(data)
+        while i < n and not self.complete:
+            pending = self._pending
+            if pending == _DLE:
+                b = data[i]
+                i += 1
+                self._pending = None
+                if b == _DLE:
+                    frame.append(_DLE)
+                    self._sum += _DLE
+                elif b == _ETX:
+                    self.complete = True
+                else:
+                    raise THZFrameError(f"Ungültige Escape-Sequenz 10 {b:02x} an Position {len(frame)}")
+                continue
+            if pending == _PLUS:
+                self._pending = None
+                frame.append(_PLUS)
+                self._sum += _PLUS
+                if data[i] == _PLUS_ESCAPE:
+                    i += 1
+                continue
+
+            match = _SPECIAL.search(data, i)
+            end = match.start() if match else n
+            if end > i:
+                run = data[i:end]
+                frame += run
+                self._sum += sum(run)
+            if match:
+                self._pending = data[end]
+                i = end + 1
+            else:
+                i = n
+        return i
+
+
+def checksum(data: bytes) -> int:
+    """THZ-Checksumme: Summe aller Bytes außer Index 2, modulo 256."""
+    return (sum(data) - (data[2] if len(data) > 2 else 0)) % 256
+
+
+def escape(data: bytes) -> bytes:
+    """Sendeseitiges Escaping: 0x10 -> 0x10 0x10, 0x2B -> 0x2B 0x18."""
+    return data.replace(const.DATALINKESCAPE, const.DATALINKESCAPE + const.DATALINKESCAPE).replace(b'\x2B', b'\x2B\x18')
+
+
+def build_telegram(addr_bytes: bytes, get_or_set: str = "get", payload: bytes = b"") -> bytes:
+    """Baut ein sendefertiges Telegramm: Header, Checksumme, Adresse, Daten, Footer."""
+    header = HEADER_GET if get_or_set == "get" else HEADER_SET
+    crc = checksum(header + b'\x00' + addr_bytes + payload)
+    return header + escape(bytes([crc]) + addr_bytes + payload) + FOOTER
+
+
+def unescape(data: bytes) -> bytes:
+    """Löst die Escape-Sequenzen eines vollständigen Telegramms auf."""
+    # 0x10 0x10 -> 0x10
+    data = data.replace(const.DATALINKESCAPE + const.DATALINKESCAPE, const.DATALINKESCAPE)
+    # 0x2B 0x18 -> 0x2B
+    data = data.replace(b'\x2B\x18', b'\x2B')
+    return data
@@ -1,8 +1,11 @@
 from homeassistant.components.time import TimeEntity    # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.core import callback # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.update_coordinator import CoordinatorEntity # pyright: ignore[reportMissingImports, reportMissingModuleSource]
 from datetime import time
-from .register_maps.register_map_manager import RegisterMapManager_Write
+from .entity_descriptors import ParameterDescriptor, get_parameter_descriptors
 from .thz_device import THZDevice
-import asyncio
+from .coordinator import THZParameterCoordinator
+from .const import DOMAIN
 
 import logging
 _LOGGER = logging.getLogger(__name__)
@@ -21,51 +24,57 @@ def quarters_to_time(num: int) -> time:
     return time(hour, quarters * 15)
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
-    entities = []
-    write_manager: RegisterMapManager_Write = hass.data["thz"]["write_manager"]
-    device: THZDevice = hass.data["thz"]["device"]
-    write_registers = write_manager.get_all_registers()
-    _LOGGER.debug(f"write_registers: {write_registers}")
-    for name, entry in write_registers.items():
-        if entry["type"] == "time":
-            _LOGGER.debug(f"Creating Time for {name} with command {entry['command']}")
-            entity = THZTime(
-                name=name,
-                command=entry["command"],
-                device=device,
-                icon=entry.get("icon"),
-                unique_id=f"thz_{name.lower().replace(' ', '_')}",
-            )
-            entities.append(entity)
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    device: THZDevice = entry_data["device"]
+    coordinator: THZParameterCoordinator = entry_data["parameter_coordinator"]
+    entities = [
+        THZTime(descriptor, device, coordinator, config_entry.entry_id)
+        for descriptor in get_parameter_descriptors(device.firmware_version).get("time", ())
+    ]
+    _LOGGER.debug("Creating %d THZTime entities", len(entities))
+    async_add_entities(entities)
 
-    async_add_entities(entities, True)
+class THZTime(CoordinatorEntity, TimeEntity):
+    """Schreibparameter als Uhrzeit (Viertelstunden); der Wert kommt aus dem Parameter-Snapshot."""
 
-class THZTime(TimeEntity):
-    _attr_should_poll = True
-
-    def __init__(self, name, command, device, icon=None, unique_id=None):
-        self._attr_name = name
-        self._command = command
+    def __init__(self, descriptor: ParameterDescriptor, device: THZDevice, coordinator: THZParameterCoordinator, entry_id: str):
+        super().__init__(coordinator, context=descriptor.command)
+        self._desc = descriptor
         self._device = device
-        self._attr_icon = icon or "mdi:clock"
-        self._attr_unique_id = unique_id or f"thz_time_{command.lower()}_{name.lower().replace(' ', '_')}"
+        self._attr_unique_id = f"{entry_id}_{descriptor.unique_suffix}"
         self._attr_native_value = None
+        self._update_from_snapshot()
+
+    @property
+    def name(self):
+        return self._desc.key
+
+    @property
+    def entity_registry_enabled_default(self):
+        return self._desc.enabled_default
+
+    @property
+    def icon(self):
+        return self._desc.icon or "mdi:clock"
 
     @property
     def native_value(self):
         return self._attr_native_value
 
-    async def async_update(self):
-        async with self._device.lock:
-            value_bytes = await self.hass.async_add_executor_job(self._device.read_value, bytes.fromhex(self._command), "get", 4, 2)
-            await asyncio.sleep(0.01)  # Kurze Pause, um sicherzustellen, dass das Gerät bereit ist
-        num = value_bytes[0]
-        self._attr_native_value = quarters_to_time(num)
+    def _update_from_snapshot(self) -> None:
+        value_bytes = (self.coordinator.data or {}).get(self._desc.command)
+        if value_bytes:
+            self._attr_native_value = quarters_to_time(value_bytes[0])
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_snapshot()
+        self.async_write_ha_state()
 
     async def async_set_native_value(self, value: str):
         num = time_to_quarters(value)
         num_bytes = num.to_bytes(2, byteorder='big', signed=False)
-        async with self._device.lock:
-            await self.hass.async_add_executor_job(self._device.write_value(bytes.fromhex(self._command), num_bytes))
-            await asyncio.sleep(0.01)  # Kurze Pause, um sicherzustellen, dass das Gerät bereit ist
-        self._attr_native_value = value
\ No newline at end of file
+        await self._device.write_value(self._desc.command_bytes, num_bytes)
+        self._attr_native_value = value
+        self.async_write_ha_state()
+        await self.coordinator.async_refresh_command(self._desc.command)
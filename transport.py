@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import random
+import socket
+import time
+from typing import Callable
+
+import serial_asyncio_fast # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from .thz_protocol import THZFrameParser
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class THZProtocol(asyncio.Protocol):
+    """Puffert empfangene Bytes und weckt wartende Leser auf."""
+
+    def __init__(self, on_connection_lost: Callable[[Exception | None], None] | None = None):
+        self.transport: asyncio.BaseTransport | None = None
+        self.buffer = bytearray()
+        self._waiter: asyncio.Future | None = None
+        self._exc: Exception | None = None
+        self._on_connection_lost = on_connection_lost
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+        self._exc = None
+
+    def data_received(self, data: bytes) -> None:
+        self.buffer.extend(data)
+        self._wakeup()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._exc = exc or ConnectionError("Verbindung geschlossen")
+        self._wakeup()
+        if self._on_connection_lost is not None:
+            self._on_connection_lost(exc)
+
+    def _wakeup(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def wait_for_data(self) -> None:
+        """Wartet, bis neue Bytes eintreffen oder die Verbindung abbricht."""
+        if self._exc is not None:
+            raise self._exc
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+        if self._exc is not None and not self.buffer:
+            raise self._exc
+
+    def consume(self, size: int | None = None) -> bytes:
+        """Entnimmt size Bytes (oder alles) aus dem Puffer."""
+        if size is None or size >= len(self.buffer):
+            data = bytes(self.buffer)
+            self.buffer.clear()
+        else:
+            data = bytes(self.buffer[:size])
+            del self.buffer[:size]
+        return data
+
+
+class THZTransport:
+    """Asynchrone Byte-Verbindung zur Wärmepumpe (Basisklasse).
+
+    Bricht die Verbindung ab, wird sie im Hintergrund mit exponentiellem
+    Backoff (mit Jitter) neu aufgebaut. Solange keine Verbindung besteht,
+    schlagen Anfragen sofort mit ConnectionError fehl.
+    """
+
+    #: Anzahl aufeinanderfolgender Timeouts ohne jedes Antwortbyte, ab der die Verbindung als tot gilt
+    HALF_OPEN_TIMEOUTS = 3
+
+    def __init__(self, read_timeout: float, backoff_min: float = 1.0, backoff_max: float = 60.0):
+        self.read_timeout = read_timeout
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self._protocol: THZProtocol | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._closing = False
+        self._silent_timeouts = 0
+        self._next_attempt: float | None = None
+        self._link_stats = {
+            "connects": 0,
+            "disconnects": 0,
+            "reconnect_attempts": 0,
+            "half_open_detected": 0,
+            "last_error": None,
+            "connected_since": None,
+            "bytes_sent": 0,
+            "bytes_received": 0,
+        }
+
+    async def _create_connection(self) -> tuple[asyncio.BaseTransport, THZProtocol]:
+        raise NotImplementedError
+
+    def _protocol_factory(self) -> THZProtocol:
+        return THZProtocol(self._connection_lost)
+
+    async def async_open(self) -> None:
+        """Öffnet die Verbindung."""
+        self._closing = False
+        _, self._protocol = await self._create_connection()
+        self._silent_timeouts = 0
+        self._link_stats["connects"] += 1
+        self._link_stats["connected_since"] = time.time()
+
+    @property
+    def connected(self) -> bool:
+        return self._protocol is not None and self._protocol.transport is not None and not self._protocol.transport.is_closing()
+
+    @property
+    def link_state(self) -> str:
+        if self.connected:
+            return "connected"
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            return "reconnecting"
+        return "disconnected"
+
+    def get_link_stats(self) -> dict:
+        """Verbindungszustand und Zähler (Verbindungsabbrüche, Reconnect-Versuche, ...)."""
+        next_attempt = None
+        if self._next_attempt is not None and not self.connected:
+            next_attempt = max(0.0, round(self._next_attempt - time.monotonic(), 1))
+        return {**self._link_stats, "state": self.link_state, "next_attempt_in": next_attempt}
+
+    def _connection_lost(self, exc: Exception | None) -> None:
+        if self._closing:
+            return
+        self._link_stats["disconnects"] += 1
+        self._link_stats["last_error"] = str(exc) if exc else "Verbindung geschlossen"
+        self._link_stats["connected_since"] = None
+        _LOGGER.warning("Verbindung zur Wärmepumpe verloren (%s), baue sie neu auf", self._link_stats["last_error"])
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._closing or (self._reconnect_task is not None and not self._reconnect_task.done()):
+            return
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect_loop(), name="THZ reconnect")
+
+    async def _reconnect_loop(self) -> None:
+        attempt = 0
+        while not self._closing and not self.connected:
+            # Exponentieller Backoff mit Jitter, damit mehrere Clients das Gateway nicht gleichzeitig treffen
+            delay = min(self.backoff_max, self.backoff_min * 2 ** attempt) * random.uniform(0.5, 1.0)
+            self._next_attempt = time.monotonic() + delay
+            await asyncio.sleep(delay)
+            attempt += 1
+            self._link_stats["reconnect_attempts"] += 1
+            try:
+                await self.async_open()
+            except (OSError, TimeoutError) as err:
+                self._link_stats["last_error"] = str(err) or type(err).__name__
+                _LOGGER.debug("Reconnect-Versuch %d fehlgeschlagen: %s", attempt, self._link_stats["last_error"])
+            else:
+                _LOGGER.info("Verbindung zur Wärmepumpe nach %d Versuch(en) wiederhergestellt", attempt)
+        self._next_attempt = None
+
+    def note_response(self, received_any: bool) -> None:
+        """Vom Gerät aufgerufen: erkennt halboffene Verbindungen an wiederholtem völligem Schweigen."""
+        if received_any:
+            self._silent_timeouts = 0
+            return
+        self._silent_timeouts += 1
+        if self._silent_timeouts >= self.HALF_OPEN_TIMEOUTS and self.connected:
+            self._link_stats["half_open_detected"] += 1
+            _LOGGER.warning("Keine Antwort auf %d Anfragen in Folge, Verbindung wird neu aufgebaut", self._silent_timeouts)
+            self._silent_timeouts = 0
+            self._protocol.transport.abort()
+
+    def write(self, data: bytes) -> None:
+        """Sendet Bytes (gepuffert durch die Event-Loop)."""
+        if not self.connected:
+            raise ConnectionError("Keine Verbindung zur Wärmepumpe")
+        self._protocol.transport.write(data)
+        self._link_stats["bytes_sent"] += len(data)
+
+    async def read_exact(self, size: int, timeout: float) -> bytes:
+        """Liest exakt n Bytes; liefert bei Timeout die bis dahin empfangenen Bytes."""
+        protocol = self._protocol
+        try:
+            async with asyncio.timeout(timeout):
+                while len(protocol.buffer) < size:
+                    await protocol.wait_for_data()
+        except TimeoutError:
+            pass
+        data = protocol.consume(size)
+        self._link_stats["bytes_received"] += len(data)
+        return data
+
+    async def read_frame(self, parser: THZFrameParser, timeout: float) -> bool:
+        """Füttert parser mit eintreffenden Bytes bis zum Telegrammende.
+
+        Liefert False, wenn innerhalb von timeout kein vollständiges Telegramm ankam.
+        """
+        protocol = self._protocol
+        try:
+            async with asyncio.timeout(timeout):
+                while True:
+                    if protocol.buffer:
+                        used = parser.feed(protocol.buffer)
+                        del protocol.buffer[:used]
+                        self._link_stats["bytes_received"] += used
+                        if parser.complete:
+                            return True
+                    await protocol.wait_for_data()
+        except TimeoutError:
+            return False
+
+    def reset_input_buffer(self) -> None:
+        """Verwirft bereits empfangene, noch nicht gelesene Bytes."""
+        if self._protocol is not None:
+            self._link_stats["bytes_received"] += len(self._protocol.buffer)
+            self._protocol.buffer.clear()
+
+    async def async_close(self) -> None:
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._protocol is not None and self._protocol.transport is not None:
+            self._protocol.transport.close()
+        self._protocol = None
+
+
+class THZSerialTransport(THZTransport):
+    """USB/Serielle Verbindung über pyserial-asyncio."""
+
+    def __init__(self, port: str, baudrate: int, read_timeout: float):
+        super().__init__(read_timeout)
+        self.port = port
+        self.baudrate = baudrate
+
+    async def _create_connection(self):
+        _LOGGER.debug("Öffne serielle Verbindung: %s @ %s baud", self.port, self.baudrate)
+        return await serial_asyncio_fast.create_serial_connection(
+            asyncio.get_running_loop(), self._protocol_factory, self.port, baudrate=self.baudrate
+        )
+
+
+class THZTcpTransport(THZTransport):
+    """Verbindung zu ser.net (TCP/IP) mit TCP-Keepalive."""
+
+    KEEPALIVE_IDLE = 30
+    KEEPALIVE_INTERVAL = 10
+    KEEPALIVE_COUNT = 3
+
+    def __init__(self, host: str, port: int, read_timeout: float):
+        super().__init__(read_timeout)
+        self.host = host
+        self.port = port
+
+    async def _create_connection(self):
+        _LOGGER.debug("Öffne TCP-Verbindung: %s:%s", self.host, self.port)
+        async with asyncio.timeout(self.read_timeout * 5):
+            transport, protocol = await asyncio.get_running_loop().create_connection(
+                self._protocol_factory, self.host, self.port
+            )
+        self._configure_socket(transport.get_extra_info("socket"))
+        return transport, protocol
+
+    def _configure_socket(self, sock) -> None:
+        """Keepalive erkennt ein stillschweigend verschwundenes Gateway auch ohne Anfragen."""
+        if sock is None:
+            return
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in (
+            ("TCP_KEEPIDLE", self.KEEPALIVE_IDLE),
+            ("TCP_KEEPINTVL", self.KEEPALIVE_INTERVAL),
+            ("TCP_KEEPCNT", self.KEEPALIVE_COUNT),
+        ):
+            if hasattr(socket, option):  # nicht auf allen Plattformen verfügbar
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
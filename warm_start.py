@@ -0,0 +1,122 @@
+"""Warmstart: letzte Block-Payloads, Parameter-Snapshot und Firmware im HA-Storage.
+
+Beim Start werden Coordinatoren und Entities sofort aus dem Speicher befüllt
+und danach gestaffelt im Hintergrund neu gelesen. Die Zeit bis zur ersten
+Anzeige hängt so nicht mehr von der Anzahl der Blöcke und Parameter ab.
+"""
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.core import HomeAssistant, callback # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.event import async_track_time_interval # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+from homeassistant.helpers.storage import Store # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+
+from .const import DOMAIN
+from .coordinator import THZBlockCoordinator, THZParameterCoordinator
+from .thz_device import THZDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_INTERVAL = timedelta(minutes=5)
+SAVE_DELAY = 10  # Sekunden; Store schreibt ausstehende Daten auch beim Beenden von HA
+REVALIDATE_STAGGER = 1.0  # Sekunden zwischen zwei Blöcken beim Nachlesen
+
+
+class THZWarmStartCache:
+    """Persistenter Zwischenspeicher je Config Entry (``.storage/thz.<entry_id>``)."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._data: dict[str, Any] = {}
+        self._device: THZDevice | None = None
+        self._parameter_coordinator: THZParameterCoordinator | None = None
+        self._reset = False
+
+    async def async_load(self) -> None:
+        self._data = await self._store.async_load() or {}
+
+    @property
+    def firmware_version(self) -> str | None:
+        return self._data.get("firmware")
+
+    def block_payload(self, block: bytes) -> bytes | None:
+        payload = self._data.get("blocks", {}).get(block.hex())
+        return bytes.fromhex(payload) if payload is not None else None
+
+    def parameters(self) -> dict[str, bytes]:
+        return {command: bytes.fromhex(value) for command, value in self._data.get("parameters", {}).items()}
+
+    def restore(
+        self,
+        device: THZDevice,
+        coordinators: dict[str, THZBlockCoordinator],
+        parameter_coordinator: THZParameterCoordinator,
+    ) -> list[THZBlockCoordinator]:
+        """Befüllt Device-Cache und Coordinatoren; liefert die wiederhergestellten Block-Coordinatoren."""
+        self._device = device
+        self._parameter_coordinator = parameter_coordinator
+        restored = []
+        for coordinator in coordinators.values():
+            payload = self.block_payload(coordinator.block_bytes)
+            if payload is None:
+                continue
+            device.seed_block(coordinator.block_bytes, payload)
+            coordinator.restore_payload(payload)
+            restored.append(coordinator)
+        parameters = self.parameters()
+        if parameters:
+            parameter_coordinator.data = parameters
+        _LOGGER.debug("Warmstart: %d Blöcke, %d Parameter aus dem Speicher", len(restored), len(parameters))
+        return restored
+
+    @callback
+    def async_start(self, entry: ConfigEntry) -> None:
+        """Speichert regelmäßig (verzögert); beim Entladen speichert async_unload_entry direkt."""
+        entry.async_on_unload(
+            async_track_time_interval(self._hass, lambda _now: self.async_schedule_save(), SAVE_INTERVAL)
+        )
+
+    @callback
+    def async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        await self._store.async_save(self._data_to_save())
+
+    async def async_reset(self, firmware_version: str) -> None:
+        """Nach einem Firmware-Wechsel nur noch die neue Firmware speichern.
+
+        Payloads und Parameter gehören zur alten Map und werden verworfen; auch
+        das Speichern beim Entladen schreibt danach nicht mehr den alten Stand.
+        """
+        self._reset = True
+        self._data = {"firmware": firmware_version}
+        await self._store.async_save(self._data)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        device, parameter_coordinator = self._device, self._parameter_coordinator
+        if self._reset or device is None:
+            return self._data
+        self._data = {
+            "firmware": device.firmware_version,
+            "blocks": {block.hex(): payload.hex() for block, payload in device.cached_payloads().items()},
+            "parameters": {command: value.hex() for command, value in (parameter_coordinator.data or {}).items()},
+        }
+        return self._data
+
+
+async def async_revalidate(coordinators: list[THZBlockCoordinator], stagger: float = REVALIDATE_STAGGER) -> None:
+    """Liest wiederhergestellte Blöcke nacheinander neu, mit kurzer Pause dazwischen."""
+    for i, coordinator in enumerate(coordinators):
+        if i:
+            await asyncio.sleep(stagger)
+        await coordinator.async_refresh()